@@ -0,0 +1,111 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from fastapi import Response
+
+
+class CachedResponse(NamedTuple):
+    generation: int
+    expires_at: float
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """LRU + TTL cache of serialized API responses.
+
+    Entries belong to a generation; bumping it with invalidate() (after jobs are
+    ingested or deleted) drops every cached response at once. The TTL is only a
+    safety net for results that change with the clock, such as "jobs today".
+
+    Jobs are written by scrape worker processes, so a cache can also follow a
+    shared generation (generation_source, e.g. a database counter the workers
+    bump): it is read at most every sync_interval seconds, and a change
+    invalidates the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 60.0,
+        generation_source: Optional[Callable[[], Optional[int]]] = None,
+        sync_interval: float = 1.0
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.generation_source = generation_source
+        self.sync_interval = sync_interval
+        self._shared_generation: Optional[int] = None
+        self._next_sync = 0.0
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'not_modified': 0}
+
+    @staticmethod
+    def make_key(path: str, params: Mapping[str, str]) -> Tuple:
+        """Key on the path and query parameters, ignoring their order and empty values"""
+        return (path, tuple(sorted((name, value) for name, value in params.items() if value != "")))
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        """Return the cached response for key, if it is current"""
+        self._sync()
+        entry = self._entries.get(key)
+        if entry is not None and entry.generation == self.generation and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+        if entry is not None:
+            del self._entries[key]
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: Tuple, body: bytes, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """Cache a serialized response body, evicting the least recently used entries if full"""
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = CachedResponse(self.generation, time.monotonic() + self.ttl, body, etag, headers or {})
+        if self.max_entries > 0 and self.ttl > 0:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return entry
+
+    def _sync(self):
+        """Invalidate if the shared generation moved since it was last read"""
+        if self.generation_source is None or time.monotonic() < self._next_sync:
+            return
+        self._next_sync = time.monotonic() + self.sync_interval
+        shared = self.generation_source()
+        if shared is not None and shared != self._shared_generation:
+            self._shared_generation = shared
+            self.invalidate()
+
+    def invalidate(self):
+        """Start a new generation, so every cached response is recomputed"""
+        self.generation += 1
+        self._entries.clear()
+
+    def respond(self, entry: CachedResponse, if_none_match: Optional[str] = None) -> Response:
+        """Build the HTTP response for entry: 304 if the client already has this body"""
+        headers = {**entry.headers, 'ETag': entry.etag, 'Cache-Control': 'no-cache'}
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]):
+            self.stats['not_modified'] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def get_stats(self) -> Dict:
+        """Cache effectiveness counters"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'generation': self.generation,
+            'hit_ratio': round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+        }
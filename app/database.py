@@ -1,17 +1,59 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy import (
+    create_engine, event, inspect, Column, Integer, BigInteger, String, Text, DateTime, Boolean, Float, Index,
+    LargeBinary
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from datetime import datetime
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ai_jobs.db")
 
+# SQLite pragma profile applied to every connection; set a variable to an empty string to skip that pragma
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),  # readers no longer block on the scraper's writes
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),  # safe with WAL, no fsync per commit
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # negative values are KiB
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply the SQLITE_PRAGMAS profile to a new connection"""
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Indexes only _aggregate_job_stats reads, on databases without the job_stats triggers: jobs today /
+# this week, and GROUP BYs over active jobs answered from the index alone. SQLite counts with
+# job_stats instead, where these would only slow down every upsert
+JOB_STATS_FALLBACK_INDEXES = {
+    "ix_jobs_scraped_date": ("scraped_date",),
+    "ix_jobs_active_company": ("is_active", "company"),
+    "ix_jobs_active_location": ("is_active", "location"),
+    "ix_jobs_active_job_type": ("is_active", "job_type"),
+    "ix_jobs_active_source": ("is_active", "source"),
+}
+
+def _without_job_stats(ddl, target, bind, dialect, **kw) -> bool:
+    return dialect.name != "sqlite"
+
 class Job(Base):
     __tablename__ = "jobs"
     
@@ -36,12 +78,357 @@ class Job(Base):
     ai_keywords = Column(Text, nullable=True)  # JSON string of matched keywords
     relevance_score = Column(Float, default=0.0)  # AI relevance score 0-1
     
+    # Near-duplicate detection (see app/dedup.py)
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature of title, company and description
+    source_urls = Column(Text, nullable=True)  # JSON list of this posting's URLs, url first, then merged duplicates
+    
+    __table_args__ = (
+        # get_jobs: is_active filter plus ORDER BY relevance_score, scraped_date (walked backwards for DESC);
+        # scraped_date is in the index so the days_ago filter is checked without touching the table
+        Index("ix_jobs_active_relevance", "is_active", "relevance_score", "scraped_date"),
+        *(
+            Index(name, *columns).ddl_if(callable_=_without_job_stats)
+            for name, columns in JOB_STATS_FALLBACK_INDEXES.items()
+        ),
+    )
+    
     def __repr__(self):
         return f"<Job(title='{self.title}', company='{self.company}', location='{self.location}')>"
 
+class JobStat(Base):
+    """Precomputed job counter, kept in step with the jobs table by triggers (see JOB_STAT_DIMENSIONS)"""
+    __tablename__ = "job_stats"
+    
+    dimension = Column(String(20), primary_key=True)  # total, active, day, company, location, job_type, source
+    value = Column(String(500), primary_key=True)  # e.g. the company name; '' for total/active
+    job_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # get_job_stats: top N values per dimension without sorting
+        Index("ix_job_stats_dimension_count", "dimension", "job_count"),
+    )
+
+class ScrapeState(Base):
+    """High-water mark per (source, search term): the newest listing seen by the last run"""
+    __tablename__ = "scrape_state"
+    
+    source = Column(String(100), primary_key=True)
+    search_term = Column(String(200), primary_key=True)
+    newest_url = Column(String(500), nullable=True)
+    newest_posted_date = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_new_jobs = Column(Integer, default=0)  # listings newer than the mark found by the last run
+
+class JobBand(Base):
+    """One LSH band of a job's MinHash signature; jobs sharing a band hash are duplicate candidates"""
+    __tablename__ = "job_lsh_bands"
+    
+    band_hash = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, primary_key=True)
+    
+    __table_args__ = (
+        # Dropping a job's bands (jobs_dedup_delete trigger, re-fingerprinting)
+        Index("ix_job_lsh_bands_job_id", "job_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+class JobAlias(Base):
+    """URL of a near-duplicate posting that was merged into job_id instead of being stored"""
+    __tablename__ = "job_aliases"
+    
+    url = Column(String(500), primary_key=True)
+    job_id = Column(Integer, nullable=False, index=True)
+
+class ScrapeRun(Base):
+    """Summary of one scraping run: outcome, job counts and time spent per stage"""
+    __tablename__ = "scrape_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    sources = Column(String(200), nullable=False)  # comma-separated
+    force_refresh = Column(Boolean, default=False)
+    status = Column(String(20), nullable=False)  # ok, failed
+    error = Column(Text, nullable=True)
+    scraped = Column(Integer, default=0)
+    inserted = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    merged = Column(Integer, default=0)  # near-duplicates folded into another job
+    skipped = Column(Integer, default=0)
+    stage_seconds = Column(Text, nullable=True)  # JSON: stage -> seconds, summed over concurrent spans
+
+class ScrapeTask(Base):
+    """Queued scraping run, enqueued by the API or a worker's schedule and claimed by one scrape worker"""
+    __tablename__ = "scrape_tasks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sources = Column(String(200), nullable=True)  # comma-separated; NULL scrapes every source
+    force_refresh = Column(Boolean, default=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    dedupe_key = Column(String(100), nullable=True, unique=True)  # e.g. the schedule slot, so it is enqueued once
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # a running task whose heartbeat is older than the lease is reclaimed
+    finished_at = Column(DateTime, nullable=True)
+    worker_id = Column(String(200), nullable=True)
+    attempts = Column(Integer, default=0)
+    scrape_run_id = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    __table_args__ = (
+        # claim: oldest queued task, and running tasks with an expired lease
+        Index("ix_scrape_tasks_status_id", "status", "id"),
+    )
+
+class ScrapeWorkerState(Base):
+    """Last state published by a scrape worker process, for /api/health and /api/metrics"""
+    __tablename__ = "scrape_workers"
+    
+    worker_id = Column(String(200), primary_key=True)  # host:pid
+    started_at = Column(DateTime, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False)
+    current_task_id = Column(Integer, nullable=True)
+    status = Column(Text, nullable=True)  # JSON: circuit breakers, HTTP connection and cache counters
+    metrics = Column(Text, nullable=True)  # JSON: MetricsRegistry.export() of the worker
+
+class CacheGeneration(Base):
+    """Counter bumped whenever jobs change, so API processes drop their cached responses"""
+    __tablename__ = "cache_generations"
+    
+    name = Column(String(50), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+
+# Counters maintained in job_stats: (dimension, value expression, condition) over a jobs row,
+# matching what get_job_stats used to aggregate from the jobs table on every call
+JOB_STAT_DIMENSIONS = [
+    ("total", "''", "1"),
+    ("active", "''", "{row}.is_active"),
+    ("day", "date({row}.scraped_date)", "{row}.scraped_date IS NOT NULL"),
+    ("company", "{row}.company", "{row}.is_active"),
+    ("location", "{row}.location", "{row}.is_active AND {row}.location IS NOT NULL"),
+    ("job_type", "{row}.job_type", "{row}.is_active AND {row}.job_type IS NOT NULL"),
+    ("source", "{row}.source", "{row}.is_active"),
+]
+JOB_STAT_COLUMNS = ["is_active", "scraped_date", "company", "location", "job_type", "source"]
+
+# Full-text search: jobs_fts mirrors these columns, folded so Danish spellings match
+# their ASCII transliterations (københavn/kobenhavn/koebenhavn, århus/aarhus, ...)
+JOBS_FTS_COLUMNS = ["title", "company", "description", "requirements"]
+DANISH_FOLDS = [("æ", "ae"), ("Æ", "ae"), ("ø", "o"), ("Ø", "o"), ("å", "a"), ("Å", "a"), ("aa", "a"), ("oe", "o")]
+
+def fold_danish(text: str) -> str:
+    """Python twin of the folding applied to jobs_fts; search queries go through this"""
+    text = text.lower()
+    for original, folded in DANISH_FOLDS:
+        text = text.replace(original, folded)
+    return text
+
+def _fold_danish_sql(expression: str) -> str:
+    # SQLite's lower() only folds ASCII, hence the explicit upper-case Danish letters
+    expression = f"lower(coalesce({expression}, ''))"
+    for original, folded in DANISH_FOLDS:
+        expression = f"replace({expression}, '{original}', '{folded}')"
+    return expression
+
+def _jobs_fts_insert(row: str) -> str:
+    columns = ", ".join(JOBS_FTS_COLUMNS)
+    values = ", ".join(_fold_danish_sql(f"{row}.{column}") for column in JOBS_FTS_COLUMNS)
+    return f"INSERT INTO jobs_fts (rowid, {columns}) SELECT {row}.id, {values}"
+
+def create_jobs_fts():
+    """Create the jobs_fts FTS5 index and the triggers keeping it in step with jobs"""
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                f"{', '.join(JOBS_FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+    except OperationalError as e:
+        logger.warning(f"SQLite FTS5 unavailable, search falls back to LIKE: {e}")
+        return
+    
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in JOBS_FTS_COLUMNS)
+    triggers = {
+        "jobs_fts_insert": f"AFTER INSERT ON jobs BEGIN\n{_jobs_fts_insert('NEW')};\nEND",
+        "jobs_fts_delete": "AFTER DELETE ON jobs BEGIN\nDELETE FROM jobs_fts WHERE rowid = OLD.id;\nEND",
+        "jobs_fts_update": (
+            f"AFTER UPDATE OF {', '.join(JOBS_FTS_COLUMNS)} ON jobs WHEN {changed} BEGIN\n"
+            f"DELETE FROM jobs_fts WHERE rowid = OLD.id;\n{_jobs_fts_insert('NEW')};\nEND"
+        ),
+    }
+    _install_triggers(triggers, rebuild_jobs_fts)
+
+def rebuild_jobs_fts(connection):
+    """Re-index every job in jobs_fts"""
+    connection.exec_driver_sql("DELETE FROM jobs_fts")
+    connection.exec_driver_sql(f"{_jobs_fts_insert('jobs')} FROM jobs")
+
+def jobs_fts_available() -> bool:
+    """Whether the jobs_fts index exists in this database"""
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        ).first() is not None
+
 def create_tables():
     """Create all database tables"""
+    if engine.dialect.name == "sqlite":
+        migrate_legacy_jobs_table()
     Base.metadata.create_all(bind=engine)
+    migrate_database()
+
+def migrate_legacy_jobs_table():
+    """Convert a jobs table written by the old standalone danish_job_scrapers.py schema.
+    
+    That schema had date_posted and scraped_at text columns, a free-text salary and
+    an integer 0-100 relevance_score. Rows are copied into a jobs table built from
+    the Job model (the salary text is dropped); triggers and derived tables are
+    rebuilt afterwards by migrate_database.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("jobs"):
+        return
+    if "date_posted" not in {column["name"] for column in inspector.get_columns("jobs")}:
+        return
+    
+    with engine.begin() as connection:
+        # Indexes and triggers would follow the renamed table and clash with the new ones
+        for kind, name in connection.exec_driver_sql(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = 'jobs' "
+            "AND sql IS NOT NULL"
+        ).fetchall():
+            connection.exec_driver_sql(f"DROP {kind.upper()} {name}")
+        connection.exec_driver_sql("ALTER TABLE jobs RENAME TO jobs_legacy")
+        Job.__table__.create(bind=connection)
+        copied = connection.exec_driver_sql(
+            "INSERT INTO jobs (title, company, location, description, url, source, posted_date, job_type, "
+            "currency, remote_ok, scraped_date, is_active, relevance_score) "
+            "SELECT title, company, location, description, url, lower(replace(source, '.dk', '')), "
+            "datetime(date_posted), lower(job_type), 'DKK', 0, coalesce(datetime(scraped_at), datetime('now')), 1, "
+            "coalesce(relevance_score, 0) / 100.0 "
+            "FROM jobs_legacy WHERE url IS NOT NULL"
+        ).rowcount
+        connection.exec_driver_sql("DROP TABLE jobs_legacy")
+    logger.info(f"Migrated {copied} jobs from the legacy standalone scraper schema")
+
+def migrate_database():
+    """Bring an existing database up to date with the models.
+    
+    create_all only creates missing tables, so columns and indexes added to an
+    existing table (e.g. an ai_jobs.db created by an older version) are created here.
+    """
+    add_missing_columns()
+    
+    created = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if not inspect(engine).has_index(table.name, index.name):
+                index.create(bind=engine)
+                # Skipped when its ddl_if condition rules out this database
+                if inspect(engine).has_index(table.name, index.name):
+                    created.append(index.name)
+    
+    if created and engine.dialect.name == "sqlite":
+        # Refresh planner statistics so the new indexes are picked up
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+    
+    if engine.dialect.name == "sqlite":
+        # Created by older versions; job_stats answers the queries they served
+        with engine.begin() as connection:
+            for name in JOB_STATS_FALLBACK_INDEXES:
+                connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        create_job_stat_triggers()
+        create_jobs_fts()
+        create_dedup_triggers()
+
+def add_missing_columns():
+    """ALTER TABLE ADD COLUMN for model columns an existing table lacks (new columns must be nullable)"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                    logger.info(f"Added column {table.name}.{column.name}")
+
+def _install_triggers(triggers: dict, rebuild):
+    """Create any missing triggers on jobs and rebuild their derived table, in one transaction"""
+    with engine.begin() as connection:
+        existing = {
+            name for (name,) in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs'"
+            )
+        }
+        if set(triggers) <= existing:
+            return
+        
+        for name, body in triggers.items():
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+            connection.exec_driver_sql(f"CREATE TRIGGER {name} {body}")
+        rebuild(connection)
+
+def _job_stat_statements(row: str, delta: int) -> str:
+    """Trigger statements adding delta to every counter the given row (NEW or OLD) contributes to"""
+    statements = []
+    for dimension, value, condition in JOB_STAT_DIMENSIONS:
+        value, condition = value.format(row=row), condition.format(row=row)
+        statements.append(
+            f"INSERT INTO job_stats (dimension, value, job_count) "
+            f"SELECT '{dimension}', {value}, {delta} WHERE {condition} "
+            f"ON CONFLICT (dimension, value) DO UPDATE SET job_count = job_count + excluded.job_count;"
+        )
+        if delta < 0:
+            statements.append(
+                f"DELETE FROM job_stats WHERE dimension = '{dimension}' AND value = {value} AND job_count <= 0;"
+            )
+    return "\n".join(statements)
+
+def create_job_stat_triggers():
+    """Create the triggers maintaining job_stats, rebuilding the counters if they were missing"""
+    changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in JOB_STAT_COLUMNS)
+    triggers = {
+        "jobs_stats_insert": f"AFTER INSERT ON jobs BEGIN\n{_job_stat_statements('NEW', 1)}\nEND",
+        "jobs_stats_delete": f"AFTER DELETE ON jobs BEGIN\n{_job_stat_statements('OLD', -1)}\nEND",
+        "jobs_stats_update": (
+            f"AFTER UPDATE OF {', '.join(JOB_STAT_COLUMNS)} ON jobs WHEN {changed} BEGIN\n"
+            f"{_job_stat_statements('OLD', -1)}\n{_job_stat_statements('NEW', 1)}\nEND"
+        ),
+    }
+    _install_triggers(triggers, rebuild_job_stats)
+
+def rebuild_job_stats(connection):
+    """Recompute every job_stats counter from the jobs table"""
+    connection.exec_driver_sql("DELETE FROM job_stats")
+    for dimension, value, condition in JOB_STAT_DIMENSIONS:
+        value, condition = value.format(row="jobs"), condition.format(row="jobs")
+        connection.exec_driver_sql(
+            f"INSERT INTO job_stats (dimension, value, job_count) "
+            f"SELECT '{dimension}', {value}, count(*) FROM jobs WHERE {condition} GROUP BY {value}"
+        )
+
+def create_dedup_triggers():
+    """Drop a deleted job's LSH bands and merged duplicate URLs along with it"""
+    triggers = {
+        "jobs_dedup_delete": (
+            "AFTER DELETE ON jobs BEGIN\n"
+            "DELETE FROM job_lsh_bands WHERE job_id = OLD.id;\n"
+            "DELETE FROM job_aliases WHERE job_id = OLD.id;\nEND"
+        ),
+    }
+    _install_triggers(triggers, delete_orphaned_dedup_rows)
+
+def delete_orphaned_dedup_rows(connection):
+    """Remove bands and aliases of jobs deleted while the trigger was missing"""
+    for table in ("job_lsh_bands", "job_aliases"):
+        connection.exec_driver_sql(f"DELETE FROM {table} WHERE job_id NOT IN (SELECT id FROM jobs)")
 
 def get_db() -> Session:
     """Get database session"""
@@ -54,4 +441,4 @@ def get_db() -> Session:
 # Database dependency for FastAPI
 def get_db_session() -> Session:
     """Get database session for direct use"""
-    return SessionLocal()
\ No newline at end of file
+    return SessionLocal()
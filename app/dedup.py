@@ -0,0 +1,304 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from .database import Job, JobAlias, JobBand, fold_danish, get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime modulus of the universal hash family
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# jobs.minhash of a job whose description is too short to fingerprint, so backfill skips it
+NO_FINGERPRINT = b""
+
+
+class MinHasher:
+    """MinHash signatures of job postings, cut into LSH bands.
+
+    With num_perm=64 split into 16 bands of 4 rows, two postings share at least one
+    band with probability 1 - (1 - J^4)^16: above 99.9% at Jaccard similarity 0.8,
+    under 1% at 0.2.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        return re.findall(r"\w+", fold_danish(text))
+
+    @classmethod
+    def shingles(cls, title: str, company: str, description: Optional[str]) -> set:
+        """Word 3-grams of the case- and Danish-folded posting text"""
+        tokens = cls.tokens(f"{title} {company} {description or ''}")
+        return {" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+
+    def signature(self, shingles: set) -> np.ndarray:
+        """num_perm minimum hash values (uint32) over the shingles"""
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # uint64 arithmetic wraps around, which keeps the permutations well mixed
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_hashes(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit hash per band, prefixed with the band number so bands never collide"""
+        return [
+            int.from_bytes(
+                hashlib.blake2b(
+                    bytes([band]) + signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8
+                ).digest(),
+                "big",
+                signed=True
+            )
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures (or rows of signatures)"""
+        return np.count_nonzero(first == second, axis=-1) / first.shape[-1]
+
+
+class DuplicateIndex:
+    """Finds stored postings that near-duplicate newly scraped ones, through job_lsh_bands.
+
+    Each job's signature is stored in jobs.minhash and its band hashes in
+    job_lsh_bands, keyed by band hash. A lookup is one indexed IN query per batch;
+    only candidates that share a band are compared, all in one vectorized call, and
+    merged when their estimated similarity reaches the threshold. Bands shared by
+    more than max_bucket stored jobs (boilerplate of templated postings) are skipped,
+    so a lookup does not degrade into comparing against a growing share of the table.
+
+    Jobs with fewer than min_description_tokens words of description (JobIndex
+    listings have none) are neither fingerprinted nor merged: a title and company
+    alone cannot tell two openings apart.
+    """
+
+    def __init__(
+        self,
+        hasher: Optional[MinHasher] = None,
+        threshold: Optional[float] = None,
+        min_description_tokens: Optional[int] = None,
+        max_bucket: Optional[int] = None
+    ):
+        self.hasher = hasher or MinHasher(
+            num_perm=int(os.getenv("DEDUP_NUM_PERM", "64")),
+            bands=int(os.getenv("DEDUP_BANDS", "16"))
+        )
+        self.threshold = threshold if threshold is not None else float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+        self.min_description_tokens = min_description_tokens if min_description_tokens is not None else int(
+            os.getenv("DEDUP_MIN_DESCRIPTION_TOKENS", "20")
+        )
+        self.max_bucket = max_bucket if max_bucket is not None else int(os.getenv("DEDUP_MAX_BUCKET", "50"))
+
+    def fingerprint(self, row: Dict[str, Any]) -> Optional[np.ndarray]:
+        """MinHash signature of a job, or None if its description is too short to tell it apart"""
+        if len(self.hasher.tokens(row.get("description") or "")) < self.min_description_tokens:
+            return None
+        return self.hasher.signature(self.hasher.shingles(row["title"], row["company"], row.get("description")))
+
+    def alias_urls(self, db: Session, urls: List[str], chunk_size: int = 500) -> set:
+        """Return the subset of urls merged into another job"""
+        aliases = set()
+        for i in range(0, len(urls), chunk_size):
+            chunk = urls[i:i + chunk_size]
+            aliases.update(url for (url,) in db.query(JobAlias.url).filter(JobAlias.url.in_(chunk)))
+        return aliases
+
+    def find_duplicates(
+        self, db: Session, signatures: Sequence[np.ndarray], chunk_size: int = 500
+    ) -> List[Optional[Tuple[int, float]]]:
+        """(job id, similarity) of the most similar stored job for each signature, or None"""
+        matches: List[Optional[Tuple[int, float]]] = [None] * len(signatures)
+        if not signatures:
+            return matches
+        band_hashes = [self.hasher.band_hashes(signature) for signature in signatures]
+        wanted = list({band for bands in band_hashes for band in bands})
+
+        # Bands shared by more than max_bucket jobs (boilerplate text) are skipped, so they are never loaded
+        buckets: Dict[int, List[int]] = {}
+        for i in range(0, len(wanted), chunk_size):
+            small = db.query(JobBand.band_hash).filter(
+                JobBand.band_hash.in_(wanted[i:i + chunk_size])
+            ).group_by(JobBand.band_hash).having(func.count() <= self.max_bucket)
+            for band, job_id in db.query(JobBand.band_hash, JobBand.job_id).filter(JobBand.band_hash.in_(small)):
+                buckets.setdefault(band, []).append(job_id)
+
+        candidates = [{job_id for band in bands for job_id in buckets.get(band, ())} for bands in band_hashes]
+        candidate_ids = list(set().union(*candidates))
+        stored: Dict[int, np.ndarray] = {}
+        for i in range(0, len(candidate_ids), chunk_size):
+            for job_id, minhash in db.query(Job.id, Job.minhash).filter(
+                Job.id.in_(candidate_ids[i:i + chunk_size]), Job.minhash.isnot(None)
+            ):
+                if len(minhash) == self.hasher.num_perm * 4:
+                    stored[job_id] = np.frombuffer(minhash, dtype=np.uint32)
+
+        pairs = [(i, job_id) for i, job_ids in enumerate(candidates) for job_id in job_ids if job_id in stored]
+        if not pairs:
+            return matches
+
+        # Every (new, stored) candidate pair compared in one call
+        row_of = {job_id: row for row, job_id in enumerate(stored)}
+        similarities = self.hasher.similarity(
+            np.stack(signatures)[[i for i, _ in pairs]],
+            np.stack(list(stored.values()))[[row_of[job_id] for _, job_id in pairs]]
+        )
+        for k in np.flatnonzero(similarities >= self.threshold):
+            i, job_id = pairs[k]
+            if matches[i] is None or similarities[k] > matches[i][1]:
+                matches[i] = (job_id, float(similarities[k]))
+        return matches
+
+    def merge_batch(
+        self, db: Session, rows: List[Dict[str, Any]], existing_urls: set
+    ) -> Tuple[List[Dict[str, Any]], Dict[int, List[str]], int]:
+        """Fingerprint scored job rows and fold near-duplicates into their canonical job.
+
+        A new row that duplicates a stored job, or an earlier new row of the same
+        batch, is dropped and its URL recorded against the canonical one. Rows whose
+        URL is already stored, and rows too short to fingerprint, are kept as they are.
+        Every returned row gets minhash and source_urls values. Returns (rows to write,
+        stored job id -> merged URLs, number of rows merged).
+        """
+        signatures = [self.fingerprint(row) for row in rows]
+        new = [i for i, row in enumerate(rows) if row["url"] not in existing_urls and signatures[i] is not None]
+        matches = dict(zip(new, self.find_duplicates(db, [signatures[i] for i in new])))
+
+        kept: List[int] = []
+        source_urls: Dict[int, List[str]] = {}
+        job_merges: Dict[int, List[str]] = {}
+        batch_bands: Dict[int, List[int]] = {}
+        merged = 0
+        for i, (row, signature) in enumerate(zip(rows, signatures)):
+            if i in matches:
+                if matches[i] is not None:
+                    job_merges.setdefault(matches[i][0], []).append(row["url"])
+                    merged += 1
+                    continue
+
+                bands = self.hasher.band_hashes(signature)
+                earlier = sorted({j for band in bands for j in batch_bands.get(band, ())})
+                if earlier:
+                    similarities = self.hasher.similarity(signature, np.stack([signatures[j] for j in earlier]))
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.threshold:
+                        source_urls[earlier[best]].append(row["url"])
+                        merged += 1
+                        continue
+                for band in bands:
+                    batch_bands.setdefault(band, []).append(i)
+
+            kept.append(i)
+            source_urls[i] = [row["url"]]
+            row["minhash"] = signature.tobytes() if signature is not None else NO_FINGERPRINT
+
+        for i in kept:
+            rows[i]["source_urls"] = json.dumps(source_urls[i])
+        return [rows[i] for i in kept], job_merges, merged
+
+    def index_batch(self, db: Session, rows: List[Dict[str, Any]], job_merges: Dict[int, List[str]]):
+        """Store band hashes and aliases for rows just written, and URLs merged into stored jobs"""
+        ids = {}
+        urls = [row["url"] for row in rows]
+        for i in range(0, len(urls), 500):
+            ids.update(db.query(Job.url, Job.id).filter(Job.url.in_(urls[i:i + 500])).all())
+
+        bands, aliases = [], []
+        for row in rows:
+            job_id = ids[row["url"]]
+            if row["minhash"] != NO_FINGERPRINT:
+                signature = np.frombuffer(row["minhash"], dtype=np.uint32)
+                bands.extend({"band_hash": band, "job_id": job_id} for band in set(self.hasher.band_hashes(signature)))
+            # An updated job keeps its stored source_urls, so only new rows bring aliases
+            aliases.extend({"url": url, "job_id": job_id} for url in json.loads(row["source_urls"])[1:])
+        for job_id, merged_urls in job_merges.items():
+            aliases.extend({"url": url, "job_id": job_id} for url in merged_urls)
+
+        # Updated jobs may have a new signature
+        job_ids = list(ids.values())
+        for i in range(0, len(job_ids), 500):
+            db.query(JobBand).filter(JobBand.job_id.in_(job_ids[i:i + 500])).delete(synchronize_session=False)
+        if bands:
+            db.execute(insert(JobBand), bands)
+        if aliases:
+            db.execute(insert(JobAlias), aliases)
+
+        if job_merges:
+            canonical = db.query(Job.id, Job.url, Job.source_urls).filter(Job.id.in_(list(job_merges))).all()
+            db.execute(update(Job), [
+                {
+                    "id": job.id,
+                    "source_urls": json.dumps(
+                        (json.loads(job.source_urls) if job.source_urls else [job.url]) + job_merges[job.id]
+                    )
+                }
+                for job in canonical
+            ])
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """Fingerprint and index stored jobs that predate near-duplicate detection.
+
+        Existing duplicates are only indexed, not merged; new postings are matched
+        against them from then on. Returns the number of jobs fingerprinted.
+        """
+        db = get_db_session()
+        done = 0
+        try:
+            last_id = 0
+            while True:
+                jobs = db.query(Job.id, Job.url, Job.title, Job.company, Job.description).filter(
+                    Job.minhash.is_(None), Job.id > last_id
+                ).order_by(Job.id).limit(batch_size).all()
+                if not jobs:
+                    break
+                last_id = jobs[-1].id
+
+                updates, bands = [], []
+                for job in jobs:
+                    signature = self.fingerprint(job._asdict())
+                    updates.append({
+                        "id": job.id,
+                        "minhash": signature.tobytes() if signature is not None else NO_FINGERPRINT,
+                        "source_urls": json.dumps([job.url])
+                    })
+                    if signature is not None:
+                        bands.extend(
+                            {"band_hash": band, "job_id": job.id} for band in set(self.hasher.band_hashes(signature))
+                        )
+                db.query(JobBand).filter(JobBand.job_id.in_([job.id for job in jobs])).delete(synchronize_session=False)
+                db.execute(update(Job), updates)
+                if bands:
+                    db.execute(insert(JobBand), bands)
+                db.commit()
+                done += len(jobs)
+
+            if done:
+                logger.info(f"Fingerprinted {done} stored jobs for near-duplicate detection")
+            return done
+
+        except Exception as e:
+            logger.error(f"Error fingerprinting stored jobs: {e}")
+            db.rollback()
+            return done
+        finally:
+            db.close()
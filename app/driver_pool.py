@@ -0,0 +1,115 @@
+import logging
+import queue
+import threading
+from typing import Dict, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = logging.getLogger(__name__)
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def resolve_driver_path() -> str:
+    """Resolve (and if needed download) the chromedriver binary, once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+            logger.info(f"Using chromedriver at {_driver_path}")
+        return _driver_path
+
+
+class WebDriverPool:
+    """Thread-safe pool of warm headless Chrome instances.
+
+    At most `size` drivers exist at once. A driver is recycled after serving
+    `max_pages` leases, or when it no longer responds (e.g. Chrome crashed).
+    """
+
+    def __init__(self, options: Options, size: int = 2, max_pages: int = 50):
+        self.options = options
+        self.size = size
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()  # LIFO keeps the most recently used drivers warm
+        self._pages: Dict[webdriver.Chrome, int] = {}
+        self._closed = False
+        self.stats = {'started': 0, 'recycled': 0, 'crashed': 0}
+
+    def warm(self):
+        """Resolve the driver binary up front so the first scrape does not pay for it"""
+        try:
+            resolve_driver_path()
+        except Exception as e:
+            logger.warning(f"Could not resolve chromedriver: {e}")
+
+    def _start_driver(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=self.options)
+        self._pages[driver] = 0
+        self.stats['started'] += 1
+        return driver
+
+    def _quit_driver(self, driver: webdriver.Chrome):
+        self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Borrow a driver, reusing an idle one or starting a new one"""
+        if self._closed:
+            raise RuntimeError("WebDriver pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a WebDriver")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._start_driver()
+                if self._is_alive(driver):
+                    return driver
+                logger.warning("Discarding crashed WebDriver")
+                self.stats['crashed'] += 1
+                self._quit_driver(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver: webdriver.Chrome):
+        """Return a borrowed driver, recycling it once it has served max_pages"""
+        try:
+            self._pages[driver] = self._pages.get(driver, 0) + 1
+            if self._closed:
+                self._quit_driver(driver)
+            elif self._pages[driver] >= self.max_pages:
+                self.stats['recycled'] += 1
+                self._quit_driver(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quit all idle drivers; leased drivers are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                self._quit_driver(self._idle.get_nowait())
+            except queue.Empty:
+                break
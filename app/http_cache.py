@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPage(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    digest: str
+    body: bytes
+
+
+class HTTPCache:
+    """Persistent store of fetched pages and their validators, in its own SQLite file.
+
+    Lets the scraper send conditional requests (If-None-Match / If-Modified-Since)
+    and recognise pages that did not change since the last run, either from a
+    304 or because the body is byte-for-byte the same.
+
+    Writes can be staged (the staged dict of store and revalidated) and applied
+    with commit() once the pages' jobs are stored, so a failed run does not leave
+    pages that look unchanged to the next run although their jobs were lost.
+    """
+
+    def __init__(self, path: str, max_age_days: float = 30):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_type TEXT, digest TEXT NOT NULL, "
+            "body BLOB NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'changed': 0, 'bytes_saved': 0}
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Return the stored copy of url, if any"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, content_type, digest, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        *validators, body = row
+        return CachedPage(*validators, zlib.decompress(body))
+
+    @staticmethod
+    def conditional_headers(page: CachedPage) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified"""
+        headers = {}
+        if page.etag:
+            headers['If-None-Match'] = page.etag
+        if page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+        return headers
+
+    def _write(self, url: str, statement: Tuple[str, tuple], staged: Optional[Dict[str, Tuple[str, tuple]]]):
+        if staged is not None:
+            staged[url] = statement
+            return
+        with self._lock:
+            self._connection.execute(*statement)
+            self._connection.commit()
+
+    def store(self, url: str, response: httpx.Response, staged: Optional[Dict] = None) -> bool:
+        """Store a 200 response (or stage it in staged); returns True if its body is the same as the stored one"""
+        digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        with self._lock:
+            row = self._connection.execute("SELECT digest FROM pages WHERE url = ?", (url,)).fetchone()
+        unchanged = row is not None and row[0] == digest
+        if unchanged:
+            statement = (
+                "UPDATE pages SET etag = ?, last_modified = ?, fetched_at = ? WHERE url = ?",
+                (response.headers.get('etag'), response.headers.get('last-modified'), time.time(), url)
+            )
+        else:
+            statement = (
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_type, digest, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, response.headers.get('etag'), response.headers.get('last-modified'),
+                 response.headers.get('content-type'), digest, zlib.compress(response.content, 6), time.time())
+            )
+        self._write(url, statement, staged)
+        self.stats['unchanged' if unchanged else 'changed'] += 1
+        return unchanged
+
+    def revalidated(self, url: str, page: CachedPage, response: httpx.Response, staged: Optional[Dict] = None):
+        """Record a 304 for url (or stage it in staged), keeping any validators the server refreshed"""
+        self._write(url, (
+            "UPDATE pages SET etag = ?, last_modified = ?, fetched_at = ? WHERE url = ?",
+            (response.headers.get('etag', page.etag),
+             response.headers.get('last-modified', page.last_modified), time.time(), url)
+        ), staged)
+        self.stats['not_modified'] += 1
+        self.stats['bytes_saved'] += len(page.body)
+
+    def commit(self, staged: Dict[str, Tuple[str, tuple]]):
+        """Apply writes staged by store and revalidated, in one transaction"""
+        with self._lock:
+            for statement in staged.values():
+                self._connection.execute(*statement)
+            self._connection.commit()
+
+    def prune(self) -> int:
+        """Drop pages not fetched within max_age"""
+        with self._lock:
+            deleted = self._connection.execute(
+                "DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            self._connection.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} pages from the HTTP cache")
+        return deleted
+
+    def get_stats(self) -> Dict:
+        """Revalidation outcomes since startup"""
+        return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,16 +1,38 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, or_, false, insert, update, tuple_, select, table, column, literal_column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, timedelta
+import base64
 import json
 import logging
+import os
+import re
 
-from .database import get_db_session, Job
+from .database import (
+    get_db_session, CacheGeneration, Job, JobStat, ScrapeRun, JOBS_FTS_COLUMNS, fold_danish, jobs_fts_available
+)
+from .dedup import DuplicateIndex
+from .metrics import span
 from .models import JobCreate, JobResponse, JobStats
+from .scoring import compile_keyword_pattern, keyword_implications
 
 logger = logging.getLogger(__name__)
 
+# FTS5 index over the searchable job columns (see create_jobs_fts)
+jobs_fts = table("jobs_fts", column("rowid"), column("jobs_fts"))
+
 class JobService:
+    # Columns refreshed when a scraped job is already stored (scraped_date keeps the first sighting)
+    UPSERT_FIELDS = (
+        "title", "company", "location", "description", "requirements", "salary_min", "salary_max",
+        "currency", "job_type", "remote_ok", "source", "posted_date", "ai_keywords", "relevance_score",
+        "is_active", "minhash"
+    )
+    
+    # BM25 weight of each JOBS_FTS_COLUMNS column: title, company, description, requirements
+    SEARCH_COLUMN_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+    
     def __init__(self):
         self.ai_keywords = [
             "artificial intelligence", "ai", "machine learning", "ml", "deep learning",
@@ -29,29 +51,45 @@ class JobService:
             "køge", "holstebro", "taastrup", "slagelse", "hillerød", "sønderborg",
             "danish", "dansk", "remote denmark", "hybrid denmark"
         ]
+        
+        # Relevance weight per keyword; keywords not listed here score 0.05
+        self.keyword_weights = {
+            **{kw: 0.2 for kw in ["ai trainer", "ai consultant", "ai mentor", "ai project lead", "ai curator"]},
+            **{kw: 0.15 for kw in ["artificial intelligence", "ai", "generative ai"]},
+            **{kw: 0.1 for kw in ["machine learning", "ml", "deep learning"]}
+        }
+        self.title_bonus_keywords = ["ai", "artificial intelligence", "machine learning"]
+        self._compile_keyword_matchers()
+        
+        # Merges the same posting scraped from several sources into one job
+        self.duplicates = DuplicateIndex()
+        
+        # Share of relevance_score in search ranking; 0 ranks search results by BM25 alone
+        self.search_relevance_weight = float(os.getenv("SEARCH_RELEVANCE_WEIGHT", "0.3"))
+    
+    def _compile_keyword_matchers(self):
+        """Precompute the single-pass keyword matcher and per-keyword weights"""
+        keywords = [keyword.lower() for keyword in self.ai_keywords]
+        self._keyword_pattern = compile_keyword_pattern(keywords, overlapping=True)
+        self._title_bonus_pattern = compile_keyword_pattern(self.title_bonus_keywords)
+        self._keyword_order = {keyword: i for i, keyword in enumerate(keywords)}
+        self._keyword_score = [self.keyword_weights.get(keyword, 0.05) for keyword in keywords]
+        self._implied_keywords = keyword_implications(keywords)
     
     def calculate_relevance_score(self, title: str, description: str, requirements: str) -> tuple[float, List[str]]:
-        """Calculate AI relevance score and extract matching keywords"""
+        """Calculate AI relevance score and extract matching keywords in one pass over the text"""
         text = f"{title} {description} {requirements}".lower()
-        matched_keywords = []
-        score = 0.0
-        
-        for keyword in self.ai_keywords:
-            if keyword.lower() in text:
-                matched_keywords.append(keyword)
-                # Weight different keywords differently
-                if keyword.lower() in ["ai trainer", "ai consultant", "ai mentor", "ai project lead", "ai curator"]:
-                    score += 0.2
-                elif keyword.lower() in ["artificial intelligence", "ai", "generative ai"]:
-                    score += 0.15
-                elif keyword.lower() in ["machine learning", "ml", "deep learning"]:
-                    score += 0.1
-                else:
-                    score += 0.05
+        
+        found = set()
+        for match in self._keyword_pattern.finditer(text):
+            found.update(self._implied_keywords[match.group(1)])
+        
+        indices = sorted(self._keyword_order[keyword] for keyword in found)
+        matched_keywords = [self.ai_keywords[i] for i in indices]
+        score = sum((self._keyword_score[i] for i in indices), 0.0)
         
         # Bonus for title matches
-        title_lower = title.lower()
-        if any(kw in title_lower for kw in ["ai", "artificial intelligence", "machine learning"]):
+        if self._title_bonus_pattern.search(title.lower()):
             score += 0.1
             
         return min(score, 1.0), matched_keywords
@@ -64,56 +102,75 @@ class JobService:
         text = f"{location} {company} {description}".lower()
         return any(danish_loc in text for danish_loc in self.danish_locations)
     
+    def build_job_row(self, job_data: JobCreate) -> Optional[Dict[str, Any]]:
+        """Score a scraped job and return its column values, or None if it is not relevant and Danish"""
+        # Calculate AI relevance score
+        description = job_data.description or ""
+        requirements = job_data.requirements or ""
+        
+        relevance_score, matched_keywords = self.calculate_relevance_score(
+            job_data.title, description, requirements
+        )
+        
+        # Check if it's a Danish job
+        is_danish = self.is_danish_job(
+            job_data.location or "", 
+            job_data.company, 
+            description
+        )
+        
+        # Only save jobs that are relevant and Danish
+        if relevance_score < 0.1 or not is_danish:
+            logger.info(f"Skipping job due to low relevance or non-Danish: {job_data.title}")
+            return None
+        
+        return {
+            "title": job_data.title,
+            "company": job_data.company,
+            "location": job_data.location,
+            "description": job_data.description,
+            "requirements": job_data.requirements,
+            "salary_min": job_data.salary_min,
+            "salary_max": job_data.salary_max,
+            "currency": job_data.currency,
+            "job_type": job_data.job_type,
+            "remote_ok": job_data.remote_ok,
+            "url": job_data.url,
+            "source": job_data.source,
+            "posted_date": job_data.posted_date,
+            "scraped_date": datetime.utcnow(),
+            "is_active": True,
+            "ai_keywords": json.dumps(matched_keywords),
+            "relevance_score": relevance_score
+        }
+    
     async def create_job(self, job_data: JobCreate) -> Optional[JobResponse]:
         """Create a new job with AI scoring"""
         db = get_db_session()
         try:
-            # Check if job already exists
+            # Check if job already exists, under its own URL or merged into another job
             existing_job = db.query(Job).filter(Job.url == job_data.url).first()
-            if existing_job:
+            if existing_job or self.duplicates.alias_urls(db, [job_data.url]):
                 logger.info(f"Job already exists: {job_data.url}")
                 return None
             
-            # Calculate AI relevance score
-            description = job_data.description or ""
-            requirements = job_data.requirements or ""
-            
-            relevance_score, matched_keywords = self.calculate_relevance_score(
-                job_data.title, description, requirements
-            )
-            
-            # Check if it's a Danish job
-            is_danish = self.is_danish_job(
-                job_data.location or "", 
-                job_data.company, 
-                description
-            )
+            row = self.build_job_row(job_data)
+            if row is None:
+                return None
             
-            # Only save jobs that are relevant and Danish
-            if relevance_score < 0.1 or not is_danish:
-                logger.info(f"Skipping job due to low relevance or non-Danish: {job_data.title}")
+            rows, job_merges, merged = self.duplicates.merge_batch(db, [row], set())
+            if merged:
+                self.duplicates.index_batch(db, [], job_merges)
+                db.commit()
+                logger.info(f"Merged duplicate job {job_data.url} into job {next(iter(job_merges))}")
                 return None
             
             # Create job instance
-            job = Job(
-                title=job_data.title,
-                company=job_data.company,
-                location=job_data.location,
-                description=job_data.description,
-                requirements=job_data.requirements,
-                salary_min=job_data.salary_min,
-                salary_max=job_data.salary_max,
-                currency=job_data.currency,
-                job_type=job_data.job_type,
-                remote_ok=job_data.remote_ok,
-                url=job_data.url,
-                source=job_data.source,
-                posted_date=job_data.posted_date,
-                ai_keywords=json.dumps(matched_keywords),
-                relevance_score=relevance_score
-            )
+            job = Job(**row)
             
             db.add(job)
+            db.flush()
+            self.duplicates.index_batch(db, [row], {})
             db.commit()
             db.refresh(job)
             
@@ -127,15 +184,148 @@ class JobService:
         finally:
             db.close()
     
+    async def bulk_upsert(self, jobs: List[JobCreate], raise_errors: bool = False) -> Dict[str, int]:
+        """Score, filter and write a batch of scraped jobs in a single transaction.
+        
+        Returns counts of inserted, updated, merged and skipped jobs. A job already
+        stored is only updated when the scrape brought a description to rescore it
+        with; a new job that near-duplicates a stored one (or another job of the
+        batch) is merged into it as an extra source URL instead of being inserted.
+        A failed write is rolled back and counted as all skipped, or re-raised with
+        raise_errors (the pipeline must not save high-water marks past lost jobs).
+        """
+        counts = {"inserted": 0, "updated": 0, "merged": 0, "skipped": 0}
+        
+        # Deduplicate the batch by URL
+        batch: Dict[str, JobCreate] = {}
+        for job_data in jobs:
+            if job_data.url in batch:
+                counts["skipped"] += 1
+            else:
+                batch[job_data.url] = job_data
+        
+        if not batch:
+            return counts
+        
+        db = get_db_session()
+        try:
+            with span("dedup"):
+                existing_urls = self._existing_urls(db, list(batch))
+                alias_urls = self.duplicates.alias_urls(db, list(batch))
+                
+                candidates = []
+                for url, job_data in batch.items():
+                    if url in alias_urls or (url in existing_urls and not job_data.description):
+                        counts["skipped"] += 1
+                    else:
+                        candidates.append(job_data)
+            
+            # Per-job scoring: at ingestion batch sizes it beats BatchScorer (benchmarks/bench_scoring.py)
+            rows = []
+            with span("score"):
+                for job_data in candidates:
+                    row = self.build_job_row(job_data)
+                    if row is None:
+                        counts["skipped"] += 1
+                        continue
+                    
+                    rows.append(row)
+            
+            with span("dedup"):
+                rows, job_merges, counts["merged"] = self.duplicates.merge_batch(db, rows, existing_urls)
+            for row in rows:
+                counts["updated" if row["url"] in existing_urls else "inserted"] += 1
+            
+            with span("write"):
+                if rows:
+                    self._upsert_rows(db, rows)
+                self.duplicates.index_batch(db, rows, job_merges)
+                db.commit()
+            
+            logger.info(
+                f"Bulk upsert: {counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['merged']} merged, {counts['skipped']} skipped"
+            )
+            return counts
+            
+        except Exception as e:
+            logger.error(f"Error bulk upserting jobs: {e}")
+            db.rollback()
+            if raise_errors:
+                raise
+            return {"inserted": 0, "updated": 0, "merged": 0, "skipped": len(jobs)}
+        finally:
+            db.close()
+    
+    def _existing_urls(self, db: Session, urls: List[str], chunk_size: int = 500) -> set:
+        """Return the stored subset of urls, with one IN query per chunk"""
+        existing = set()
+        for i in range(0, len(urls), chunk_size):
+            chunk = urls[i:i + chunk_size]
+            existing.update(url for (url,) in db.query(Job.url).filter(Job.url.in_(chunk)))
+        return existing
+    
+    def _upsert_rows(self, db: Session, rows: List[Dict[str, Any]]):
+        """Insert rows, updating UPSERT_FIELDS of rows whose URL is already stored"""
+        if db.get_bind().dialect.name == "sqlite":
+            stmt = sqlite_insert(Job)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.url],
+                set_={field: stmt.excluded[field] for field in self.UPSERT_FIELDS}
+            )
+            db.execute(stmt, rows)
+            return
+        
+        ids = dict(db.query(Job.url, Job.id).filter(Job.url.in_([row["url"] for row in rows])).all())
+        new_rows = [row for row in rows if row["url"] not in ids]
+        updated_rows = [
+            {"id": ids[row["url"]], **{field: row[field] for field in self.UPSERT_FIELDS}}
+            for row in rows if row["url"] in ids
+        ]
+        if new_rows:
+            db.execute(insert(Job), new_rows)
+        if updated_rows:
+            db.execute(update(Job), updated_rows)
+    
+    @staticmethod
+    def encode_cursor(job: JobResponse) -> str:
+        """Opaque keyset cursor pointing just after job in get_jobs' sort order"""
+        key = [job.relevance_score, job.scraped_date.isoformat(), job.id]
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            relevance_score, scraped_date, job_id = json.loads(base64.urlsafe_b64decode(padded))
+            return float(relevance_score), datetime.fromisoformat(scraped_date), int(job_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+    
     async def get_jobs(
         self, 
         limit: int = 50, 
         offset: int = 0,
         location: Optional[str] = None,
         job_type: Optional[str] = None,
-        days_ago: Optional[int] = 30
+        days_ago: Optional[int] = 30,
+        cursor: Optional[str] = None,
+        q: Optional[str] = None,
+        raise_errors: bool = False
     ) -> List[JobResponse]:
-        """Get paginated list of jobs with filters"""
+        """Get paginated list of jobs with filters.
+        
+        With a cursor (from encode_cursor on the last job of the previous page) the page
+        is found by seeking the (relevance_score, scraped_date, id) index, so page N costs
+        the same as page 1; offset is ignored. Without one, offset pagination is used.
+        
+        With a search query q, jobs are matched through the jobs_fts index and ranked by
+        BM25 blended with relevance_score; search results are paginated by offset only.
+        
+        A database error returns an empty list, or is re-raised with raise_errors (the
+        API must not cache the empty list as the real page).
+        """
         db = get_db_session()
         try:
             query = db.query(Job).filter(Job.is_active == True)
@@ -153,87 +343,73 @@ class JobService:
             if job_type:
                 query = query.filter(Job.job_type.ilike(f"%{job_type}%"))
             
-            # Order by relevance score and date
-            query = query.order_by(desc(Job.relevance_score), desc(Job.scraped_date))
+            if q:
+                query = self._search(query, q)
+                return [JobResponse.from_orm(job) for job in query.offset(offset).limit(limit).all()]
+            
+            # Order by relevance score and date, with id as a unique tie-breaker for cursors
+            query = query.order_by(desc(Job.relevance_score), desc(Job.scraped_date), desc(Job.id))
             
             # Apply pagination
-            jobs = query.offset(offset).limit(limit).all()
+            if cursor:
+                query = query.filter(
+                    tuple_(Job.relevance_score, Job.scraped_date, Job.id) < tuple_(*self.decode_cursor(cursor))
+                )
+            else:
+                query = query.offset(offset)
+            jobs = query.limit(limit).all()
             
             return [JobResponse.from_orm(job) for job in jobs]
             
         except Exception as e:
             logger.error(f"Error fetching jobs: {e}")
+            if raise_errors:
+                raise
             return []
         finally:
             db.close()
     
-    async def get_job_stats(self) -> JobStats:
-        """Get job statistics"""
+    def _search(self, query, q: str):
+        """Restrict query to jobs matching every word of q, best matches first"""
+        terms = re.findall(r"\w+", fold_danish(q))
+        if not terms:
+            return query.filter(false())
+        
+        if not jobs_fts_available():
+            for term in terms:
+                pattern = f"%{term}%"
+                query = query.filter(or_(*[getattr(Job, name).ilike(pattern) for name in JOBS_FTS_COLUMNS]))
+            return query.order_by(desc(Job.relevance_score), desc(Job.scraped_date), desc(Job.id))
+        
+        # Quote every term so user input is never parsed as FTS5 query syntax
+        match = " ".join(f'"{term}"' for term in terms)
+        weights = ", ".join(str(weight) for weight in self.SEARCH_COLUMN_WEIGHTS)
+        matches = select(
+            jobs_fts.c.rowid.label("job_id"),
+            literal_column(f"bm25(jobs_fts, {weights})").label("rank")
+        ).where(jobs_fts.c.jobs_fts.op("MATCH")(match)).subquery()
+        
+        # bm25 is negative, lower is better; map it onto [0, 1) to blend with relevance_score.
+        # (Normalising against the best match with a window function made SQLite drive the
+        # join from jobs instead of from the FTS matches.)
+        text_score = -matches.c.rank / (1 - matches.c.rank)
+        weight = self.search_relevance_weight
+        return query.join(matches, matches.c.job_id == Job.id).order_by(
+            desc((1 - weight) * text_score + weight * Job.relevance_score), desc(Job.id)
+        )
+    
+    async def get_job_stats(self, raise_errors: bool = False) -> JobStats:
+        """Get job statistics; a database error returns zeroed stats, or is re-raised with raise_errors"""
         db = get_db_session()
         try:
-            # Basic counts
-            total_jobs = db.query(Job).count()
-            active_jobs = db.query(Job).filter(Job.is_active == True).count()
-            
-            today = datetime.utcnow().date()
-            jobs_today = db.query(Job).filter(
-                func.date(Job.scraped_date) == today
-            ).count()
-            
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            jobs_this_week = db.query(Job).filter(
-                Job.scraped_date >= week_ago
-            ).count()
-            
-            # Top companies
-            top_companies = db.query(
-                Job.company,
-                func.count(Job.id).label('count')
-            ).filter(Job.is_active == True).group_by(Job.company).order_by(
-                desc('count')
-            ).limit(10).all()
-            
-            # Top locations
-            top_locations = db.query(
-                Job.location,
-                func.count(Job.id).label('count')
-            ).filter(
-                and_(Job.is_active == True, Job.location.isnot(None))
-            ).group_by(Job.location).order_by(
-                desc('count')
-            ).limit(10).all()
-            
-            # Job types
-            job_types = db.query(
-                Job.job_type,
-                func.count(Job.id).label('count')
-            ).filter(
-                and_(Job.is_active == True, Job.job_type.isnot(None))
-            ).group_by(Job.job_type).order_by(
-                desc('count')
-            ).limit(10).all()
-            
-            # Sources
-            sources = db.query(
-                Job.source,
-                func.count(Job.id).label('count')
-            ).filter(Job.is_active == True).group_by(Job.source).order_by(
-                desc('count')
-            ).all()
-            
-            return JobStats(
-                total_jobs=total_jobs,
-                active_jobs=active_jobs,
-                jobs_today=jobs_today,
-                jobs_this_week=jobs_this_week,
-                top_companies=[{"name": company, "count": count} for company, count in top_companies],
-                top_locations=[{"name": location, "count": count} for location, count in top_locations],
-                job_types=[{"name": job_type, "count": count} for job_type, count in job_types],
-                sources=[{"name": source, "count": count} for source, count in sources]
-            )
+            if db.get_bind().dialect.name == "sqlite":
+                return self._read_job_stats(db)
+            return self._aggregate_job_stats(db)
             
         except Exception as e:
             logger.error(f"Error fetching job stats: {e}")
+            if raise_errors:
+                raise
             return JobStats(
                 total_jobs=0, active_jobs=0, jobs_today=0, jobs_this_week=0,
                 top_companies=[], top_locations=[], job_types=[], sources=[]
@@ -241,6 +417,103 @@ class JobService:
         finally:
             db.close()
     
+    def _read_job_stats(self, db: Session) -> JobStats:
+        """Read the counters the job_stats triggers maintain, so the cost does not grow with the jobs table"""
+        def top(dimension: str, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+            query = db.query(JobStat.value, JobStat.job_count).filter(
+                JobStat.dimension == dimension
+            ).order_by(desc(JobStat.job_count))
+            if limit:
+                query = query.limit(limit)
+            return [{"name": value, "count": count} for value, count in query]
+        
+        def count(dimension: str) -> int:
+            return db.query(func.coalesce(func.sum(JobStat.job_count), 0)).filter(
+                JobStat.dimension == dimension
+            ).scalar()
+        
+        # Per-day counters: "this week" is today and the six days before it
+        today = datetime.utcnow().date()
+        days = dict(db.query(JobStat.value, JobStat.job_count).filter(
+            JobStat.dimension == "day",
+            JobStat.value >= (today - timedelta(days=6)).isoformat()
+        ).all())
+        
+        return JobStats(
+            total_jobs=count("total"),
+            active_jobs=count("active"),
+            jobs_today=days.get(today.isoformat(), 0),
+            jobs_this_week=sum(days.values()),
+            top_companies=top("company"),
+            top_locations=top("location"),
+            job_types=top("job_type"),
+            sources=top("source", limit=None)
+        )
+    
+    def _aggregate_job_stats(self, db: Session) -> JobStats:
+        """Compute statistics from the jobs table, for databases without the job_stats triggers"""
+        # Basic counts
+        total_jobs = db.query(Job).count()
+        active_jobs = db.query(Job).filter(Job.is_active == True).count()
+        
+        # Range on scraped_date rather than date(scraped_date), so the index is used
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        jobs_today = db.query(Job).filter(
+            Job.scraped_date >= today,
+            Job.scraped_date < today + timedelta(days=1)
+        ).count()
+        
+        jobs_this_week = db.query(Job).filter(
+            Job.scraped_date >= today - timedelta(days=6)
+        ).count()
+        
+        # Top companies
+        top_companies = db.query(
+            Job.company,
+            func.count(Job.id).label('count')
+        ).filter(Job.is_active == True).group_by(Job.company).order_by(
+            desc('count')
+        ).limit(10).all()
+        
+        # Top locations
+        top_locations = db.query(
+            Job.location,
+            func.count(Job.id).label('count')
+        ).filter(
+            and_(Job.is_active == True, Job.location.isnot(None))
+        ).group_by(Job.location).order_by(
+            desc('count')
+        ).limit(10).all()
+        
+        # Job types
+        job_types = db.query(
+            Job.job_type,
+            func.count(Job.id).label('count')
+        ).filter(
+            and_(Job.is_active == True, Job.job_type.isnot(None))
+        ).group_by(Job.job_type).order_by(
+            desc('count')
+        ).limit(10).all()
+        
+        # Sources
+        sources = db.query(
+            Job.source,
+            func.count(Job.id).label('count')
+        ).filter(Job.is_active == True).group_by(Job.source).order_by(
+            desc('count')
+        ).all()
+        
+        return JobStats(
+            total_jobs=total_jobs,
+            active_jobs=active_jobs,
+            jobs_today=jobs_today,
+            jobs_this_week=jobs_this_week,
+            top_companies=[{"name": company, "count": count} for company, count in top_companies],
+            top_locations=[{"name": location, "count": count} for location, count in top_locations],
+            job_types=[{"name": job_type, "count": count} for job_type, count in job_types],
+            sources=[{"name": source, "count": count} for source, count in sources]
+        )
+    
     async def delete_job(self, job_id: int) -> bool:
         """Delete a job"""
         db = get_db_session()
@@ -256,4 +529,111 @@ class JobService:
             db.rollback()
             return False
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+    
+    def record_scrape_run(
+        self,
+        started_at: datetime,
+        duration_seconds: float,
+        sources: List[str],
+        force_refresh: bool,
+        totals: Dict[str, int],
+        stage_seconds: Dict[str, float],
+        error: Optional[str] = None
+    ) -> Optional[int]:
+        """Store the summary row of a finished (or failed) scraping run and return its id"""
+        db = get_db_session()
+        try:
+            run = ScrapeRun(
+                started_at=started_at,
+                finished_at=started_at + timedelta(seconds=duration_seconds),
+                duration_seconds=round(duration_seconds, 3),
+                sources=",".join(sources),
+                force_refresh=force_refresh,
+                status="failed" if error else "ok",
+                error=error,
+                scraped=totals.get("scraped", 0),
+                inserted=totals.get("inserted", 0),
+                updated=totals.get("updated", 0),
+                merged=totals.get("merged", 0),
+                skipped=totals.get("skipped", 0),
+                stage_seconds=json.dumps({stage: round(seconds, 3) for stage, seconds in stage_seconds.items()})
+            )
+            db.add(run)
+            db.commit()
+            return run.id
+        except Exception as e:
+            logger.error(f"Error recording scrape run: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+    
+    def get_last_scrape_run(self) -> Optional[Dict[str, Any]]:
+        """The most recent scraping run summary, if any"""
+        db = get_db_session()
+        try:
+            run = db.query(ScrapeRun).order_by(desc(ScrapeRun.started_at)).first()
+            return self._scrape_run_summary(run) if run else None
+        except Exception as e:
+            logger.error(f"Error getting last scrape run: {e}")
+            return None
+        finally:
+            db.close()
+    
+    def get_scrape_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Summary of the scraping run run_id, if it exists"""
+        db = get_db_session()
+        try:
+            run = db.get(ScrapeRun, run_id)
+            return self._scrape_run_summary(run) if run else None
+        except Exception as e:
+            logger.error(f"Error getting scrape run {run_id}: {e}")
+            return None
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _scrape_run_summary(run: ScrapeRun) -> Dict[str, Any]:
+        return {
+            "id": run.id,
+            "started_at": run.started_at.isoformat(),
+            "duration_seconds": run.duration_seconds,
+            "sources": run.sources.split(",") if run.sources else [],
+            "status": run.status,
+            "error": run.error,
+            "scraped": run.scraped,
+            "inserted": run.inserted,
+            "updated": run.updated,
+            "merged": run.merged,
+            "skipped": run.skipped,
+            "stage_seconds": json.loads(run.stage_seconds or "{}")
+        }
+    
+    def bump_cache_generation(self):
+        """Mark jobs as changed, so every API process drops its cached responses (see ResponseCache)"""
+        db = get_db_session()
+        try:
+            updated = db.query(CacheGeneration).filter(CacheGeneration.name == "jobs").update(
+                {CacheGeneration.generation: CacheGeneration.generation + 1}, synchronize_session=False
+            )
+            if not updated:
+                db.add(CacheGeneration(name="jobs", generation=1))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error bumping cache generation: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    
+    def get_cache_generation(self) -> Optional[int]:
+        """The shared jobs generation bumped by bump_cache_generation, or None if it cannot be read"""
+        db = get_db_session()
+        try:
+            generation = db.query(CacheGeneration.generation).filter(CacheGeneration.name == "jobs").scalar()
+            return generation or 0
+        except Exception as e:
+            logger.error(f"Error reading cache generation: {e}")
+            return None
+        finally:
+            db.close()
@@ -1,67 +1,36 @@
-from fastapi import FastAPI, BackgroundTasks, Request
+from fastapi import FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from contextlib import asynccontextmanager
 import logging
 from typing import List, Optional
-from datetime import datetime, timedelta
-import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import time
 
 from .database import create_tables, get_db
-from .models import JobResponse, JobCreate
-from .scrapers import JobScraper
+from .models import JobResponse, JobCreate, ScrapeRequest
 from .job_service import JobService
+from .task_queue import ScrapeTaskQueue
+from .cache import ResponseCache
+from .metrics import metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global scheduler instance
-scheduler = BackgroundScheduler()
-
-async def scheduled_job_scraping():
-    """Scheduled job scraping function"""
-    logger.info("Starting scheduled job scraping...")
-    scraper = JobScraper()
-    job_service = JobService()
-    
-    try:
-        # Scrape from multiple sources
-        jobs = await scraper.scrape_all_sources()
-        
-        # Save jobs to database
-        for job_data in jobs:
-            await job_service.create_job(job_data)
-            
-        logger.info(f"Successfully scraped and saved {len(jobs)} jobs")
-    except Exception as e:
-        logger.error(f"Error during scheduled scraping: {e}")
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup; scraping runs in separate scrape worker processes (worker.py)
     logger.info("Starting up AI Job Aggregator...")
     create_tables()
     
-    # Schedule daily job scraping at 9 AM
-    scheduler.add_job(
-        scheduled_job_scraping,
-        CronTrigger(hour=9, minute=0),
-        id="daily_job_scraping",
-        replace_existing=True
-    )
-    scheduler.start()
-    
-    # Run initial scraping
-    asyncio.create_task(scheduled_job_scraping())
-    
     yield
     
     # Shutdown
-    scheduler.shutdown()
     logger.info("AI Job Aggregator shutting down...")
 
 app = FastAPI(
@@ -77,7 +46,34 @@ templates = Jinja2Templates(directory="app/templates")
 
 # Initialize services
 job_service = JobService()
-scraper = JobScraper()
+task_queue = ScrapeTaskQueue()
+
+# Workers heartbeating within this many seconds are reported as running
+WORKER_MAX_AGE_SECONDS = 3 * float(os.getenv("SCRAPE_WORKER_HEARTBEAT_SECONDS", "10"))
+
+# Serialized /api/jobs and /api/jobs/stats responses, invalidated whenever jobs change,
+# here or in a scrape worker (the shared generation is checked every RESPONSE_CACHE_SYNC_SECONDS)
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60")),
+    generation_source=job_service.get_cache_generation,
+    sync_interval=float(os.getenv("RESPONSE_CACHE_SYNC_SECONDS", "1"))
+)
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe every request's latency, labelled by route template rather than raw path"""
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.observe(
+        "http_request_duration_seconds", time.perf_counter() - started,
+        method=request.method, route=getattr(route, "path", "unmatched"), status=response.status_code
+    )
+    return response
+
+def json_body(content) -> bytes:
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -86,38 +82,86 @@ async def home(request: Request):
 
 @app.get("/api/jobs", response_model=List[JobResponse])
 async def get_jobs(
+    request: Request,
     limit: int = 50,
     offset: int = 0,
     location: Optional[str] = None,
     job_type: Optional[str] = None,
-    days_ago: Optional[int] = 30
+    days_ago: Optional[int] = 30,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None
 ):
-    """Get paginated list of AI jobs"""
+    """Get paginated list of AI jobs.
+    
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next one;
+    offset pagination is still supported when no cursor is given. `q` searches
+    title, company, description and requirements; search results use offset.
+    Responses are cached and carry an ETag; If-None-Match gets a 304.
+    """
+    if cursor:
+        try:
+            job_service.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    cache_key = response_cache.make_key(request.url.path, request.query_params)
+    entry = response_cache.get(cache_key)
+    if entry is not None:
+        return response_cache.respond(entry, request.headers.get("if-none-match"))
+    
     try:
         jobs = await job_service.get_jobs(
             limit=limit,
             offset=offset,
             location=location,
             job_type=job_type,
-            days_ago=days_ago
+            days_ago=days_ago,
+            cursor=cursor,
+            q=q,
+            raise_errors=True
         )
-        return jobs
+        headers = {}
+        if jobs and len(jobs) == limit and not q:
+            headers["X-Next-Cursor"] = job_service.encode_cursor(jobs[-1])
+        entry = response_cache.put(cache_key, json_body(jobs), headers)
+        return response_cache.respond(entry, request.headers.get("if-none-match"))
     except Exception as e:
+        # Not cached, so the next request retries the database
         logger.error(f"Error fetching jobs: {e}")
         return []
 
-@app.post("/api/jobs/scrape")
-async def manual_scrape(background_tasks: BackgroundTasks):
-    """Manually trigger job scraping"""
-    background_tasks.add_task(scheduled_job_scraping)
-    return {"message": "Job scraping started in background"}
+@app.post("/api/jobs/scrape", status_code=202)
+async def manual_scrape(scrape_request: Optional[ScrapeRequest] = None):
+    """Queue a scraping run for the scrape workers; force_refresh refetches pages unchanged since the last run.
+    
+    Returns the task id to poll at /api/jobs/scrape/{task_id}. A request identical to
+    a run that is still queued returns that run instead of queueing another.
+    """
+    scrape_request = scrape_request or ScrapeRequest()
+    task = task_queue.enqueue(scrape_request.sources, scrape_request.force_refresh)
+    return {"message": "Job scraping queued", "task_id": task["id"], "status": task["status"]}
+
+@app.get("/api/jobs/scrape/{task_id}")
+async def get_scrape_task(task_id: int):
+    """Status of a queued scraping run, with its run summary once finished"""
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Scrape task not found")
+    task["run"] = job_service.get_scrape_run(task["scrape_run_id"]) if task["scrape_run_id"] else None
+    return task
 
 @app.get("/api/jobs/stats")
-async def get_job_stats():
+async def get_job_stats(request: Request):
     """Get job statistics"""
+    cache_key = response_cache.make_key(request.url.path, request.query_params)
+    entry = response_cache.get(cache_key)
+    if entry is not None:
+        return response_cache.respond(entry, request.headers.get("if-none-match"))
+    
     try:
-        stats = await job_service.get_job_stats()
-        return stats
+        stats = await job_service.get_job_stats(raise_errors=True)
+        entry = response_cache.put(cache_key, json_body(stats))
+        return response_cache.respond(entry, request.headers.get("if-none-match"))
     except Exception as e:
         logger.error(f"Error fetching job stats: {e}")
         return {"error": "Failed to fetch statistics"}
@@ -128,6 +172,8 @@ async def delete_job(job_id: int):
     try:
         success = await job_service.delete_job(job_id)
         if success:
+            response_cache.invalidate()
+            job_service.bump_cache_generation()
             return {"message": "Job deleted successfully"}
         else:
             return {"error": "Job not found"}
@@ -141,9 +187,68 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "scheduler_running": scheduler.running
+        "response_cache": response_cache.get_stats(),
+        "scrape_queue": task_queue.get_counts(),
+        "scrape_workers": [
+            {name: value for name, value in worker.items() if name != "metrics"}
+            for worker in task_queue.get_workers(WORKER_MAX_AGE_SECONDS)
+        ],
+        "last_scrape_run": job_service.get_last_scrape_run()
     }
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage timings, route latencies and cache counters in the Prometheus text format.
+    
+    Scraping series come from the state the scrape workers publish, labelled by worker.
+    """
+    cache_stats = response_cache.get_stats()
+    workers = task_queue.get_workers(WORKER_MAX_AGE_SECONDS)
+    counters = {
+        "response_cache_requests_total": {
+            (("result", result),): cache_stats[result] for result in ("hits", "misses", "not_modified")
+        },
+        "response_cache_evictions_total": {(): cache_stats["evictions"]},
+        "scraper_requests_total": {},
+        "scraper_new_connections_total": {},
+        "http_cache_pages_total": {},
+    }
+    gauges = {
+        "response_cache_entries": {(): cache_stats["entries"]},
+        "scrape_queue_tasks": {(("status", status),): count for status, count in task_queue.get_counts().items()},
+        "scrape_workers": {(): len(workers)},
+        "scraper_circuit_open": {},
+    }
+    for worker in workers:
+        label = ("worker", worker["worker_id"])
+        connection_stats = worker.get("http_connections") or {}
+        counters["scraper_requests_total"][(label,)] = connection_stats.get("requests", 0)
+        counters["scraper_new_connections_total"][(label,)] = connection_stats.get("new_connections", 0)
+        for result, count in (worker.get("http_cache") or {}).items():
+            if result != "bytes_saved":
+                counters["http_cache_pages_total"][(("result", result), label)] = count
+        for source, state in (worker.get("circuit_breakers") or {}).items():
+            gauges["scraper_circuit_open"][(("source", source), label)] = int(state["state"] != "closed")
+    
+    last_run = job_service.get_last_scrape_run()
+    if last_run:
+        gauges["scrape_last_run_timestamp_seconds"] = {
+            (): datetime.fromisoformat(last_run["started_at"]).replace(tzinfo=timezone.utc).timestamp()
+        }
+        gauges["scrape_last_run_duration_seconds"] = {(): last_run["duration_seconds"]}
+        gauges["scrape_last_run_jobs"] = {
+            (("outcome", outcome),): last_run[outcome] for outcome in ("scraped", "inserted", "updated", "merged", "skipped")
+        }
+        gauges["scrape_last_run_failed"] = {(): int(last_run["status"] == "failed")}
+    
+    return PlainTextResponse(
+        metrics.render(
+            counters=counters, gauges=gauges,
+            imported=[((("worker", worker["worker_id"]),), worker["metrics"]) for worker in workers]
+        ),
+        media_type="text/plain; version=0.0.4"
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,188 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from a fast SQLite read up to a slow Chrome session
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Seconds per stage within the current scraping run, for its ScrapeRun summary
+_run_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("run_stages", default=None)
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value without losing precision (timestamps need all their digits)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus expects"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """In-process histograms and counters, rendered in the Prometheus text format.
+
+    Series are keyed by metric name and label values. Sync route handlers and
+    browser threads may observe too, so updates are taken under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels):
+        """Add an observation (seconds) to the histogram series name{labels}"""
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase the counter series name{labels}"""
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def export(self) -> Dict:
+        """JSON-serializable copy of every series, for another process to render (see render's imported)"""
+        with self._lock:
+            return {
+                "histograms": {
+                    name: [[list(key), histogram.counts, histogram.sum, histogram.count] for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+                "counters": {name: [[list(key), value] for key, value in series.items()] for name, series in self._counters.items()}
+            }
+
+    def _header(self, name: str, kind: str) -> List[str]:
+        help_line = [f"# HELP {name} {self._help[name]}"] if name in self._help else []
+        return help_line + [f"# TYPE {name} {kind}"]
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(
+        self,
+        counters: Optional[Dict[str, Dict[Tuple, float]]] = None,
+        gauges: Optional[Dict[str, Dict[Tuple, float]]] = None,
+        imported: Optional[List[Tuple[Tuple, Dict]]] = None
+    ) -> str:
+        """Prometheus text exposition of every series, plus counters and gauges kept elsewhere
+        (e.g. cache stats), given as {name: {label pairs: value}}, and the series of other
+        processes, given as (extra label pairs, export()) such as (("worker", id),)"""
+        lines: List[str] = []
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counter_series = {name: dict(series) for name, series in self._counters.items()}
+            for extra_labels, exported in imported or []:
+                for name, series in exported.get("histograms", {}).items():
+                    for key, counts, total, count in series:
+                        histogram = Histogram()
+                        histogram.counts, histogram.sum, histogram.count = counts, total, count
+                        labels = tuple(sorted(tuple(pair) for pair in key) + list(extra_labels))
+                        histograms.setdefault(name, {})[labels] = histogram
+                for name, series in exported.get("counters", {}).items():
+                    for key, value in series:
+                        labels = tuple(sorted(tuple(pair) for pair in key) + list(extra_labels))
+                        counter_series.setdefault(name, {})[labels] = value
+            for name, series in sorted(histograms.items()):
+                lines.extend(self._header(name, "histogram"))
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._labels(key + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._labels(key + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{self._labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{self._labels(key)} {histogram.count}")
+            for name, series in sorted(counter_series.items()):
+                lines.extend(self._header(name, "counter"))
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{self._labels(key)} {_number(value)}")
+        for kind, extra in (("counter", counters), ("gauge", gauges)):
+            for name, series in sorted((extra or {}).items()):
+                lines.extend(self._header(name, kind))
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{self._labels(key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+for name, help_text in [
+    ("scrape_stage_seconds", "Time spent per scraping and ingestion stage"),
+    ("scraper_responses_total", "Responses to scraper requests by source and status"),
+    ("http_request_duration_seconds", "API request latency by route"),
+    ("response_cache_requests_total", "Response cache lookups by result"),
+    ("response_cache_evictions_total", "Responses evicted from the full response cache"),
+    ("response_cache_entries", "Responses currently cached"),
+    ("scraper_requests_total", "Requests sent by the scraper's HTTP client"),
+    ("scraper_new_connections_total", "Connections opened by the scraper's HTTP client"),
+    ("http_cache_pages_total", "Scraped pages by revalidation result"),
+    ("scraper_circuit_open", "1 while a source's circuit breaker is open or half-open"),
+    ("scrape_queue_tasks", "Scraping tasks in the queue by status"),
+    ("scrape_workers", "Scrape workers that heartbeated recently"),
+    ("scrape_last_run_timestamp_seconds", "Start of the last scraping run"),
+    ("scrape_last_run_duration_seconds", "Duration of the last scraping run"),
+    ("scrape_last_run_jobs", "Jobs of the last scraping run by outcome"),
+    ("scrape_last_run_failed", "1 if the last scraping run failed"),
+]:
+    metrics.describe(name, help_text)
+
+
+@contextmanager
+def span(stage: str, **labels) -> Iterator[None]:
+    """Time a stage (fetch, parse, chrome, enrich, score, dedup, write) into scrape_stage_seconds.
+
+    Spans inside track_run() are also added to that run's per-stage totals. Concurrent
+    spans overlap, so a run's stage totals can add up to more than its duration.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe("scrape_stage_seconds", elapsed, stage=stage, **labels)
+        stages = _run_stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+
+
+@contextmanager
+def track_run() -> Iterator[Dict[str, float]]:
+    """Collect the stage totals of one scraping run, in the dict it yields"""
+    stages: Dict[str, float] = {}
+    token = _run_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _run_stages.reset(token)
@@ -33,6 +33,7 @@ class JobResponse(JobBase):
     id: int
     scraped_date: datetime
     is_active: bool
+    source_urls: List[str] = []  # url plus the URLs of near-duplicates merged into this job
     
     @validator('ai_keywords')
     def parse_ai_keywords(cls, v):
@@ -43,6 +44,15 @@ class JobResponse(JobBase):
                 return []
         return v or []
     
+    @validator('source_urls', pre=True, always=True)
+    def parse_source_urls(cls, v, values):
+        if isinstance(v, str):
+            try:
+                return json.loads(v)
+            except json.JSONDecodeError:
+                v = None
+        return v or ([values['url']] if values.get('url') else [])
+    
     class Config:
         from_attributes = True
 
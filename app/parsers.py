@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import lxml.html
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Pages are handed over as str and re-encoded, so the declared charset never matters
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one class of a space-separated class attribute"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Selectors are compiled once per process rather than per page
+JOBNET_LISTINGS = etree.XPath(f"//div[{_has_class('job-listing-item')}]")
+JOBNET_TITLE = etree.XPath(f".//h2[{_has_class('job-title')}]")
+JOBNET_COMPANY = etree.XPath(f".//span[{_has_class('company-name')}]")
+JOBNET_DATE = etree.XPath(f".//span[{_has_class('posted-date')}]")
+JOBNET_DESCRIPTION = etree.XPath(f"//div[{_has_class('job-description')}]")
+JOBINDEX_LISTINGS = etree.XPath(f"//div[{_has_class('jobsearch-result')}]")
+JOBINDEX_TITLE = etree.XPath(f".//h4[{_has_class('jobsearch-title')}]")
+JOBINDEX_COMPANY = etree.XPath(f".//a[{_has_class('company-name')}]")
+LOCATION = etree.XPath(f".//span[{_has_class('location')}]")
+LINK = etree.XPath(".//a[@href][1]/@href")
+
+# Job cards of the standalone danish_job_scrapers.py
+JOBINDEX_CARDS = etree.XPath(f"//div[{_has_class('jobsearch-SerpJobCard')}]")
+THEHUB_CARDS = etree.XPath(f"//div[{_has_class('job-card')}]")
+ARTICLES = etree.XPath("//article")
+JOB_DIVS = etree.XPath(f"//div[{_has_class('job')}]")
+CARD_H2 = etree.XPath(".//h2")
+CARD_H3 = etree.XPath(".//h3")
+CARD_LINK = etree.XPath(".//a")
+CARD_COMPANY_SPAN = etree.XPath(f".//span[{_has_class('company')}]")
+CARD_COMPANY_DIV = etree.XPath(f".//div[{_has_class('company')}]")
+
+
+def _document(html: str):
+    """Parse a page, or return None for an empty one"""
+    if not html or not html.strip():
+        return None
+    return lxml.html.document_fromstring(html.encode('utf-8'), parser=_HTML_PARSER)
+
+
+def _text(elements) -> Optional[str]:
+    """Stripped text of the first matched element, if any"""
+    return elements[0].text_content().strip() if elements else None
+
+
+def _first(element, *selectors):
+    """First match of the first selector that matches anything under element"""
+    for selector in selectors:
+        found = selector(element)
+        if found:
+            return found
+    return []
+
+
+def _absolute_url(link: Optional[str], site: str) -> Optional[str]:
+    if link and not link.startswith('http'):
+        return f"{site}{link}"
+    return link
+
+
+def parse_posted_date(date_text: str) -> Optional[datetime]:
+    """Parse posted date from various formats"""
+    try:
+        date_text = date_text.lower().strip()
+
+        if 'i dag' in date_text or 'today' in date_text:
+            return datetime.now()
+        elif 'i går' in date_text or 'yesterday' in date_text:
+            return datetime.now() - timedelta(days=1)
+        elif 'dage siden' in date_text:
+            days = int(re.search(r'(\d+)', date_text).group(1))
+            return datetime.now() - timedelta(days=days)
+        elif 'hours ago' in date_text:
+            hours = int(re.search(r'(\d+)', date_text).group(1))
+            return datetime.now() - timedelta(hours=hours)
+        elif 'timer siden' in date_text:
+            hours = int(re.search(r'(\d+)', date_text).group(1))
+            return datetime.now() - timedelta(hours=hours)
+
+        return None
+
+    except Exception as e:
+        logger.error(f"Error parsing date: {date_text} - {e}")
+        return None
+
+
+def parse_jobnet_listings(html: str, site: str = "https://job.jobnet.dk") -> List[Dict]:
+    """Parse a JobNet search results page into job dicts, without descriptions"""
+    jobs = []
+    document = _document(html)
+    if document is None:
+        return jobs
+
+    for listing in JOBNET_LISTINGS(document):
+        try:
+            title_elems = JOBNET_TITLE(listing)
+            company = _text(JOBNET_COMPANY(listing))
+            if not title_elems or company is None:
+                continue
+
+            job_url = LINK(title_elems[0])[0]
+            if not job_url.startswith('http'):
+                job_url = f"{site}{job_url}"
+
+            date_text = _text(JOBNET_DATE(listing))
+
+            jobs.append({
+                'title': _text(title_elems),
+                'company': company,
+                'location': _text(LOCATION(listing)) or '',
+                'description': '',  # Filled in by enrich_jobnet_details
+                'requirements': '',
+                'salary_min': None,
+                'salary_max': None,
+                'job_type': None,
+                'remote_ok': False,
+                'url': job_url,
+                'source': 'jobnet',
+                'posted_date': parse_posted_date(date_text) if date_text else None
+            })
+
+        except Exception as e:
+            logger.error(f"Error processing JobNet listing: {e}")
+            continue
+
+    return jobs
+
+
+def parse_jobnet_description(html: str) -> str:
+    """Extract the description from a JobNet detail page"""
+    document = _document(html)
+    if document is None:
+        return ""
+    return _text(JOBNET_DESCRIPTION(document)) or ""
+
+
+def parse_jobindex_listings(html: str, site: str = "https://www.jobindex.dk") -> List[Dict]:
+    """Parse a JobIndex search results page into job dicts"""
+    jobs = []
+    document = _document(html)
+    if document is None:
+        return jobs
+
+    for listing in JOBINDEX_LISTINGS(document):
+        try:
+            title_elems = JOBINDEX_TITLE(listing)
+            company = _text(JOBINDEX_COMPANY(listing))
+            if not title_elems or company is None:
+                continue
+
+            job_url = LINK(title_elems[0])[0]
+            if not job_url.startswith('http'):
+                job_url = f"{site}{job_url}"
+
+            jobs.append({
+                'title': _text(title_elems),
+                'company': company,
+                'location': _text(LOCATION(listing)) or '',
+                'description': '',
+                'requirements': '',
+                'salary_min': None,
+                'salary_max': None,
+                'job_type': 'full-time',
+                'remote_ok': False,
+                'url': job_url,
+                'source': 'jobindex',
+                'posted_date': None
+            })
+
+        except Exception as e:
+            logger.error(f"Error processing JobIndex listing: {e}")
+            continue
+
+    return jobs
+
+
+def _card_job(title_elem, company: str, url: str, source: str) -> Dict:
+    """JobCreate fields of a danish_job_scrapers.py job card; relevance is scored by bulk_upsert"""
+    return {
+        'title': title_elem.text_content().strip(),
+        'company': company,
+        'location': 'Denmark',
+        'description': '',
+        'url': url,
+        'source': source,
+        'job_type': 'full-time'
+    }
+
+
+def parse_jobindex_cards(html: str, site: str, page_url: str, limit: int = 5) -> List[Dict]:
+    """Parse the first limit job cards of a JobIndex search page, as danish_job_scrapers.py reads it"""
+    jobs = []
+    document = _document(html)
+    if document is None:
+        return jobs
+
+    cards = JOBINDEX_CARDS(document) or ARTICLES(document) or JOB_DIVS(document)
+    for card in cards[:limit]:
+        try:
+            title_elems = _first(card, CARD_H2, CARD_H3, CARD_LINK)
+            if not title_elems:
+                continue
+
+            link = title_elems[0].get('href') if title_elems[0].tag == 'a' else None
+            if not link:
+                links = CARD_LINK(card)
+                link = links[0].get('href') if links else page_url
+
+            company = _text(_first(card, CARD_COMPANY_SPAN, CARD_COMPANY_DIV))
+            jobs.append(_card_job(
+                title_elems[0], 'Unknown Company' if company is None else company,
+                _absolute_url(link, site) or page_url, 'jobindex'
+            ))
+
+        except Exception as e:
+            logger.error(f"Error processing JobIndex job card: {e}")
+            continue
+
+    return jobs
+
+
+def parse_thehub_cards(html: str, site: str, limit: int = 10) -> List[Dict]:
+    """Parse the first limit job cards of the TheHub jobs page"""
+    jobs = []
+    document = _document(html)
+    if document is None:
+        return jobs
+
+    for card in (THEHUB_CARDS(document) or ARTICLES(document))[:limit]:
+        try:
+            title_elems = _first(card, CARD_H2, CARD_H3, CARD_LINK)
+            if not title_elems:
+                continue
+            link_elems = title_elems if title_elems[0].tag == 'a' else CARD_LINK(card)
+
+            # Jobs are keyed by URL, so a card without its own link cannot be stored
+            if not link_elems or not link_elems[0].get('href'):
+                continue
+
+            company = _text(_first(card, CARD_COMPANY_SPAN, CARD_COMPANY_DIV))
+            jobs.append(_card_job(
+                title_elems[0], 'TheHub Company' if company is None else company,
+                _absolute_url(link_elems[0].get('href'), site), 'thehub'
+            ))
+
+        except Exception as e:
+            logger.error(f"Error processing TheHub job card: {e}")
+            continue
+
+    return jobs
+
+
+class ParsePool:
+    """Runs page parsers in worker processes, off the event loop and outside its GIL.
+
+    Its size is independent of the scraper's per-host request limits, so network and
+    parse concurrency are tuned separately. With workers=0 pages are parsed inline.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else int(
+            os.getenv("SCRAPER_PARSE_WORKERS") or os.cpu_count() or 1
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def parse(self, parser: Callable, html: str, *args):
+        """Run parser(html, *args) in a worker process; parser must be a module-level function"""
+        if self.workers <= 0:
+            return parser(html, *args)
+        if self._executor is None:
+            # spawn, not fork: the parent runs an event loop and browser threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started {self.workers} HTML parse workers")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, parser, html, *args)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from .models import JobCreate
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the producers' output on the queue
+_DONE = object()
+
+
+class IngestionPipeline:
+    """Streams scraped jobs into the database while the scrape is still running.
+
+    Every (source, search term) pair is a producer, putting jobs on a bounded queue
+    as each result page is parsed. A single consumer deduplicates them by URL and
+    writes them with JobService.bulk_upsert in batches, flushed when a batch is full
+    or flush_interval seconds after its first job. A full queue makes the producers
+    wait, so a slow database throttles scraping instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        job_service,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self.scraper = scraper
+        self.job_service = job_service
+        self.queue_size = queue_size or int(os.getenv("PIPELINE_QUEUE_SIZE", "200"))
+        self.batch_size = batch_size or int(os.getenv("PIPELINE_BATCH_SIZE", "50"))
+        self.flush_interval = flush_interval or float(os.getenv("PIPELINE_FLUSH_SECONDS", "2.0"))
+
+    async def run(
+        self,
+        sources: Optional[List[str]] = None,
+        force_refresh: bool = False,
+        on_batch: Optional[Callable[[Dict[str, int]], None]] = None
+    ) -> Dict[str, int]:
+        """Scrape sources into the database; on_batch is called with each written batch's counts.
+
+        Returns the totals of scraped, inserted, updated, merged and skipped jobs. High-water
+        marks are only saved if every producer and the consumer finished; a failed database
+        write raises, failing the run.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        totals = {"scraped": 0, "inserted": 0, "updated": 0, "merged": 0, "skipped": 0}
+
+        async with self.scraper.scrape_run(sources, force_refresh) as summaries:
+            producers = [
+                asyncio.create_task(self._produce(queue, self.scraper.iter_source_term(source, search_term, summaries)))
+                for source, search_term in self.scraper.search_pairs(sources)
+            ]
+            producing = asyncio.gather(*producers)
+            consumer = asyncio.create_task(self._consume(queue, totals, on_batch))
+
+            try:
+                # If the consumer fails, stop scraping rather than fill the queue forever
+                done, _ = await asyncio.wait([consumer, producing], return_when=asyncio.FIRST_COMPLETED)
+                if consumer in done:
+                    consumer.result()
+                # The consumer may still fail with the queue full, and then nothing takes _DONE
+                done_put = asyncio.create_task(queue.put(_DONE))
+                try:
+                    await asyncio.wait([done_put, consumer], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    done_put.cancel()
+                await consumer
+            finally:
+                for task in producers + [consumer]:
+                    task.cancel()
+                await asyncio.gather(producing, consumer, return_exceptions=True)
+
+        logger.info(
+            f"Ingested {totals['scraped']} scraped jobs: {totals['inserted']} new, "
+            f"{totals['updated']} updated, {totals['merged']} merged, {totals['skipped']} skipped"
+        )
+        return totals
+
+    @staticmethod
+    async def _produce(queue: asyncio.Queue, jobs):
+        """Put one (source, search term) pair's jobs on the queue"""
+        async for job in jobs:
+            await queue.put(job)
+
+    async def _consume(self, queue: asyncio.Queue, totals: Dict[str, int], on_batch):
+        """Write jobs from the queue in batches until the producers are done"""
+        seen_urls = set()
+        batch: List[JobCreate] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                job = None
+
+            if job is not None and job is not _DONE:
+                totals["scraped"] += 1
+                if job['url'] in seen_urls:
+                    totals["skipped"] += 1
+                else:
+                    seen_urls.add(job['url'])
+                    try:
+                        batch.append(JobCreate(**job))
+                    except Exception as e:
+                        logger.error(f"Dropping invalid job {job.get('url')}: {e}")
+                        totals["skipped"] += 1
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+            if batch and (job is None or job is _DONE or len(batch) >= self.batch_size):
+                # A failed write fails the consumer, so the run saves no high-water marks
+                counts = await self.job_service.bulk_upsert(batch, raise_errors=True)
+                for name, count in counts.items():
+                    totals[name] += count
+                if on_batch:
+                    on_batch(counts)
+                batch, deadline = [], None
+            elif job is None:
+                deadline = None
+
+            if job is _DONE:
+                return
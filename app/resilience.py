@@ -0,0 +1,118 @@
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Stops calling a source after failure_threshold consecutive failures.
+
+    Once open, calls are rejected without touching the network until reset_timeout
+    has passed. The breaker is then half-open: a single probe call is let through,
+    and its outcome closes the circuit again or reopens it for another reset_timeout.
+    Callers release the probe in a finally block, so a probe that is cancelled or
+    ends without an outcome hands the probe to the next caller.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._probing = False
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.opened_at_wall: Optional[datetime] = None
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            self._state, self._probing = self.HALF_OPEN, False
+        return self._state
+
+    def available(self) -> bool:
+        """Whether a call could be let through now, without taking the half-open probe"""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def allow(self) -> bool:
+        """Whether to make a call now; in the half-open state only the first caller is the probe"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self._state, self._probing = self.CLOSED, False
+        self.failures = 0
+
+    def release_probe(self):
+        """Give up the half-open probe if it recorded no outcome, e.g. because it was cancelled"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.trips += 1
+            self._state, self._probing = self.OPEN, False
+            self.opened_at, self.opened_at_wall = self._clock(), datetime.utcnow()
+
+    def snapshot(self) -> Dict:
+        """State for /api/health"""
+        state = self.state
+        retry_in = None
+        if state == self.OPEN:
+            retry_in = round(max(self.reset_timeout - (self._clock() - self.opened_at), 0.0), 1)
+        return {
+            "state": state,
+            "consecutive_failures": self.failures,
+            "opened_at": self.opened_at_wall.isoformat() if self.opened_at_wall and state != self.CLOSED else None,
+            "retry_in_seconds": retry_in,
+            "trips": self.trips,
+            "rejected_calls": self.rejected
+        }
+
+
+class RetryBudget:
+    """Retries left in one scraping run, shared by its requests so failures cannot multiply the load"""
+
+    def __init__(self, retries: int):
+        self.remaining = retries
+        self.spent = 0
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, if any is left"""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.spent += 1
+        return True
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before retry number attempt + 1: exponential backoff with full jitter,
+    but never less than the server's Retry-After (still capped)"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return min(delay, cap)
@@ -0,0 +1,41 @@
+import re
+from typing import Any, Dict, List
+
+def _trie_regex(words: List[str]) -> str:
+    """Build a regex alternation of words factored into a prefix trie, longest match first"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+def compile_keyword_pattern(keywords: List[str], overlapping: bool = False) -> re.Pattern:
+    """Compile keywords into one word-bounded pattern, so "ai" no longer matches inside "email".
+    
+    With overlapping=True every start position is tried (group 1 holds the match),
+    so keywords sharing words such as "stable diffusion" and "diffusion model" are all found.
+    """
+    alternation = _trie_regex([keyword.lower() for keyword in keywords])
+    if overlapping:
+        return re.compile(rf"\b(?=({alternation})\b)")
+    return re.compile(rf"\b(?:{alternation})\b")
+
+def keyword_implications(keywords: List[str]) -> Dict[str, set]:
+    """Map each keyword to the keywords it contains as whole words, itself included.
+    
+    A match on "ai consultant" also means "ai" is present as a whole word.
+    """
+    return {
+        keyword: {other for other in keywords if re.search(rf"\b{re.escape(other)}\b", keyword)}
+        for keyword in keywords
+    }
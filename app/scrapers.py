@@ -1,29 +1,76 @@
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
 from fake_useragent import UserAgent
 import time
 import random
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from datetime import datetime
 import re
 import json
 import asyncio
 import httpx
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
+from .database import get_db_session, Job, JobAlias, ScrapeState
+from .driver_pool import WebDriverPool
+from .http_cache import HTTPCache
+from .metrics import metrics, span
 from .models import JobCreate
+from . import parsers
+from .resilience import CircuitBreaker, CircuitOpenError, RetryBudget, backoff_delay
+from .throttling import HostLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# Set by scrape_all_sources(force_refresh=True): fetch every page in full, ignoring the HTTP cache
+_force_refresh: ContextVar[bool] = ContextVar('force_refresh', default=False)
+# High-water marks of the current scrape_all_sources run, keyed by (source, search term)
+_high_water_marks: ContextVar[Optional[Dict]] = ContextVar('high_water_marks', default=None)
+# Retries left in the current scraping run; outside a run only max_retries per request applies
+_retry_budget: ContextVar[Optional[RetryBudget]] = ContextVar('retry_budget', default=None)
+# HTTP cache writes of the current scraping run, committed with its high-water marks
+_http_cache_writes: ContextVar[Optional[Dict]] = ContextVar('http_cache_writes', default=None)
+
 class JobScraper:
-    def __init__(self):
+    # Responses worth retrying (and counted as source failures)
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Responses of a source that is blocking the scraper: not retried, but counted as source failures
+    BLOCKED_STATUSES = (403,)
+    
+    # Politeness limits per source: concurrent requests and requests/second to its host
+    DEFAULT_SOURCE_LIMITS = {
+        'linkedin': {'concurrency': 1, 'rate': 0.2, 'burst': 1},
+        'jobnet': {'concurrency': 4, 'rate': 2.0, 'burst': 4},
+        'jobindex': {'concurrency': 4, 'rate': 2.0, 'burst': 4},
+    }
+    
+    # Danish job sites; override with job_sites, e.g. to point at a local stand-in server
+    DEFAULT_JOB_SITES = {
+        'jobnet': 'https://job.jobnet.dk',
+        'jobindex': 'https://www.jobindex.dk',
+        'glassdoor': 'https://www.glassdoor.dk',
+        'indeed': 'https://dk.indeed.com',
+        'linkedin': 'https://www.linkedin.com/jobs'
+    }
+    
+    def __init__(
+        self,
+        source_limits: Optional[Dict[str, Dict]] = None,
+        http_limits: Optional[httpx.Limits] = None,
+        http_timeout: Optional[httpx.Timeout] = None,
+        skip_known_details: bool = True,
+        http_cache_path: Optional[str] = None,
+        parse_workers: Optional[int] = None,
+        job_sites: Optional[Dict[str, str]] = None
+    ):
         self.ua = UserAgent()
         self.session = requests.Session()
         self.session.headers.update({
@@ -39,6 +86,15 @@ class JobScraper:
         self.chrome_options.add_argument('--window-size=1920,1080')
         self.chrome_options.add_argument(f'--user-agent={self.ua.random}')
         
+        # Warm Chrome instances reused across search terms and runs
+        self.driver_pool = WebDriverPool(
+            self.chrome_options,
+            size=int(os.getenv("WEBDRIVER_POOL_SIZE", "2")),
+            max_pages=int(os.getenv("WEBDRIVER_MAX_PAGES", "50"))
+        )
+        # Blocking Selenium work runs on these threads, never on the event loop
+        self.browser_executor: Optional[ThreadPoolExecutor] = None
+        
         # AI-related search terms
         self.ai_search_terms = [
             "AI trainer", "AI consultant", "AI mentor", "AI project lead", "AI curator",
@@ -47,25 +103,210 @@ class JobScraper:
         ]
         
         # Danish job sites
-        self.job_sites = {
-            'jobnet': 'https://job.jobnet.dk',
-            'jobindex': 'https://www.jobindex.dk',
-            'glassdoor': 'https://www.glassdoor.dk',
-            'indeed': 'https://dk.indeed.com',
-            'linkedin': 'https://www.linkedin.com/jobs'
+        self.job_sites = {**self.DEFAULT_JOB_SITES, **(job_sites or {})}
+        
+        # Async generator of jobs per source, each run once per search term
+        self.scrapers = {
+            'linkedin': self.iter_linkedin_jobs,
+            'jobnet': self.iter_jobnet,
+            'jobindex': self.iter_jobindex
+        }
+        
+        # Politeness is enforced per host rather than by a global sleep
+        self.source_limits = {**self.DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+        self.limiters = {
+            source: HostLimiter(**limits) for source, limits in self.source_limits.items()
         }
+        
+        # A source failing repeatedly is skipped until its breaker lets a probe through
+        self.breakers = {
+            source: CircuitBreaker(
+                source,
+                failure_threshold=int(os.getenv("SCRAPER_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("SCRAPER_BREAKER_RESET_SECONDS", "300"))
+            )
+            for source in self.source_limits
+        }
+        # Retries per request, and per run across all sources, with jittered exponential backoff
+        self.max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+        self.retry_budget = int(os.getenv("SCRAPER_RETRY_BUDGET", "50"))
+        self.retry_base_delay = float(os.getenv("SCRAPER_RETRY_BASE_SECONDS", "0.5"))
+        
+        # Long-lived HTTP/2 client shared by every scraping coroutine, see open()/close()
+        self.client: Optional[httpx.AsyncClient] = None
+        self.http_limits = http_limits or httpx.Limits(
+            max_connections=int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("SCRAPER_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("SCRAPER_KEEPALIVE_EXPIRY", "60"))
+        )
+        self.http_timeout = http_timeout or httpx.Timeout(
+            float(os.getenv("SCRAPER_TIMEOUT", "30")),
+            connect=float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "10"))
+        )
+        self.connection_stats = {'requests': 0, 'new_connections': 0}
+        
+        # Pages and validators from earlier runs, for conditional requests; empty path disables
+        self.http_cache_path = http_cache_path if http_cache_path is not None else os.getenv(
+            "SCRAPER_HTTP_CACHE_PATH", "http_cache.db"
+        )
+        self.http_cache_max_age_days = float(os.getenv("SCRAPER_HTTP_CACHE_MAX_AGE_DAYS", "30"))
+        self.http_cache: Optional[HTTPCache] = None
+        
+        # Detail-page enrichment: fetch concurrency per batch, and whether to skip stored URLs
+        self.detail_concurrency = int(os.getenv("SCRAPER_DETAIL_CONCURRENCY", "8"))
+        self.skip_known_details = skip_known_details
+        
+        # Search result pages walked per (source, term); runs stop earlier at listings already seen
+        self.max_pages = int(os.getenv("SCRAPER_MAX_PAGES", "5"))
+        self.page_size = 20
+        
+        # HTML parsing runs in worker processes, sized independently of the request limits
+        self.parse_pool = parsers.ParsePool(parse_workers)
     
-    def get_driver(self):
-        """Get Chrome WebDriver instance"""
-        try:
-            driver = webdriver.Chrome(
-                ChromeDriverManager().install(),
-                options=self.chrome_options
+    async def open(self):
+        """Open the shared HTTP client and HTTP cache, and resolve the Chrome driver binary"""
+        await asyncio.get_running_loop().run_in_executor(None, self.driver_pool.warm)
+        if self.http_cache is None and self.http_cache_path:
+            self.http_cache = HTTPCache(self.http_cache_path, self.http_cache_max_age_days)
+            self.http_cache.prune()
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=True,
+                limits=self.http_limits,
+                timeout=self.http_timeout,
+                headers={'User-Agent': self.ua.random}
             )
-            return driver
-        except Exception as e:
-            logger.error(f"Failed to initialize Chrome driver: {e}")
-            return None
+    
+    async def close(self):
+        """Close the shared HTTP client and its pooled connections, quit pooled browsers and stop parse workers"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.http_cache is not None:
+            self.http_cache.close()
+            self.http_cache = None
+        if self.browser_executor is not None:
+            self.browser_executor.shutdown(wait=False, cancel_futures=True)
+            self.browser_executor = None
+        self.driver_pool.close()
+        self.parse_pool.close()
+    
+    async def _trace_connections(self, event_name: str, info: Dict):
+        """httpcore trace hook counting newly opened connections"""
+        if event_name == "connection.connect_tcp.complete":
+            self.connection_stats['new_connections'] += 1
+    
+    def get_connection_stats(self) -> Dict:
+        """Requests sent vs. connections opened by the shared client"""
+        requests_sent = self.connection_stats['requests']
+        reused = max(requests_sent - self.connection_stats['new_connections'], 0)
+        return {
+            **self.connection_stats,
+            'reused_connections': reused,
+            'reuse_ratio': round(reused / requests_sent, 3) if requests_sent else 0.0
+        }
+    
+    def get_breaker_states(self) -> Dict:
+        """Circuit breaker state per source, for /api/health"""
+        return {source: breaker.snapshot() for source, breaker in self.breakers.items()}
+    
+    async def _get(self, source: str, url: str, **kwargs) -> httpx.Response:
+        """GET a page on the shared client, waiting for the source's concurrency and rate limits.
+        
+        Pages in the HTTP cache are revalidated with a conditional request. If the page has
+        not changed since it was cached (a 304, or an identical body) the response carries
+        extensions['not_modified'] = True, with the cached body in place of a 304's empty one.
+        
+        Transport errors, RETRY_STATUSES and BLOCKED_STATUSES count against the source's circuit
+        breaker; all but BLOCKED_STATUSES are retried with jittered exponential backoff, within
+        the run's retry budget. Raises CircuitOpenError while the breaker is open.
+        """
+        if self.client is None:
+            await self.open()
+        
+        request = self.client.build_request('GET', url, extensions={'trace': self._trace_connections}, **kwargs)
+        cache_key = str(request.url)
+        force_refresh = _force_refresh.get()
+        page = self.http_cache.lookup(cache_key) if self.http_cache and not force_refresh else None
+        if page is not None:
+            request.headers.update(HTTPCache.conditional_headers(page))
+        
+        response = await self._send_with_retries(source, request)
+        
+        if self.http_cache is None:
+            return response
+        if response.status_code == 304 and page is not None:
+            self.http_cache.revalidated(cache_key, page, response, _http_cache_writes.get())
+            return httpx.Response(
+                200,
+                headers={'Content-Type': page.content_type or 'text/html'},
+                content=page.body,
+                request=request,
+                extensions={'not_modified': True}
+            )
+        if (
+            response.status_code == 200 and self.http_cache.store(cache_key, response, _http_cache_writes.get())
+            and not force_refresh
+        ):
+            response.extensions['not_modified'] = True
+        return response
+    
+    async def _send_with_retries(self, source: str, request: httpx.Request) -> httpx.Response:
+        """Send request through the source's limiter and circuit breaker, retrying failures.
+        
+        Returns the last response once retries run out; re-raises the last transport error.
+        """
+        breaker = self.breakers[source]
+        budget = _retry_budget.get()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"{source} circuit breaker is open")
+            
+            retry_after = None
+            try:
+                async with self.limiters[source].slot():
+                    self.connection_stats['requests'] += 1
+                    with span("fetch", source=source):
+                        response = await self.client.send(request)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                metrics.inc("scraper_responses_total", source=source, status="error")
+                if not self._may_retry(attempt, budget):
+                    raise
+                logger.warning(f"Retrying {source} request after {type(e).__name__}: {e}")
+            else:
+                metrics.inc("scraper_responses_total", source=source, status=response.status_code)
+                if response.status_code in self.BLOCKED_STATUSES:
+                    breaker.record_failure()
+                    return response
+                if response.status_code not in self.RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if not self._may_retry(attempt, budget):
+                    return response
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                logger.warning(f"Retrying {source} request after status {response.status_code}")
+            finally:
+                # A cancelled probe, or one raising an unexpected error, must not leave the breaker stuck half-open
+                breaker.release_probe()
+            
+            await asyncio.sleep(backoff_delay(attempt, self.retry_base_delay, retry_after=retry_after))
+            attempt += 1
+    
+    def _may_retry(self, attempt: int, budget: Optional[RetryBudget]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if budget is not None and not budget.try_spend():
+            logger.warning("Retry budget of this scraping run is spent, not retrying")
+            return False
+        return True
+    
+    async def _parse(self, source: str, parser, html: str, *args):
+        """Run a parser from app.parsers on the parse pool, timed as the source's parse stage"""
+        with span("parse", source=source):
+            return await self.parse_pool.parse(parser, html, *args)
     
     def extract_salary(self, text: str) -> tuple[Optional[float], Optional[float]]:
         """Extract salary range from text"""
@@ -111,17 +352,66 @@ class JobScraper:
         return 'full-time'  # Default
     
     async def scrape_linkedin_jobs(self, search_term: str, location: str = "Denmark") -> List[Dict]:
-        """Scrape LinkedIn jobs using Selenium"""
-        jobs = []
-        driver = self.get_driver()
+        """Scrape LinkedIn jobs using Selenium on a browser thread"""
+        if self.browser_executor is None:
+            self.browser_executor = ThreadPoolExecutor(
+                max_workers=self.driver_pool.size,
+                thread_name_prefix='selenium'
+            )
         
-        if not driver:
-            logger.error("Failed to get Chrome driver")
-            return jobs
+        # Context variables do not follow the call onto the browser thread, so pass them along
+        high_water = self._high_water_mark('linkedin', search_term)
+        stop_at_known = not _force_refresh.get()
+        
+        # A blocked LinkedIn fails in seconds per Chrome session; once the breaker opens it costs nothing
+        breaker = self.breakers['linkedin']
+        if not breaker.allow():
+            raise CircuitOpenError("linkedin circuit breaker is open")
+        try:
+            async with self.limiters['linkedin'].slot():
+                loop = asyncio.get_running_loop()
+                try:
+                    with span("chrome", source="linkedin"):
+                        jobs = await loop.run_in_executor(
+                            self.browser_executor, self._scrape_linkedin_session, search_term, location,
+                            high_water, stop_at_known
+                        )
+                except Exception:
+                    breaker.record_failure()
+                    return []
+                breaker.record_success()
+                return jobs
+        finally:
+            breaker.release_probe()
+    
+    async def iter_linkedin_jobs(self, search_term: str) -> AsyncIterator[Dict]:
+        """Yield LinkedIn jobs; a browser session returns its whole page at once"""
+        for job in await self.scrape_linkedin_jobs(search_term):
+            yield job
+    
+    def _scrape_linkedin_session(
+        self,
+        search_term: str,
+        location: str,
+        high_water: Optional[Dict] = None,
+        stop_at_known: bool = True
+    ) -> List[Dict]:
+        """Run one LinkedIn search on a pooled browser (blocking, runs on browser_executor).
+        
+        Cards already seen by an earlier run are skipped before their detail click. Raises
+        if no browser is available, the search fails, or LinkedIn answers with a login wall,
+        so the caller can count the failure.
+        """
+        jobs = []
+        try:
+            driver = self.driver_pool.acquire()
+        except Exception as e:
+            logger.error(f"Failed to get Chrome driver: {e}")
+            raise
         
         try:
             # Build LinkedIn search URL
-            base_url = "https://www.linkedin.com/jobs/search"
+            base_url = f"{self.job_sites['linkedin']}/search"
             params = {
                 'keywords': search_term,
                 'location': location,
@@ -138,6 +428,10 @@ class JobScraper:
             # Wait for page to load
             time.sleep(random.uniform(3, 6))
             
+            # Blocked sessions are redirected to a login or security check page
+            if any(wall in driver.current_url for wall in ('/authwall', '/checkpoint', '/login')):
+                raise RuntimeError(f"LinkedIn redirected to {driver.current_url}")
+            
             # Accept cookies if present
             try:
                 accept_cookies = driver.find_element(By.CSS_SELECTOR, 'button[data-consent-decision="accept"]')
@@ -148,9 +442,21 @@ class JobScraper:
                 pass
             
             # Get job cards
-            job_cards = driver.find_elements(By.CSS_SELECTOR, '.job-search-card')
+            job_cards = driver.find_elements(By.CSS_SELECTOR, '.job-search-card')[:self.page_size]
+            
+            known_urls = set()
+            if stop_at_known:
+                card_urls = []
+                for card in job_cards:
+                    try:
+                        card_urls.append(
+                            card.find_element(By.CSS_SELECTOR, '.base-search-card__title').get_attribute('href')
+                        )
+                    except Exception:
+                        continue
+                known_urls = self.get_known_urls(card_urls)
             
-            for card in job_cards[:20]:  # Limit to first 20 results
+            for card in job_cards:
                 try:
                     # Extract basic info
                     title_elem = card.find_element(By.CSS_SELECTOR, '.base-search-card__title')
@@ -172,6 +478,12 @@ class JobScraper:
                     except:
                         pass
                     
+                    # Skip listings an earlier run saw, without paying for the detail click
+                    if stop_at_known and self._reached_known(
+                        {'url': job_url, 'posted_date': posted_date}, high_water, known_urls
+                    ):
+                        continue
+                    
                     # Click to get more details
                     try:
                         title_elem.click()
@@ -224,229 +536,318 @@ class JobScraper:
             
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {e}")
+            raise
         
         finally:
-            driver.quit()
+            self.driver_pool.release(driver)
         
         logger.info(f"Found {len(jobs)} jobs on LinkedIn")
         return jobs
     
     async def scrape_jobnet(self, search_term: str) -> List[Dict]:
         """Scrape JobNet.dk"""
-        jobs = []
+        return [job async for job in self.iter_jobnet(search_term)]
+    
+    async def iter_jobnet(self, search_term: str) -> AsyncIterator[Dict]:
+        """Yield JobNet.dk jobs page by page, as soon as each page's details are fetched"""
+        found = 0
         
         try:
             # JobNet API endpoint
-            base_url = "https://job.jobnet.dk/CV/FindWork/Search"
-            params = {
-                'SearchString': search_term,
-                'Area': '100',  # Denmark
-                'Country': 'DK',
-                'SortBy': 'CreatedDate',
-                'SortOrder': 'Descending',
-                'PageSize': '20'
-            }
+            base_url = f"{self.job_sites['jobnet']}/CV/FindWork/Search"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(base_url, params=params)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Find job listings
-                    job_listings = soup.find_all('div', class_='job-listing-item')
-                    
-                    for listing in job_listings:
-                        try:
-                            # Extract job details
-                            title_elem = listing.find('h2', class_='job-title')
-                            company_elem = listing.find('span', class_='company-name')
-                            location_elem = listing.find('span', class_='location')
-                            
-                            if not all([title_elem, company_elem]):
-                                continue
-                            
-                            title = title_elem.text.strip()
-                            company = company_elem.text.strip()
-                            location = location_elem.text.strip() if location_elem else ''
-                            
-                            # Get job URL
-                            job_url = title_elem.find('a')['href']
-                            if not job_url.startswith('http'):
-                                job_url = f"https://job.jobnet.dk{job_url}"
-                            
-                            # Get description (requires separate request)
-                            description = ""
-                            try:
-                                desc_response = await client.get(job_url)
-                                if desc_response.status_code == 200:
-                                    desc_soup = BeautifulSoup(desc_response.text, 'html.parser')
-                                    desc_elem = desc_soup.find('div', class_='job-description')
-                                    if desc_elem:
-                                        description = desc_elem.text.strip()
-                            except:
-                                pass
-                            
-                            # Extract posted date
-                            posted_date = None
-                            try:
-                                date_elem = listing.find('span', class_='posted-date')
-                                if date_elem:
-                                    posted_date = self.parse_posted_date(date_elem.text.strip())
-                            except:
-                                pass
-                            
-                            job_data = {
-                                'title': title,
-                                'company': company,
-                                'location': location,
-                                'description': description,
-                                'requirements': '',
-                                'salary_min': None,
-                                'salary_max': None,
-                                'job_type': self.extract_job_type(description),
-                                'remote_ok': 'remote' in description.lower(),
-                                'url': job_url,
-                                'source': 'jobnet',
-                                'posted_date': posted_date
-                            }
-                            
-                            jobs.append(job_data)
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing JobNet listing: {e}")
-                            continue
-                
+            async def fetch_page(page: int) -> Optional[List[Dict]]:
+                params = {
+                    'SearchString': search_term,
+                    'Area': '100',  # Denmark
+                    'Country': 'DK',
+                    'SortBy': 'CreatedDate',
+                    'SortOrder': 'Descending',
+                    'PageSize': str(self.page_size),
+                    'Offset': str(page * self.page_size)
+                }
+                response = await self._get('jobnet', base_url, params=params)
+                if response.extensions.get('not_modified'):
+                    logger.info(f"JobNet results page {page + 1} for {search_term} unchanged since the last run")
+                    return None
+                if response.status_code != 200:
+                    return None
+                return await self._parse(
+                    'jobnet', parsers.parse_jobnet_listings, response.text, self.job_sites['jobnet']
+                )
+            
+            async for jobs in self._paginate('jobnet', search_term, fetch_page):
+                with span("enrich", source="jobnet"):
+                    await self.enrich_jobnet_details(jobs)
+                for job in jobs:
+                    found += 1
+                    yield job
+            
+        except CircuitOpenError as e:
+            logger.info(f"Stopped scraping JobNet: {e}")
         except Exception as e:
             logger.error(f"Error scraping JobNet: {e}")
         
-        logger.info(f"Found {len(jobs)} jobs on JobNet")
-        return jobs
+        logger.info(f"Found {found} jobs on JobNet")
+    
+    async def fetch_jobnet_description(self, job_url: str) -> str:
+        """Fetch a JobNet detail page and extract its description"""
+        try:
+            response = await self._get('jobnet', job_url)
+            if response.status_code == 200:
+                return await self._parse('jobnet', parsers.parse_jobnet_description, response.text)
+        except Exception as e:
+            logger.debug(f"Error fetching JobNet description {job_url}: {e}")
+        return ""
+    
+    async def enrich_jobnet_details(self, jobs: List[Dict]):
+        """Fetch detail pages as one bounded concurrent batch and merge the descriptions into the jobs"""
+        known_urls = self.get_known_urls([job['url'] for job in jobs]) if self.skip_known_details else set()
+        pending = [job for job in jobs if job['url'] not in known_urls]
+        
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        
+        async def fetch(job_url: str) -> str:
+            async with semaphore:
+                return await self.fetch_jobnet_description(job_url)
+        
+        descriptions = await asyncio.gather(*[fetch(job['url']) for job in pending])
+        for job, description in zip(pending, descriptions):
+            job['description'] = description
+        
+        for job in jobs:
+            job['job_type'] = self.extract_job_type(job['description'])
+            job['remote_ok'] = 'remote' in job['description'].lower()
+        
+        if known_urls:
+            logger.info(f"Skipped {len(known_urls)} JobNet detail pages already stored")
+    
+    def get_known_urls(self, urls: List[str]) -> set:
+        """Return the subset of urls already stored, as a job or merged into one"""
+        if not urls:
+            return set()
+        
+        db = get_db_session()
+        try:
+            known = {url for (url,) in db.query(Job.url).filter(Job.url.in_(urls)).all()}
+            known.update(url for (url,) in db.query(JobAlias.url).filter(JobAlias.url.in_(urls)).all())
+            return known
+        except Exception as e:
+            logger.error(f"Error looking up known job URLs: {e}")
+            return set()
+        finally:
+            db.close()
+    
+    def load_scrape_states(self, sources: List[str]) -> Dict:
+        """High-water marks of earlier runs, keyed by (source, search term)"""
+        db = get_db_session()
+        try:
+            return {
+                (state.source, state.search_term): {
+                    'newest_url': state.newest_url,
+                    'newest_posted_date': state.newest_posted_date
+                }
+                for state in db.query(ScrapeState).filter(ScrapeState.source.in_(sources))
+            }
+        except Exception as e:
+            logger.error(f"Error loading scrape state: {e}")
+            return {}
+        finally:
+            db.close()
+    
+    def save_scrape_states(self, summaries: Dict):
+        """Move each (source, search term) mark up to the newest listing this run found"""
+        db = get_db_session()
+        try:
+            now = datetime.utcnow()
+            for (source, search_term), summary in summaries.items():
+                state = db.get(ScrapeState, (source, search_term)) or ScrapeState(
+                    source=source, search_term=search_term
+                )
+                if summary['newest_url']:
+                    state.newest_url = summary['newest_url']
+                    state.newest_posted_date = summary['newest_posted_date'] or state.newest_posted_date
+                state.last_run_at = now
+                state.last_new_jobs = summary['new_jobs']
+                db.add(state)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving scrape state: {e}")
+            db.rollback()
+        finally:
+            db.close()
     
     async def scrape_jobindex(self, search_term: str) -> List[Dict]:
         """Scrape JobIndex.dk"""
-        jobs = []
+        return [job async for job in self.iter_jobindex(search_term)]
+    
+    async def iter_jobindex(self, search_term: str) -> AsyncIterator[Dict]:
+        """Yield JobIndex.dk jobs page by page"""
+        found = 0
         
         try:
-            base_url = "https://www.jobindex.dk/jobsoegning"
-            params = {
-                'q': search_term,
-                'supcat': '11',  # IT category
-                'area': '1',     # Capital region
-                'sortby': '1'    # Newest first
-            }
+            base_url = f"{self.job_sites['jobindex']}/jobsoegning"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(base_url, params=params)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Find job listings
-                    job_listings = soup.find_all('div', class_='jobsearch-result')
-                    
-                    for listing in job_listings:
-                        try:
-                            # Extract job details
-                            title_elem = listing.find('h4', class_='jobsearch-title')
-                            company_elem = listing.find('a', class_='company-name')
-                            location_elem = listing.find('span', class_='location')
-                            
-                            if not all([title_elem, company_elem]):
-                                continue
-                            
-                            title = title_elem.text.strip()
-                            company = company_elem.text.strip()
-                            location = location_elem.text.strip() if location_elem else ''
-                            
-                            # Get job URL
-                            job_url = title_elem.find('a')['href']
-                            if not job_url.startswith('http'):
-                                job_url = f"https://www.jobindex.dk{job_url}"
-                            
-                            job_data = {
-                                'title': title,
-                                'company': company,
-                                'location': location,
-                                'description': '',
-                                'requirements': '',
-                                'salary_min': None,
-                                'salary_max': None,
-                                'job_type': 'full-time',
-                                'remote_ok': False,
-                                'url': job_url,
-                                'source': 'jobindex',
-                                'posted_date': None
-                            }
-                            
-                            jobs.append(job_data)
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing JobIndex listing: {e}")
-                            continue
-                
+            async def fetch_page(page: int) -> Optional[List[Dict]]:
+                params = {
+                    'q': search_term,
+                    'supcat': '11',  # IT category
+                    'area': '1',     # Capital region
+                    'sortby': '1',   # Newest first
+                    'page': str(page + 1)
+                }
+                response = await self._get('jobindex', base_url, params=params)
+                if response.extensions.get('not_modified'):
+                    logger.info(f"JobIndex results page {page + 1} for {search_term} unchanged since the last run")
+                    return None
+                if response.status_code != 200:
+                    return None
+                return await self._parse(
+                    'jobindex', parsers.parse_jobindex_listings, response.text, self.job_sites['jobindex']
+                )
+            
+            async for jobs in self._paginate('jobindex', search_term, fetch_page):
+                for job in jobs:
+                    found += 1
+                    yield job
+            
+        except CircuitOpenError as e:
+            logger.info(f"Stopped scraping JobIndex: {e}")
         except Exception as e:
             logger.error(f"Error scraping JobIndex: {e}")
         
-        logger.info(f"Found {len(jobs)} jobs on JobIndex")
-        return jobs
+        logger.info(f"Found {found} jobs on JobIndex")
+    
+    def _high_water_mark(self, source: str, search_term: str) -> Optional[Dict]:
+        """The newest listing an earlier run saw for (source, search_term), if any"""
+        marks = _high_water_marks.get()
+        return marks.get((source, search_term)) if marks else None
+    
+    @staticmethod
+    def _reached_known(job: Dict, high_water: Optional[Dict], known_urls: set) -> bool:
+        """Whether a listing, in newest-first order, is one an earlier run already saw"""
+        if job['url'] in known_urls:
+            return True
+        if not high_water:
+            return False
+        if job['url'] == high_water['newest_url']:
+            return True
+        posted_date, newest_posted_date = job.get('posted_date'), high_water['newest_posted_date']
+        return bool(posted_date and newest_posted_date and posted_date.date() < newest_posted_date.date())
+    
+    async def _paginate(self, source: str, search_term: str, fetch_page) -> AsyncIterator[List[Dict]]:
+        """Walk newest-first result pages, yielding each page's new listings, and stop after
+        the page where known listings begin.
+        
+        Listings an earlier run saw are dropped; the rest of that page is still kept, since
+        sites pin promoted (older) listings above new ones. fetch_page(page) returns the
+        listings on a page, or None for a page that is unchanged since the last run or could
+        not be fetched. With force_refresh every page up to max_pages is walked.
+        """
+        high_water = self._high_water_mark(source, search_term)
+        stop_at_known = not _force_refresh.get()
+        
+        for page in range(self.max_pages):
+            listings = await fetch_page(page)
+            if not listings:
+                break
+            
+            known_urls = self.get_known_urls([job['url'] for job in listings]) if stop_at_known else set()
+            new_listings = [
+                job for job in listings
+                if not (stop_at_known and self._reached_known(job, high_water, known_urls))
+            ]
+            if new_listings:
+                yield new_listings
+            
+            if len(new_listings) < len(listings):
+                logger.info(f"Reached known {source} listings for {search_term} on page {page + 1}")
+                break
+            if len(listings) < self.page_size:
+                break
     
     def parse_posted_date(self, date_text: str) -> Optional[datetime]:
         """Parse posted date from various formats"""
+        return parsers.parse_posted_date(date_text)
+    
+    def search_pairs(self, sources: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """Every (source, search term) pair to scrape for the given (default: all) sources"""
+        sources = [source for source in (sources or self.scrapers) if source in self.scrapers]
+        return [(source, search_term) for source in sources for search_term in self.ai_search_terms]
+    
+    @asynccontextmanager
+    async def scrape_run(self, sources: Optional[List[str]] = None, force_refresh: bool = False):
+        """Scope of one scraping run: loads the high-water marks, and saves the new ones if it completes.
+        
+        Yields the dict iter_source_term records each pair's newest listing and job count in.
+        Pages unchanged since the last run are skipped unless force_refresh is set. Fetched
+        pages are only written to the HTTP cache if the run completes too, so pages whose jobs
+        were lost to a failed run are not skipped as unchanged by the next one.
+        """
+        sources = [source for source in (sources or self.scrapers) if source in self.scrapers]
+        logger.info(f"Scraping {len(self.ai_search_terms)} search terms from: {', '.join(sources)}")
+        
+        summaries: Dict[Tuple[str, str], Dict] = {}
+        budget = RetryBudget(self.retry_budget)
+        force_token = _force_refresh.set(force_refresh)
+        marks_token = _high_water_marks.set(self.load_scrape_states(sources))
+        budget_token = _retry_budget.set(budget)
+        cache_writes: Dict = {}
+        cache_token = _http_cache_writes.set(cache_writes)
         try:
-            date_text = date_text.lower().strip()
-            
-            if 'i dag' in date_text or 'today' in date_text:
-                return datetime.now()
-            elif 'i går' in date_text or 'yesterday' in date_text:
-                return datetime.now() - timedelta(days=1)
-            elif 'dage siden' in date_text:
-                days = int(re.search(r'(\d+)', date_text).group(1))
-                return datetime.now() - timedelta(days=days)
-            elif 'hours ago' in date_text:
-                hours = int(re.search(r'(\d+)', date_text).group(1))
-                return datetime.now() - timedelta(hours=hours)
-            elif 'timer siden' in date_text:
-                hours = int(re.search(r'(\d+)', date_text).group(1))
-                return datetime.now() - timedelta(hours=hours)
-            
-            return None
-            
+            yield summaries
+        finally:
+            _force_refresh.reset(force_token)
+            _high_water_marks.reset(marks_token)
+            _retry_budget.reset(budget_token)
+            _http_cache_writes.reset(cache_token)
+            if budget.spent:
+                logger.info(f"Scraping run used {budget.spent} of {self.retry_budget} retries")
+        
+        self.save_scrape_states(summaries)
+        if self.http_cache and cache_writes:
+            self.http_cache.commit(cache_writes)
+    
+    async def iter_source_term(self, source: str, search_term: str, summaries: Dict) -> AsyncIterator[Dict]:
+        """Yield one (source, search term) pair's jobs, logging rather than raising errors"""
+        summary = summaries.setdefault(
+            (source, search_term), {'newest_url': None, 'newest_posted_date': None, 'new_jobs': 0}
+        )
+        if not self.breakers[source].available():
+            logger.info(f"Skipping {source} for {search_term}: circuit breaker is open")
+            return
+        try:
+            async for job in self.scrapers[source](search_term):
+                # Listings keep the site's newest-first order, so the first one is the new mark
+                if summary['newest_url'] is None:
+                    summary['newest_url'] = job['url']
+                    summary['newest_posted_date'] = job.get('posted_date')
+                summary['new_jobs'] += 1
+                yield job
+        except CircuitOpenError as e:
+            logger.info(f"Stopped scraping {source} for {search_term}: {e}")
         except Exception as e:
-            logger.error(f"Error parsing date: {date_text} - {e}")
-            return None
+            logger.error(f"Error scraping {source} for {search_term}: {e}")
+    
+    async def _scrape_source_term(self, source: str, search_term: str, summaries: Dict) -> List[Dict]:
+        """Scrape one (source, search term) pair into a list"""
+        return [job async for job in self.iter_source_term(source, search_term, summaries)]
     
-    async def scrape_all_sources(self) -> List[JobCreate]:
-        """Scrape all job sources"""
-        all_jobs = []
+    async def scrape_all_sources(
+        self, sources: Optional[List[str]] = None, force_refresh: bool = False
+    ) -> List[JobCreate]:
+        """Scrape all job sources, running every (source, search term) pair concurrently.
         
-        # Scrape each search term
-        for search_term in self.ai_search_terms:
-            logger.info(f"Scraping jobs for: {search_term}")
-            
-            # Scrape LinkedIn
-            try:
-                linkedin_jobs = await self.scrape_linkedin_jobs(search_term)
-                all_jobs.extend(linkedin_jobs)
-            except Exception as e:
-                logger.error(f"Error scraping LinkedIn for {search_term}: {e}")
-            
-            # Scrape JobNet
-            try:
-                jobnet_jobs = await self.scrape_jobnet(search_term)
-                all_jobs.extend(jobnet_jobs)
-            except Exception as e:
-                logger.error(f"Error scraping JobNet for {search_term}: {e}")
-            
-            # Scrape JobIndex
-            try:
-                jobindex_jobs = await self.scrape_jobindex(search_term)
-                all_jobs.extend(jobindex_jobs)
-            except Exception as e:
-                logger.error(f"Error scraping JobIndex for {search_term}: {e}")
-            
-            # Delay between search terms
-            await asyncio.sleep(random.uniform(5, 10))
+        Search pages unchanged since the last run are skipped unless force_refresh is set.
+        See pipeline.IngestionPipeline for streaming the jobs into the database instead.
+        """
+        async with self.scrape_run(sources, force_refresh) as summaries:
+            results = await asyncio.gather(*[
+                self._scrape_source_term(source, search_term, summaries)
+                for source, search_term in self.search_pairs(sources)
+            ])
+        
+        all_jobs = [job for jobs in results for job in jobs]
         
         # Remove duplicates based on URL
         unique_jobs = []
@@ -458,4 +859,4 @@ class JobScraper:
                 unique_jobs.append(JobCreate(**job))
         
         logger.info(f"Found {len(unique_jobs)} unique jobs from all sources")
-        return unique_jobs
\ No newline at end of file
+        return unique_jobs
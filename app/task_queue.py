@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+
+from .database import ScrapeTask, ScrapeWorkerState, get_db_session
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeTaskQueue:
+    """Durable queue of scraping runs in the scrape_tasks table.
+
+    API processes enqueue; scrape worker processes (worker.py) claim tasks one at
+    a time. A claim is a compare-and-set on the task's status, so two workers never
+    run the same task. A running task whose worker stops heartbeating for
+    lease_seconds is claimed again, up to max_attempts times, then marked failed.
+    """
+
+    def __init__(self, lease_seconds: Optional[float] = None, max_attempts: Optional[int] = None):
+        self.lease_seconds = lease_seconds if lease_seconds is not None else float(
+            os.getenv("SCRAPE_TASK_LEASE_SECONDS", "600")
+        )
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("SCRAPE_TASK_MAX_ATTEMPTS", "3"))
+
+    @staticmethod
+    def _summary(task: ScrapeTask) -> Dict[str, Any]:
+        return {
+            "id": task.id,
+            "sources": task.sources.split(",") if task.sources else None,
+            "force_refresh": bool(task.force_refresh),
+            "status": task.status,
+            "created_at": task.created_at.isoformat(),
+            "started_at": task.started_at.isoformat() if task.started_at else None,
+            "finished_at": task.finished_at.isoformat() if task.finished_at else None,
+            "worker_id": task.worker_id,
+            "attempts": task.attempts,
+            "scrape_run_id": task.scrape_run_id,
+            "error": task.error
+        }
+
+    def enqueue(
+        self,
+        sources: Optional[List[str]] = None,
+        force_refresh: bool = False,
+        dedupe_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Queue a scraping run and return it.
+
+        A run identical to one that is still queued is not queued twice; the queued
+        task is returned. With a dedupe_key (a schedule slot) the task enqueued under
+        that key is returned, whatever its status, so each slot runs once.
+        """
+        sources_value = ",".join(sources) if sources else None
+        db = get_db_session()
+        try:
+            if dedupe_key:
+                existing = db.query(ScrapeTask).filter(ScrapeTask.dedupe_key == dedupe_key).first()
+            else:
+                # sources == None compiles to IS NULL
+                existing = db.query(ScrapeTask).filter(
+                    ScrapeTask.status == "queued",
+                    ScrapeTask.sources == sources_value,
+                    ScrapeTask.force_refresh == force_refresh
+                ).order_by(ScrapeTask.id).first()
+            if existing is not None:
+                return self._summary(existing)
+
+            task = ScrapeTask(sources=sources_value, force_refresh=force_refresh, dedupe_key=dedupe_key)
+            db.add(task)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another process enqueued this schedule slot first
+                db.rollback()
+                task = db.query(ScrapeTask).filter(ScrapeTask.dedupe_key == dedupe_key).one()
+                return self._summary(task)
+            logger.info(f"Queued scrape task {task.id} (sources: {sources_value or 'all'})")
+            return self._summary(task)
+        finally:
+            db.close()
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Take the oldest runnable task for worker_id: queued, or running with an expired lease"""
+        db = get_db_session()
+        try:
+            while True:
+                now = datetime.utcnow()
+                task = db.query(ScrapeTask).filter(or_(
+                    ScrapeTask.status == "queued",
+                    (ScrapeTask.status == "running") &
+                    (ScrapeTask.heartbeat_at < now - timedelta(seconds=self.lease_seconds))
+                )).order_by(ScrapeTask.id).first()
+                if task is None:
+                    return None
+
+                seen = (ScrapeTask.id == task.id, ScrapeTask.status == task.status, ScrapeTask.attempts == task.attempts)
+                if task.status == "running" and task.attempts >= self.max_attempts:
+                    db.query(ScrapeTask).filter(*seen).update({
+                        ScrapeTask.status: "failed",
+                        ScrapeTask.finished_at: now,
+                        ScrapeTask.error: f"Worker {task.worker_id} stopped heartbeating ({task.attempts} attempts)"
+                    }, synchronize_session=False)
+                    db.commit()
+                    continue
+
+                if task.status == "running":
+                    logger.warning(f"Reclaiming scrape task {task.id}: worker {task.worker_id} stopped heartbeating")
+                claimed = db.query(ScrapeTask).filter(*seen).update({
+                    ScrapeTask.status: "running",
+                    ScrapeTask.worker_id: worker_id,
+                    ScrapeTask.started_at: now,
+                    ScrapeTask.heartbeat_at: now,
+                    ScrapeTask.attempts: ScrapeTask.attempts + 1
+                }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    db.refresh(task)
+                    return self._summary(task)
+                # Another worker claimed it between the read and the update
+                db.expire_all()
+        except Exception as e:
+            logger.error(f"Error claiming scrape task: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend worker_id's lease on a running task; False if the task was reclaimed by another worker"""
+        db = get_db_session()
+        try:
+            updated = db.query(ScrapeTask).filter(
+                ScrapeTask.id == task_id, ScrapeTask.worker_id == worker_id, ScrapeTask.status == "running"
+            ).update({ScrapeTask.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            return bool(updated)
+        except Exception as e:
+            logger.error(f"Error extending lease of scrape task {task_id}: {e}")
+            db.rollback()
+            return True
+        finally:
+            db.close()
+
+    def finish(self, task_id: int, worker_id: str, scrape_run_id: Optional[int], error: Optional[str] = None):
+        """Mark worker_id's task done (or failed), linking the ScrapeRun it produced"""
+        db = get_db_session()
+        try:
+            db.query(ScrapeTask).filter(
+                ScrapeTask.id == task_id, ScrapeTask.worker_id == worker_id, ScrapeTask.status == "running"
+            ).update({
+                ScrapeTask.status: "failed" if error else "done",
+                ScrapeTask.finished_at: datetime.utcnow(),
+                ScrapeTask.scrape_run_id: scrape_run_id,
+                ScrapeTask.error: error
+            }, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error finishing scrape task {task_id}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """The task task_id, if it exists"""
+        db = get_db_session()
+        try:
+            task = db.get(ScrapeTask, task_id)
+            return self._summary(task) if task else None
+        finally:
+            db.close()
+
+    def get_counts(self) -> Dict[str, int]:
+        """Tasks per status"""
+        db = get_db_session()
+        try:
+            counts = dict(db.query(ScrapeTask.status, func.count()).group_by(ScrapeTask.status).all())
+            return {status: counts.get(status, 0) for status in ("queued", "running", "done", "failed")}
+        except Exception as e:
+            logger.error(f"Error counting scrape tasks: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def publish_worker(
+        self,
+        worker_id: str,
+        started_at: datetime,
+        current_task_id: Optional[int],
+        status: Dict[str, Any],
+        metrics: Dict[str, Any]
+    ):
+        """Store a worker's heartbeat and state, read by get_workers in the API processes"""
+        db = get_db_session()
+        try:
+            db.merge(ScrapeWorkerState(
+                worker_id=worker_id,
+                started_at=started_at,
+                heartbeat_at=datetime.utcnow(),
+                current_task_id=current_task_id,
+                status=json.dumps(status),
+                metrics=json.dumps(metrics)
+            ))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error publishing worker state: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def remove_worker(self, worker_id: str):
+        """Forget a worker that shut down cleanly"""
+        db = get_db_session()
+        try:
+            db.query(ScrapeWorkerState).filter(ScrapeWorkerState.worker_id == worker_id).delete()
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error removing worker state: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def get_workers(self, max_age_seconds: float) -> List[Dict[str, Any]]:
+        """Workers that heartbeated in the last max_age_seconds, with their published state"""
+        db = get_db_session()
+        try:
+            workers = db.query(ScrapeWorkerState).filter(
+                ScrapeWorkerState.heartbeat_at >= datetime.utcnow() - timedelta(seconds=max_age_seconds)
+            ).order_by(ScrapeWorkerState.worker_id).all()
+            return [{
+                "worker_id": worker.worker_id,
+                "started_at": worker.started_at.isoformat(),
+                "heartbeat_at": worker.heartbeat_at.isoformat(),
+                "current_task_id": worker.current_task_id,
+                **json.loads(worker.status or "{}"),
+                "metrics": json.loads(worker.metrics or "{}")
+            } for worker in workers]
+        except Exception as e:
+            logger.error(f"Error reading worker states: {e}")
+            return []
+        finally:
+            db.close()
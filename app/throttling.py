@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self.updated_at is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                self._refill(loop.time())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """Per-host politeness: bounded concurrency plus a token-bucket request rate"""
+
+    def __init__(self, concurrency: int, rate: float, burst: float = 1.0):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot, entered only once the rate limit allows it"""
+        async with self.semaphore:
+            await self.bucket.acquire()
+            yield
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveThrottle(HostLimiter):
+    """HostLimiter whose request rate follows the server's responses (AIMD).
+
+    Every healthy response adds `increase` requests/second, up to max_rate. A 429
+    or 503 multiplies the rate by `decrease`, down to min_rate, and pauses the host
+    for its Retry-After (or one request interval). Further throttling responses
+    during that pause are requests already in flight, so they do not cut the rate again.
+    """
+
+    BACKOFF_STATUSES = (429, 503)
+
+    def __init__(
+        self,
+        concurrency: int,
+        rate: float,
+        burst: float = 1.0,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease: float = 0.5,
+        max_retry_after: float = 300.0
+    ):
+        super().__init__(concurrency, rate, burst)
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.increase = increase if increase is not None else rate / 10
+        self.decrease = decrease
+        self.max_retry_after = max_retry_after
+        self.paused_until = 0.0
+        self.backoffs = 0
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot, entered once any pause is over and the rate allows it"""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            while loop.time() < self.paused_until:
+                await asyncio.sleep(self.paused_until - loop.time())
+            await self.bucket.acquire()
+            yield
+
+    def record(self, status: int, retry_after: Optional[float] = None):
+        """Adjust the rate to a response's status code and Retry-After seconds"""
+        now = asyncio.get_running_loop().time()
+        if status in self.BACKOFF_STATUSES:
+            if now < self.paused_until:
+                return
+            self.backoffs += 1
+            self.bucket.rate = max(self.min_rate, self.bucket.rate * self.decrease)
+            self.bucket.tokens, self.bucket.updated_at = 0.0, now
+            wait = retry_after if retry_after is not None else 1 / self.bucket.rate
+            self.paused_until = now + min(wait, self.max_retry_after)
+        elif status < 500:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from .database import create_tables
+from .job_service import JobService
+from .metrics import metrics, track_run
+from .pipeline import IngestionPipeline
+from .scrapers import JobScraper
+from .task_queue import ScrapeTaskQueue
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_slot(now: datetime, interval_minutes: int) -> str:
+    """Dedupe key of the scheduled run due at now, the same in every worker process"""
+    if interval_minutes > 0:
+        # Interval triggers are aligned to the epoch, so the nearest boundary is the slot
+        return f"interval:{interval_minutes}:{round(now.timestamp() / (interval_minutes * 60))}"
+    return f"daily:{now:%Y-%m-%d}"
+
+
+class ScrapeWorker:
+    """Runs queued scraping tasks in its own process, apart from the API.
+
+    The worker claims one task at a time from the ScrapeTaskQueue and streams it
+    into the database with the IngestionPipeline. While it runs it heartbeats the
+    task's lease and publishes its circuit breakers, HTTP counters and metrics for
+    /api/health and /api/metrics. With schedule=True it also enqueues the daily (or
+    SCRAPE_INTERVAL_MINUTES) run; every worker may do so, as each schedule slot is
+    enqueued once.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        schedule: bool = True,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.schedule = schedule
+        self.poll_interval = poll_interval or float(os.getenv("SCRAPE_WORKER_POLL_SECONDS", "2"))
+        self.heartbeat_interval = heartbeat_interval or float(os.getenv("SCRAPE_WORKER_HEARTBEAT_SECONDS", "10"))
+        self.interval_minutes = int(os.getenv("SCRAPE_INTERVAL_MINUTES", "0"))
+        self.queue = ScrapeTaskQueue()
+        self.job_service = JobService()
+        self.scraper = JobScraper()
+        self.pipeline = IngestionPipeline(self.scraper, self.job_service)
+        self.scheduler = AsyncIOScheduler()
+        self.started_at = datetime.utcnow()
+        self.current_task_id: Optional[int] = None
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Exit after the task in progress, if any"""
+        self._stopping.set()
+
+    def enqueue_scheduled(self):
+        self.queue.enqueue(dedupe_key=schedule_slot(datetime.now(timezone.utc), self.interval_minutes))
+
+    def start_schedule(self):
+        # Scheduled daily at 9 AM, or every SCRAPE_INTERVAL_MINUTES; incremental scraping
+        # (per-term high-water marks) keeps frequent runs cheap
+        if self.interval_minutes > 0:
+            trigger = IntervalTrigger(
+                minutes=self.interval_minutes, start_date=datetime.fromtimestamp(0, timezone.utc)
+            )
+        else:
+            trigger = CronTrigger(hour=9, minute=0)
+        self.scheduler.add_job(self.enqueue_scheduled, trigger, id="daily_job_scraping", replace_existing=True)
+        self.scheduler.start()
+
+    def get_status(self) -> Dict:
+        """Scraper state published with every heartbeat"""
+        return {
+            "circuit_breakers": self.scraper.get_breaker_states(),
+            "http_connections": self.scraper.get_connection_stats(),
+            "http_cache": self.scraper.http_cache.get_stats() if self.scraper.http_cache else None
+        }
+
+    def publish_state(self):
+        self.queue.publish_worker(
+            self.worker_id, self.started_at, self.current_task_id, self.get_status(), metrics.export()
+        )
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            task_id = self.current_task_id
+            if task_id is not None and not await loop.run_in_executor(
+                None, self.queue.heartbeat, task_id, self.worker_id
+            ):
+                logger.warning(f"Lost the lease on scrape task {task_id}; another worker may be running it")
+            await loop.run_in_executor(None, self.publish_state)
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def run_task(self, task: Dict):
+        """Scrape one queued task into the database and record its ScrapeRun"""
+        sources, force_refresh = task["sources"], task["force_refresh"]
+        logger.info(f"Starting scrape task {task['id']} (attempt {task['attempts']})...")
+        self.current_task_id = task["id"]
+
+        def batch_written(counts):
+            # New jobs show up in every API process on its next cache check, not at the end of the run
+            if counts['inserted'] or counts['updated'] or counts['merged']:
+                self.job_service.bump_cache_generation()
+
+        started_at, started = datetime.utcnow(), time.perf_counter()
+        totals, error = {}, None
+        with track_run() as stage_seconds:
+            try:
+                # Stream jobs from all sources into the database as pages are scraped
+                totals = await self.pipeline.run(sources, force_refresh=force_refresh, on_batch=batch_written)
+
+                logger.info(
+                    f"Successfully scraped {totals['scraped']} jobs: {totals['inserted']} new, "
+                    f"{totals['updated']} updated, {totals['merged']} merged, {totals['skipped']} skipped"
+                )
+            except Exception as e:
+                logger.error(f"Error during scrape task {task['id']}: {e}")
+                error = str(e)
+
+        run_id = self.job_service.record_scrape_run(
+            started_at, time.perf_counter() - started, sources or list(self.scraper.scrapers), force_refresh,
+            totals, stage_seconds, error
+        )
+        self.queue.finish(task["id"], self.worker_id, run_id, error)
+        self.current_task_id = None
+        self.publish_state()
+
+    async def run(self, once: bool = False):
+        """Claim and run tasks until stop(); with once=True, exit when the queue is empty"""
+        loop = asyncio.get_running_loop()
+        create_tables()
+        await self.scraper.open()
+
+        # Fingerprint jobs stored before near-duplicate detection, so new postings are matched against them
+        await loop.run_in_executor(None, self.job_service.duplicates.backfill)
+
+        if self.schedule:
+            self.start_schedule()
+            # Initial scraping, unless an identical run is already waiting
+            self.queue.enqueue()
+
+        heartbeat = asyncio.create_task(self._heartbeat())
+        logger.info(f"Scrape worker {self.worker_id} polling for tasks every {self.poll_interval:g}s")
+        try:
+            while not self._stopping.is_set():
+                task = await loop.run_in_executor(None, self.queue.claim, self.worker_id)
+                if task is not None:
+                    await self.run_task(task)
+                    continue
+                if once:
+                    break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            heartbeat.cancel()
+            if self.scheduler.running:
+                self.scheduler.shutdown()
+            await self.scraper.close()
+            self.queue.remove_worker(self.worker_id)
+            logger.info(f"Scrape worker {self.worker_id} stopped")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Measure /api/health latency while a (mocked) LinkedIn scrape is running.
+
+The mocked scrape blocks its thread with time.sleep, exactly like the real
+Selenium session does. If that work ever leaks back onto the event loop,
+p99 latency during the scrape jumps from milliseconds to seconds.
+
+Run from the repository root:  python benchmarks/bench_api_latency.py
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRAPE_SECONDS = 2.0
+SEARCH_TERMS = 2
+REQUESTS = 200
+
+
+def mocked_linkedin_session(*args):
+    """Stand-in for JobScraper._scrape_linkedin_session: blocking browser work"""
+    time.sleep(SCRAPE_SECONDS)
+    return []
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure_health(client, count, interval=0.01):
+    """Send requests on a fixed schedule, measuring each from its scheduled send time.
+
+    Measuring from the schedule rather than from the actual send means time the
+    event loop spends blocked before the request goes out is counted as latency.
+    """
+    loop = asyncio.get_running_loop()
+    latencies = []
+    started = loop.time()
+    for i in range(count):
+        scheduled = started + i * interval
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        response = await client.get("/api/health")
+        latencies.append((loop.time() - scheduled) * 1000)
+        assert response.status_code == 200
+    return latencies
+
+
+async def timed_scrape(scraper):
+    """Scrape SEARCH_TERMS terms from LinkedIn, returning the seconds it took"""
+    started = time.perf_counter()
+    await asyncio.gather(*[scraper.scrape_linkedin_jobs(term) for term in scraper.ai_search_terms[:SEARCH_TERMS]])
+    return time.perf_counter() - started
+
+
+def report(label, latencies):
+    print(f"{label:<16} p50={statistics.median(latencies):7.2f} ms  "
+          f"p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms")
+
+
+async def run(app, scraper):
+    import httpx
+
+    scraper._scrape_linkedin_session = mocked_linkedin_session
+    scraper.limiters['linkedin'].bucket.rate = 100.0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = await measure_health(client, REQUESTS)
+
+        scrape = asyncio.create_task(timed_scrape(scraper))
+        busy = await measure_health(client, REQUESTS)
+        scrape_seconds = await scrape
+
+    await scraper.close()
+
+    report("idle", idle)
+    report("during scrape", busy)
+
+    # scrape_linkedin_jobs returns [] on any error, so a scrape that never reached the mock looks idle
+    if scrape_seconds < SCRAPE_SECONDS:
+        print(f"FAIL: the mocked scrape finished in {scrape_seconds * 1000:.1f} ms, it never ran")
+        sys.exit(1)
+    if percentile(busy, 99) > max(10 * percentile(idle, 99), 50):
+        print("FAIL: /api/health latency degrades while LinkedIn is being scraped")
+        sys.exit(1)
+    print("OK: scraping does not block the event loop")
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/jobs.db"
+        sys.path.insert(0, ROOT)
+        from app.database import create_tables, engine
+        from app.main import app
+        from app.scrapers import JobScraper
+
+        create_tables()
+        # Keep the import-time heap out of full collections, whose pause would otherwise land
+        # in one measurement window at random
+        gc.freeze()
+        # Scrapes normally run in a scrape worker process (worker.py); running one in the
+        # API's process here checks the scraper still keeps the event loop free
+        try:
+            asyncio.run(run(app, JobScraper(http_cache_path="")))
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Wall-clock time of a DanishJobScraper run against the local stand-in server,
+with the previous fetch loop (blocking requests, one JobIndex term after the
+other with a fixed 2 s sleep, then TheHub) for comparison.
+
+The stand-in can enforce a per-site rate limit (--rate-limit requests/second),
+answering excess requests with 429 and Retry-After: 1. The adaptive throttle
+should then back off to the limit, while the fixed sleep stays slow even when
+the site would allow more.
+
+Run from the repository root:  python benchmarks/bench_danish_scraper.py [--terms 8] [--rate-limit 3]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_fetch(sites, terms, sleep_seconds):
+    """The blocking loop DanishJobScraper replaced: returns (seconds, status codes)"""
+    import requests
+
+    statuses = []
+    started = time.perf_counter()
+    for term in terms:
+        statuses.append(requests.get(f"{sites['jobindex']}/jobsoegning?q={term}&superjob=0").status_code)
+        time.sleep(sleep_seconds)
+    statuses.append(requests.get(f"{sites['thehub']}/jobs").status_code)
+    return time.perf_counter() - started, statuses
+
+
+def adaptive_run(sites, terms):
+    """A full DanishJobScraper run: returns (seconds, jobs saved, final rate per site)"""
+    from danish_job_scrapers import DanishJobScraper
+
+    scraper = DanishJobScraper(sites=sites)
+    scraper.SEARCH_TERMS = terms
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        saved = scraper.scrape_all_jobs()
+    elapsed = time.perf_counter() - started
+    return elapsed, saved, {site: round(throttle.rate, 2) for site, throttle in scraper.throttles.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terms", type=int, default=8, help="JobIndex search terms")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="stand-in response latency")
+    parser.add_argument("--rate-limit", type=float, default=3.0, help="stand-in requests/second per site (0 = none)")
+    parser.add_argument("--legacy-sleep", type=float, default=2.0, help="fixed sleep of the previous loop")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/danish.db"
+        sys.path.insert(0, ROOT)
+        from standin_server import StandinServer, create_app
+
+        terms = [f"ai+term+{i}" for i in range(args.terms)]
+        print(f"{args.terms} JobIndex terms + TheHub, {args.latency_ms:.0f} ms latency, "
+              f"rate limit {args.rate_limit or 'none'} requests/s per site")
+        print(f"  {'path':<24} {'seconds':>8} {'requests':>9} {'429s':>5}")
+
+        standin = create_app(args.latency_ms, jitter_ms=0.0, rate_limit=args.rate_limit)
+        with StandinServer(standin) as server:
+            elapsed, statuses = legacy_fetch(server.danish_sites(), terms, args.legacy_sleep)
+            print(f"  {'requests + fixed sleep':<24} {elapsed:>8.2f} {len(statuses):>9} {statuses.count(429):>5}")
+
+        standin = create_app(args.latency_ms, jitter_ms=0.0, rate_limit=args.rate_limit)
+        with StandinServer(standin) as server:
+            elapsed, saved, rates = adaptive_run(server.danish_sites(), terms)
+            requests_sent = standin.state.requests['jobindex'] + standin.state.requests['thehub']
+            print(f"  {'async + AdaptiveThrottle':<24} {elapsed:>8.2f} {requests_sent:>9} "
+                  f"{standin.state.requests['rate_limited']:>5}")
+        print(f"\n{saved} jobs saved; final throttle rates (requests/s): {rates}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection on synthetic postings: how many cross-source copies
+bulk_upsert merges (recall), how many distinct postings it wrongly merges
+(precision), ingest rate, and how the LSH lookup time moves as the jobs table
+grows.
+
+Every original posting has its own random description. Duplicates are copies
+"scraped from another source": different URL, case and punctuation, one word
+changed and a source footer added. Hard negatives share the title and company
+of an original but describe a different job, and must stay separate.
+
+Run from the repository root:  python benchmarks/bench_dedup.py [--jobs 20000] [--dup-rate 0.3]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TITLES = ["Machine Learning Engineer", "AI Consultant", "Data Scientist", "ML Engineer", "AI Project Lead"]
+COMPANIES = ["Novo Nordisk", "Maersk", "Netcompany", "Ørsted", "Danske Bank", "Trifork", "Carlsberg", "LEGO"]
+FOOTERS = ["Søg stillingen via Jobindex.", "Apply on LinkedIn.", "Ansøg via Jobnet."]
+
+
+def make_postings(count, dup_rate, hard_negative_rate, seed=0):
+    """(postings, index of the original each duplicate copies) for count postings"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(5000)]
+
+    def description():
+        words = rng.choices(vocabulary, k=rng.randint(40, 120))
+        return "Machine learning role in Copenhagen. " + " ".join(words)
+
+    postings, original_of = [], {}
+    originals = []
+    while len(postings) < count:
+        roll = rng.random()
+        if originals and roll < dup_rate:
+            source = postings[rng.choice(originals)]
+            words = source['description'].split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            original_of[len(postings)] = source['index']
+            postings.append({
+                **source,
+                'index': len(postings),
+                'title': source['title'].upper(),
+                'description': " ".join(words).replace(".", " .") + " " + rng.choice(FOOTERS),
+                'url': f"https://duplicate.example/{len(postings)}"
+            })
+            continue
+
+        title, company = rng.choice(TITLES), rng.choice(COMPANIES)
+        if originals and roll < dup_rate + hard_negative_rate:
+            source = postings[rng.choice(originals)]
+            title, company = source['title'], source['company']
+        originals.append(len(postings))
+        postings.append({
+            'index': len(postings),
+            'title': title,
+            'company': company,
+            'location': "København",
+            'description': description(),
+            'url': f"https://original.example/{len(postings)}",
+            'source': rng.choice(["jobnet", "jobindex", "linkedin"])
+        })
+    return postings, original_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20000, help="postings to ingest")
+    parser.add_argument("--dup-rate", type=float, default=0.3, help="share of postings that copy an earlier one")
+    parser.add_argument("--hard-negative-rate", type=float, default=0.1,
+                        help="share of postings reusing an earlier title and company")
+    parser.add_argument("--batch-size", type=int, default=50, help="jobs per bulk_upsert, as in the pipeline")
+    parser.add_argument("--checkpoints", type=int, default=5, help="lookup timings taken while the table grows")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/dedup.db"
+        sys.path.insert(0, ROOT)
+        from app.database import Job, JobAlias, create_tables, get_db_session
+        from app.job_service import JobService
+        from app.models import JobCreate
+
+        create_tables()
+        service = JobService()
+        postings, original_of = make_postings(args.jobs, args.dup_rate, args.hard_negative_rate)
+        jobs = [JobCreate(**{k: v for k, v in posting.items() if k != 'index'}) for posting in postings]
+        probe = [service.duplicates.fingerprint(posting) for posting in postings[:args.batch_size]]
+        probe = [signature for signature in probe if signature is not None]
+
+        print(f"{len(postings)} postings, {len(original_of)} duplicates, batches of {args.batch_size}")
+        print(f"  {'jobs stored':>11} {'lookup ms/batch':>16} {'ingest jobs/s':>14}")
+        step = max(len(jobs) // args.checkpoints, args.batch_size)
+        next_checkpoint, window_started, window_jobs = step, time.perf_counter(), 0
+        merged = 0
+        started = time.perf_counter()
+        for i in range(0, len(jobs), args.batch_size):
+            counts = asyncio.run(service.bulk_upsert(jobs[i:i + args.batch_size]))
+            merged += counts['merged']
+            window_jobs += len(jobs[i:i + args.batch_size])
+            if i + args.batch_size >= next_checkpoint or i + args.batch_size >= len(jobs):
+                rate = window_jobs / (time.perf_counter() - window_started)
+                db = get_db_session()
+                try:
+                    samples = []
+                    for _ in range(20):
+                        lookup_started = time.perf_counter()
+                        service.duplicates.find_duplicates(db, probe)
+                        samples.append(time.perf_counter() - lookup_started)
+                    stored = db.query(Job).count()
+                finally:
+                    db.close()
+                print(f"  {stored:>11} {statistics.median(samples) * 1000:>16.2f} {rate:>14.0f}")
+                next_checkpoint += step
+                window_started, window_jobs = time.perf_counter(), 0
+        elapsed = time.perf_counter() - started
+
+        db = get_db_session()
+        try:
+            ids = dict(db.query(Job.url, Job.id).all())
+            aliases = dict(db.query(JobAlias.url, JobAlias.job_id).all())
+        finally:
+            db.close()
+
+    # A merge is right if both postings copy the same original; a duplicate that was
+    # missed and stored itself may absorb later copies of its original
+    group_of_url = {posting['url']: original_of.get(posting['index'], posting['index']) for posting in postings}
+    group_of_job = {job_id: group_of_url[url] for url, job_id in ids.items()}
+    correct = sum(1 for url, job_id in aliases.items() if group_of_url[url] == group_of_job.get(job_id))
+    recall = correct / len(original_of) if original_of else 1.0
+    precision = correct / len(aliases) if aliases else 1.0
+    print(f"\nMerged {merged} postings in {elapsed:.1f}s ({len(postings) / elapsed:.0f} jobs/s overall)")
+    print(f"  recall    {recall:.4f}  (duplicates merged into their original)")
+    print(f"  precision {precision:.4f}  (merges that were real duplicates)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark: scraping, ingestion and the API, against the
+local stand-in server in benchmarks/standin_server.py instead of the live sites.
+
+Phases:
+  scrape  scrape_all_sources for JobNet and JobIndex (force_refresh)
+  ingest  the IngestionPipeline path used by scheduled scrapes, into a fresh database
+  api     /api/jobs, /api/jobs?q=, /api/jobs/stats, uncached and from the response cache
+
+Reports jobs/sec, request latency p50/p99 and peak RSS, and appends the run to
+a JSON file (default benchmarks/results/harness.json), printing the change
+against the previous run. LinkedIn is scraped through a browser, so it is not
+covered.
+
+Run from the repository root:  python benchmarks/bench_harness.py [--latency-ms 50] [--error-rate 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = ["jobnet", "jobindex"]
+API_PATHS = ["/api/jobs?limit=20", "/api/jobs?q=machine%20learning&limit=20", "/api/jobs/stats"]
+# Compared against the previous run; a rise is a regression for all but jobs_per_sec
+TRACKED = ["jobs_per_sec", "request_p50_ms", "request_p99_ms", "p50_ms", "p99_ms", "peak_rss_mb"]
+
+
+def percentiles(samples):
+    """p50 and p99 of samples in seconds, in milliseconds"""
+    if not samples:
+        return {'p50_ms': None, 'p99_ms': None}
+    ordered = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(ordered) * 1000, 2),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2)
+    }
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far (ru_maxrss is in KiB on Linux)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def make_scraper(server, args):
+    import httpx
+
+    from app.scrapers import JobScraper
+
+    limits = {'concurrency': args.concurrency, 'rate': args.rate, 'burst': args.concurrency}
+    scraper = JobScraper(
+        source_limits={source: limits for source in SOURCES},
+        http_cache_path="",
+        job_sites=server.job_sites()
+    )
+
+    # Time to response headers of every request the scraper sends
+    started, latencies = {}, []
+
+    async def on_request(request):
+        started[id(request)] = time.perf_counter()
+
+    async def on_response(response):
+        latencies.append(time.perf_counter() - started.pop(id(response.request)))
+
+    # open() would also resolve a Chrome driver, which the stand-in does not need
+    scraper.client = httpx.AsyncClient(
+        limits=scraper.http_limits,
+        timeout=scraper.http_timeout,
+        event_hooks={'request': [on_request], 'response': [on_response]}
+    )
+    return scraper, latencies
+
+
+def reset_database():
+    from app.database import Job, ScrapeState, get_db_session
+
+    db = get_db_session()
+    try:
+        db.query(Job).delete()
+        db.query(ScrapeState).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+async def scrape_phase(server, args):
+    scraper, latencies = make_scraper(server, args)
+    started = time.perf_counter()
+    jobs = await scraper.scrape_all_sources(SOURCES, force_refresh=True)
+    elapsed = time.perf_counter() - started
+    await scraper.close()
+    return {
+        'jobs': len(jobs),
+        'seconds': round(elapsed, 3),
+        'jobs_per_sec': round(len(jobs) / elapsed, 1),
+        'requests': len(latencies),
+        **{f"request_{name}": value for name, value in percentiles(latencies).items()},
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+async def ingest_phase(server, args):
+    from app.job_service import JobService
+    from app.pipeline import IngestionPipeline
+
+    reset_database()
+    scraper, latencies = make_scraper(server, args)
+    first_batch = []
+    started = time.perf_counter()
+    totals = await IngestionPipeline(scraper, JobService()).run(
+        SOURCES, force_refresh=True, on_batch=lambda counts: first_batch.append(time.perf_counter() - started)
+    )
+    elapsed = time.perf_counter() - started
+    await scraper.close()
+    return {
+        'jobs': totals['scraped'],
+        'inserted': totals['inserted'],
+        'skipped': totals['skipped'],
+        'seconds': round(elapsed, 3),
+        'jobs_per_sec': round(totals['scraped'] / elapsed, 1),
+        'first_batch_ms': round(first_batch[0] * 1000, 1) if first_batch else None,
+        **{f"request_{name}": value for name, value in percentiles(latencies).items()},
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+async def api_phase(args):
+    import httpx
+
+    from app.main import app, response_cache
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://harness") as client:
+        for path in API_PATHS:
+            for label, invalidate in [("uncached", True), ("cached", False)]:
+                samples = []
+                for _ in range(args.api_requests):
+                    if invalidate:
+                        response_cache.invalidate()
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    samples.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{path} returned {response.status_code}")
+                results[f"{path} {label}"] = percentiles(samples)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(previous, current, prefix=""):
+    """Print tracked metrics that moved more than 10% since the previous run"""
+    for name, value in current.items():
+        before = (previous or {}).get(name)
+        if isinstance(value, dict):
+            compare(before if isinstance(before, dict) else None, value, f"{prefix}{name}.")
+        elif name in TRACKED and isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            change = (value - before) / before
+            if abs(change) > 0.10:
+                worse = change < 0 if name == "jobs_per_sec" else change > 0
+                print(f"  {'REGRESSION' if worse else 'improved'}  {prefix}{name}: {before} -> {value} ({change:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stand-in response latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--pages", type=int, default=5, help="full result pages per search term")
+    parser.add_argument("--concurrency", type=int, default=8, help="scraper requests in flight per source")
+    parser.add_argument("--rate", type=float, default=1000.0, help="scraper requests/second per source")
+    parser.add_argument("--api-requests", type=int, default=100, help="requests per API endpoint and mode")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results", "harness.json"))
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/harness.db"
+        os.environ["SCRAPER_MAX_PAGES"] = str(args.pages + 1)
+        sys.path.insert(0, ROOT)
+        from app.database import create_tables
+        from standin_server import StandinServer, create_app
+
+        create_tables()
+        standin = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.pages)
+        with StandinServer(standin) as server:
+            results = {
+                'scrape': asyncio.run(scrape_phase(server, args)),
+                'ingest': asyncio.run(ingest_phase(server, args)),
+                'api': asyncio.run(api_phase(args)),
+                'standin_requests': dict(standin.state.requests)
+            }
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'commit': git_commit(),
+        'config': {name: value for name, value in vars(args).items() if name != "output"},
+        'results': results
+    }
+    print(json.dumps(run, indent=2))
+
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            history = json.load(f)
+    previous = next((r for r in reversed(history) if r['config'] == run['config']), None)
+    if previous:
+        print(f"\nChanges since {previous['timestamp']} ({previous['commit']}), same config:")
+        compare(previous['results'], results)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(history + [run], f, indent=2)
+    print(f"\nAppended to {os.path.relpath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Bytes transferred and time spent by a repeat scrape of unchanged JobNet and
+JobIndex pages, with and without the scraper's HTTP cache.
+
+A stand-in transport serves realistic-sized pages: JobNet answers conditional
+requests (ETag/304), JobIndex sends no validators, so unchanged pages are
+recognised by their body digest.
+
+Run from the repository root:  python benchmarks/bench_http_cache.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LISTINGS = 20
+PADDING = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "</p>"
+
+JOBNET_SEARCH = "".join(
+    f'<div class="job-listing-item"><h2 class="job-title"><a href="/job/{i}">AI Konsulent {i}</a></h2>'
+    f'<span class="company-name">Firma {i}</span><span class="location">København</span>{PADDING}</div>'
+    for i in range(LISTINGS)
+)
+JOBNET_DETAIL = f'<div class="job-description">Machine learning og generativ AI. {PADDING * 5}</div>'
+JOBINDEX_SEARCH = "".join(
+    f'<div class="jobsearch-result"><h4 class="jobsearch-title"><a href="/ji/{i}">AI Udvikler {i}</a></h4>'
+    f'<a class="company-name">Virksomhed {i}</a>{PADDING}</div>'
+    for i in range(LISTINGS)
+)
+
+
+def make_handler(transferred):
+    import httpx
+
+    def handler(request):
+        if request.url.host == "job.jobnet.dk":
+            body = (JOBNET_SEARCH if "Search" in request.url.path else JOBNET_DETAIL).encode()
+            etag = f'"{len(body)}"'
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304, headers={"ETag": etag})
+            transferred.append(len(body))
+            return httpx.Response(200, headers={"ETag": etag, "Content-Type": "text/html; charset=utf-8"}, content=body)
+        transferred.append(len(JOBINDEX_SEARCH.encode()))
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=JOBINDEX_SEARCH.encode())
+
+    return handler
+
+
+async def run_twice(cache_path):
+    import httpx
+
+    from app.http_cache import HTTPCache
+    from app.scrapers import JobScraper
+
+    transferred = []
+    scraper = JobScraper(source_limits={
+        'jobnet': {'concurrency': 8, 'rate': 1000.0, 'burst': 100},
+        'jobindex': {'concurrency': 8, 'rate': 1000.0, 'burst': 100},
+    }, skip_known_details=False, http_cache_path=cache_path)
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(make_handler(transferred)))
+    if cache_path:
+        scraper.http_cache = HTTPCache(cache_path)
+
+    results = []
+    for _ in range(2):
+        transferred.clear()
+        started = time.perf_counter()
+        jobs = await scraper.scrape_all_sources(["jobnet", "jobindex"])
+        results.append((len(jobs), sum(transferred), time.perf_counter() - started))
+    await scraper.close()
+    return results
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/jobs.db"
+        sys.path.insert(0, ROOT)
+        from app.database import ScrapeState, create_tables, get_db_session
+        create_tables()
+
+        for label, cache_path in [("no cache", ""), ("HTTP cache", f"{tmp}/http_cache.db")]:
+            # Each mode starts from a first run, without the high-water marks left by the previous mode
+            db = get_db_session()
+            db.query(ScrapeState).delete()
+            db.commit()
+            db.close()
+
+            (first_jobs, first_bytes, first_time), (repeat_jobs, repeat_bytes, repeat_time) = asyncio.run(
+                run_twice(cache_path)
+            )
+            print(f"{label}:")
+            print(f"  first run   {first_jobs:4d} jobs  {first_bytes / 1024:8.1f} KiB  {first_time * 1000:7.1f} ms")
+            print(f"  repeat run  {repeat_jobs:4d} jobs  {repeat_bytes / 1024:8.1f} KiB  {repeat_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
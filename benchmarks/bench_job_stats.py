@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+/api/jobs/stats latency as the jobs table grows: the trigger-maintained
+job_stats counters versus aggregating the jobs table on every call.
+
+Also reports what the triggers cost the write path (bulk_upsert throughput).
+SQLite databases do not get the JOB_STATS_FALLBACK_INDEXES, so the aggregate
+column is what a SQLite database without the counters would pay.
+
+Run from the repository root:  python benchmarks/bench_job_stats.py [sizes...]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = [10_000, 100_000, 300_000]
+BATCH_SIZE = 5_000
+REPEATS = 20
+
+
+def make_jobs(start, count):
+    from app.models import JobCreate
+    return [
+        JobCreate(
+            title=f"AI Consultant {i}",
+            company=f"Company {i % 2000}",
+            location=["København", "Aarhus C", "Odense", "Aalborg"][i % 4],
+            description="Machine learning and generative AI consulting in Denmark.",
+            job_type=["full-time", "contract", None][i % 3],
+            url=f"https://example.dk/job/{i}",
+            source=["linkedin", "jobnet", "jobindex"][i % 3]
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def median_ms(action):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    sizes = sorted(int(size) for size in sys.argv[1:]) or DEFAULT_SIZES
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/stats.db"
+        sys.path.insert(0, ROOT)
+
+        from app.database import create_tables, get_db_session
+        from app.job_service import JobService
+
+        create_tables()
+        service = JobService()
+
+        print(f"{'jobs':>8} {'counters (ms)':>14} {'aggregate (ms)':>15} {'upsert jobs/s':>14}")
+        stored = 0
+        for size in sizes:
+            previous, started = stored, time.perf_counter()
+            while stored < size:
+                count = min(BATCH_SIZE, size - stored)
+                asyncio.run(service.bulk_upsert(make_jobs(stored, count)))
+                stored += count
+            ingest_rate = (stored - previous) / max(time.perf_counter() - started, 1e-9)
+
+            db = get_db_session()
+            try:
+                counters = median_ms(lambda: service._read_job_stats(db))
+                aggregate = median_ms(lambda: service._aggregate_job_stats(db))
+                if service._read_job_stats(db).active_jobs != service._aggregate_job_stats(db).active_jobs:
+                    print("FAIL: job_stats counters disagree with the jobs table")
+                    sys.exit(1)
+            finally:
+                db.close()
+
+            print(f"{size:>8} {counters:>14.2f} {aggregate:>15.2f} {ingest_rate:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
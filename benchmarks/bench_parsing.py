@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Parse time of the saved JobNet and JobIndex pages in benchmarks/fixtures with
+the previous BeautifulSoup ('html.parser') code and with app.parsers (lxml and
+precompiled XPath), and event loop stalls while a run's worth of pages is
+parsed on the loop versus in the ParsePool worker processes.
+
+Both paths must produce the same jobs; the benchmark fails otherwise.
+
+Run from the repository root:  python benchmarks/bench_parsing.py
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+REPEATS = 50
+# One scheduled run: 11 search terms x 2 sources x 5 pages, plus 20 detail pages per JobNet page
+RUN_PAGES = 110
+RUN_DETAILS = 1100
+
+
+def bs4_jobnet_listings(html):
+    """The BeautifulSoup JobNet parser app.parsers replaced, kept for comparison"""
+    from bs4 import BeautifulSoup
+
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for listing in soup.find_all('div', class_='job-listing-item'):
+        title_elem = listing.find('h2', class_='job-title')
+        company_elem = listing.find('span', class_='company-name')
+        location_elem = listing.find('span', class_='location')
+        if not all([title_elem, company_elem]):
+            continue
+        job_url = title_elem.find('a')['href']
+        if not job_url.startswith('http'):
+            job_url = f"https://job.jobnet.dk{job_url}"
+        date_elem = listing.find('span', class_='posted-date')
+        jobs.append({
+            'title': title_elem.text.strip(),
+            'company': company_elem.text.strip(),
+            'location': location_elem.text.strip() if location_elem else '',
+            'url': job_url,
+            'posted_date': date_elem.text.strip() if date_elem else None
+        })
+    return jobs
+
+
+def bs4_jobnet_description(html):
+    from bs4 import BeautifulSoup
+
+    desc_elem = BeautifulSoup(html, 'html.parser').find('div', class_='job-description')
+    return desc_elem.text.strip() if desc_elem else ""
+
+
+def bs4_jobindex_listings(html):
+    from bs4 import BeautifulSoup
+
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for listing in soup.find_all('div', class_='jobsearch-result'):
+        title_elem = listing.find('h4', class_='jobsearch-title')
+        company_elem = listing.find('a', class_='company-name')
+        location_elem = listing.find('span', class_='location')
+        if not all([title_elem, company_elem]):
+            continue
+        job_url = title_elem.find('a')['href']
+        if not job_url.startswith('http'):
+            job_url = f"https://www.jobindex.dk{job_url}"
+        jobs.append({
+            'title': title_elem.text.strip(),
+            'company': company_elem.text.strip(),
+            'location': location_elem.text.strip() if location_elem else '',
+            'url': job_url
+        })
+    return jobs
+
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def median_ms(parser, html):
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        parser(html)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def check_same(old, new, fields):
+    if [{field: job[field] for field in fields} for job in new] != [
+        {field: job[field] for field in fields} for job in old
+    ]:
+        print("FAIL: lxml and BeautifulSoup parsers disagree")
+        sys.exit(1)
+
+
+async def parse_run(parse, jobs):
+    """Parse concurrently, sampling how late a 10 ms ticker on the loop wakes up"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - expected)
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*[parse(parser, html) for parser, html in jobs])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    return elapsed, max(lags, default=0.0)
+
+
+def main():
+    logging.disable(logging.INFO)
+    sys.path.insert(0, ROOT)
+    from app import parsers
+
+    jobnet, jobindex, detail = load("jobnet_search.html"), load("jobindex_search.html"), load("jobnet_detail.html")
+
+    check_same(bs4_jobnet_listings(jobnet), parsers.parse_jobnet_listings(jobnet), ['title', 'company', 'location', 'url'])
+    check_same(bs4_jobindex_listings(jobindex), parsers.parse_jobindex_listings(jobindex), ['title', 'company', 'location', 'url'])
+    if bs4_jobnet_description(detail) != parsers.parse_jobnet_description(detail):
+        print("FAIL: lxml and BeautifulSoup descriptions disagree")
+        sys.exit(1)
+
+    print(f"Median of {REPEATS} parses per page (ms)")
+    print(f"  {'page':<22} {'bs4 html.parser':>16} {'lxml + XPath':>13}")
+    for label, old, new, html in [
+        ("JobNet search", bs4_jobnet_listings, parsers.parse_jobnet_listings, jobnet),
+        ("JobIndex search", bs4_jobindex_listings, parsers.parse_jobindex_listings, jobindex),
+        ("JobNet detail", bs4_jobnet_description, parsers.parse_jobnet_description, detail),
+    ]:
+        print(f"  {label:<22} {median_ms(old, html):>16.2f} {median_ms(new, html):>13.2f}")
+
+    async def on_loop(parser, html):
+        return parser(html)
+
+    old_run = [(bs4_jobnet_listings, jobnet)] * (RUN_PAGES // 2) + [(bs4_jobindex_listings, jobindex)] * (
+        RUN_PAGES // 2) + [(bs4_jobnet_description, detail)] * RUN_DETAILS
+    new_run = [(parsers.parse_jobnet_listings, jobnet)] * (RUN_PAGES // 2) + [
+        (parsers.parse_jobindex_listings, jobindex)] * (RUN_PAGES // 2) + [
+        (parsers.parse_jobnet_description, detail)] * RUN_DETAILS
+
+    pool = parsers.ParsePool()
+
+    async def pooled_run():
+        await pool.parse(parsers.parse_jobnet_description, detail)  # start the workers outside the timing
+        return await parse_run(pool.parse, new_run)
+
+    print(f"\nOne scrape run's pages ({RUN_PAGES} search + {RUN_DETAILS} detail), {pool.workers} parse workers")
+    print(f"  {'path':<22} {'total (s)':>10} {'max loop stall (ms)':>20}")
+    for label, run in [
+        ("bs4 on the loop", lambda: parse_run(on_loop, old_run)),
+        ("lxml on the loop", lambda: parse_run(on_loop, new_run)),
+        ("lxml in ParsePool", pooled_run),
+    ]:
+        elapsed, stall = asyncio.run(run())
+        print(f"  {label:<22} {elapsed:>10.2f} {stall * 1000:>20.1f}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Time until the first scraped job is in the database, and until the last one,
+for the batch path (scrape everything, then one bulk_upsert) versus the
+streaming IngestionPipeline.
+
+A stand-in transport serves JOBINDEX_PAGES full result pages per search term,
+each after PAGE_LATENCY seconds, so a run takes a few seconds like a real one.
+
+Run from the repository root:  python benchmarks/bench_pipeline.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOBINDEX_PAGES = 5
+PAGE_LATENCY = 0.2
+
+
+async def handler(request):
+    import httpx
+
+    page = int(request.url.params.get("page", "1"))
+    term = request.url.params.get("q", "")
+    await asyncio.sleep(PAGE_LATENCY)
+    body = "".join(
+        f'<div class="jobsearch-result"><h4 class="jobsearch-title"><a href="/ji/{term}/{page}/{i}">'
+        f'AI Udvikler {i}</a></h4><a class="company-name">Virksomhed {i}</a><span class="location">København</span>'
+        f'<p>Machine learning og generativ AI i Danmark.</p></div>'
+        for i in range(20)
+    ) if page <= JOBINDEX_PAGES else ""
+    return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=body.encode())
+
+
+def make_scraper():
+    import httpx
+
+    from app.scrapers import JobScraper
+
+    scraper = JobScraper(source_limits={
+        'jobindex': {'concurrency': 8, 'rate': 1000.0, 'burst': 100},
+    }, http_cache_path="")
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scraper
+
+
+def first_row_time(database_url, started, stop):
+    """Poll the jobs table from another thread, as the dashboard would"""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    while True:
+        finished = stop.is_set()
+        with engine.connect() as connection:
+            if connection.execute(text("SELECT 1 FROM jobs LIMIT 1")).first():
+                return time.perf_counter() - started
+        if finished:
+            return None
+        time.sleep(0.01)
+
+
+async def measure(database_url, streaming):
+    import threading
+
+    from app.database import Job, get_db_session
+    from app.job_service import JobService
+    from app.pipeline import IngestionPipeline
+
+    db = get_db_session()
+    db.query(Job).delete()
+    db.commit()
+    db.close()
+
+    scraper = make_scraper()
+    service = JobService()
+    stop = threading.Event()
+    started = time.perf_counter()
+    poller = asyncio.get_running_loop().run_in_executor(None, first_row_time, database_url, started, stop)
+
+    if streaming:
+        totals = await IngestionPipeline(scraper, service, flush_interval=0.5).run(["jobindex"], force_refresh=True)
+    else:
+        jobs = await scraper.scrape_all_sources(["jobindex"], force_refresh=True)
+        totals = await service.bulk_upsert(jobs)
+    total = time.perf_counter() - started
+
+    stop.set()
+    first = await poller
+    await scraper.close()
+    return first, total, totals['inserted']
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/jobs.db"
+        os.environ["DATABASE_URL"] = database_url
+        sys.path.insert(0, ROOT)
+        from app.database import create_tables
+        create_tables()
+
+        print(f"{JOBINDEX_PAGES} pages per search term, {PAGE_LATENCY * 1000:.0f} ms per page")
+        for label, streaming in [("batch", False), ("pipeline", True)]:
+            first, total, inserted = asyncio.run(measure(database_url, streaming))
+            print(f"  {label:<9} {inserted:4d} jobs  first stored {first * 1000:7.0f} ms   run {total * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
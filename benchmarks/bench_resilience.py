@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Cost of a dead source: scraping runs against the local stand-in server with
+JobNet answering every request with a 503 and JobIndex healthy, with JobScraper's
+circuit breakers and with them disabled (an unreachable failure threshold).
+
+Without breakers every JobNet search term retries up to SCRAPER_MAX_RETRIES
+times with backoff, until the run's retry budget is spent. With breakers JobNet
+is given up after SCRAPER_BREAKER_FAILURES failures, and the next run skips it
+without a request until the breaker lets a probe through.
+
+Run from the repository root:  python benchmarks/bench_resilience.py [--runs 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = ["jobnet", "jobindex"]
+
+
+async def scrape_runs(server, standin, args, breakers):
+    from bench_harness import make_scraper
+
+    scraper, _ = make_scraper(server, args)
+    if not breakers:
+        for breaker in scraper.breakers.values():
+            breaker.failure_threshold = 10 ** 9
+
+    results = []
+    for _ in range(args.runs):
+        before = dict(standin.state.requests)
+        started = time.perf_counter()
+        jobs = await scraper.scrape_all_sources(SOURCES, force_refresh=True)
+        results.append({
+            'seconds': time.perf_counter() - started,
+            'jobs': len(jobs),
+            'jobnet_requests': standin.state.requests['jobnet'] - before.get('jobnet', 0),
+            'jobnet_breaker': scraper.breakers['jobnet'].state
+        })
+    await scraper.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="consecutive scraping runs per mode")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stand-in response latency")
+    parser.add_argument("--pages", type=int, default=2, help="full result pages per search term")
+    parser.add_argument("--concurrency", type=int, default=8, help="scraper requests in flight per source")
+    parser.add_argument("--rate", type=float, default=1000.0, help="scraper requests/second per source")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/resilience.db"
+        os.environ["SCRAPER_MAX_PAGES"] = str(args.pages + 1)
+        sys.path.insert(0, ROOT)
+        from app.database import create_tables
+        from standin_server import StandinServer, create_app
+
+        create_tables()
+        print(f"JobNet down, JobIndex up; {args.runs} runs per mode")
+        print(f"  {'mode':<18} {'run':>3} {'seconds':>8} {'jobs':>5} {'JobNet requests':>16} {'JobNet breaker':>15}")
+        for label, breakers in [("breakers disabled", False), ("circuit breakers", True)]:
+            standin = create_app(args.latency_ms, jitter_ms=0.0, pages=args.pages, down=("jobnet",))
+            with StandinServer(standin) as server:
+                for run, result in enumerate(asyncio.run(scrape_runs(server, standin, args, breakers)), 1):
+                    print(f"  {label:<18} {run:>3} {result['seconds']:>8.2f} {result['jobs']:>5} "
+                          f"{result['jobnet_requests']:>16} {result['jobnet_breaker']:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Dashboard poll latency (/api/jobs + /api/jobs/stats) without the response
+cache, served from it, and revalidated with If-None-Match (304).
+
+Run from the repository root:  python benchmarks/bench_response_cache.py
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JOBS = 20_000
+POLLS = 200
+POLL = ["/api/jobs?limit=20&days_ago=30", "/api/jobs/stats"]
+
+
+def main():
+    logging.disable(logging.INFO)
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/cache.db"
+        sys.path.insert(0, ROOT)
+
+        from fastapi.testclient import TestClient
+
+        from app.database import create_tables
+        from app.job_service import JobService
+        from app.main import app, response_cache
+        from app.models import JobCreate
+
+        create_tables()
+        asyncio.run(JobService().bulk_upsert([
+            JobCreate(
+                title=f"AI Consultant {i}",
+                company=f"Company {i % 500}",
+                location="København",
+                description="Machine learning and generative AI consulting in Denmark. " * 20,
+                url=f"https://example.dk/job/{i}",
+                source="benchmark"
+            )
+            for i in range(JOBS)
+        ]))
+
+        client = TestClient(app)
+
+        def poll_ms(etags=None, invalidate=False):
+            samples = []
+            for _ in range(POLLS):
+                if invalidate:
+                    response_cache.invalidate()
+                started = time.perf_counter()
+                for path in POLL:
+                    headers = {"If-None-Match": etags[path]} if etags else {}
+                    response = client.get(path, headers=headers)
+                    assert response.status_code == (304 if etags else 200)
+                samples.append((time.perf_counter() - started) * 1000)
+            return statistics.median(samples)
+
+        uncached = poll_ms(invalidate=True)
+        cached = poll_ms()
+        etags = {path: client.get(path).headers["etag"] for path in POLL}
+        not_modified = poll_ms(etags=etags)
+
+    print(f"{JOBS} jobs, median of {POLLS} dashboard polls ({' + '.join(POLL)})")
+    print(f"  uncached      {uncached:7.2f} ms")
+    print(f"  cache hit     {cached:7.2f} ms")
+    print(f"  304 (ETag)    {not_modified:7.2f} ms")
+    print(f"  {response_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Compare per-job scoring (calculate_relevance_score + is_danish_job), used by
+JobService.bulk_upsert, with a vectorized pandas/NumPy BatchScorer. The batch
+scorer never beat the per-job path at any batch size, so it lives here only.
+
+Run from the repository root:  python benchmarks/bench_scoring.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.job_service import JobService
+from app.models import JobCreate
+from app.scoring import compile_keyword_pattern, keyword_implications
+
+DEFAULT_SIZES = [50, 1_000, 10_000, 100_000]
+
+TITLES = [
+    "AI Consultant", "Senior Machine Learning Engineer", "Data Scientist", "Backend Developer",
+    "Prompt Engineer", "Email Marketing Specialist", "Generative AI Project Lead", "HTML/CSS Developer"
+]
+LOCATIONS = ["København", "Aarhus C", "Odense", "Remote", "Berlin", "Stockholm", None]
+FILLER = (
+    "We are a growing team working with cloud platforms, html dashboards and email campaigns. "
+    "You will collaborate with product owners, designers and engineers across Denmark and the Nordics. "
+)
+TOPICS = [
+    "Experience with deep learning, pytorch and tensorflow is a plus. ",
+    "You have shipped NLP and computer vision systems to production. ",
+    "Knowledge of large language model fine-tuning and prompt engineering. ",
+    "Familiarity with stable diffusion model pipelines and hugging face. ",
+    "Strong SQL and reporting skills. "
+]
+
+
+class BatchScorer:
+    """Vectorized relevance scoring and Danish-location detection for batches of scraped jobs.
+
+    Produces the same scores, keywords and Danish flags as JobService's per-job
+    calculate_relevance_score and is_danish_job.
+    """
+
+    def __init__(
+        self,
+        keywords: List[str],
+        keyword_weights: Dict[str, float],
+        title_bonus_keywords: List[str],
+        danish_locations: List[str],
+        default_weight: float = 0.05
+    ):
+        self.keywords = keywords
+        lowered = [keyword.lower() for keyword in keywords]
+        index = {keyword: i for i, keyword in enumerate(lowered)}
+
+        self.weights = np.array([keyword_weights.get(keyword, default_weight) for keyword in lowered])
+        self.keyword_pattern = compile_keyword_pattern(lowered, overlapping=True)
+        self.title_bonus_pattern = compile_keyword_pattern(title_bonus_keywords)
+        self.danish_locations = danish_locations
+        self.implied_indices = {
+            keyword: sorted(index[other] for other in implied)
+            for keyword, implied in keyword_implications(lowered).items()
+        }
+
+    def indicator_matrix(self, text: pd.Series) -> np.ndarray:
+        """Keyword-by-document boolean matrix: row i, column k is set if keyword k occurs in document i"""
+        matrix = np.zeros((len(text), len(self.keywords)), dtype=bool)
+
+        # One regex pass per document, then scatter every match (and the keywords it implies) into the matrix
+        matches = text.str.findall(self.keyword_pattern).explode().dropna()
+        if matches.empty:
+            return matrix
+        implied = matches.map(self.implied_indices).explode()
+        matrix[implied.index.to_numpy(dtype=np.intp), implied.to_numpy(dtype=np.intp)] = True
+        return matrix
+
+    def danish_mask(self, frame: pd.DataFrame) -> np.ndarray:
+        """Danish-location flag per job, narrowing the rows still to check after each location"""
+        has_location = (frame["location"] != "").to_numpy(dtype=bool)
+        text = (frame["location"] + " " + frame["company"] + " " + frame["description"]).str.lower()
+
+        is_danish = np.zeros(len(frame), dtype=bool)
+        for location in self.danish_locations:
+            remaining = np.flatnonzero(has_location & ~is_danish)
+            if not remaining.size:
+                break
+            found = text.iloc[remaining].str.contains(location, regex=False).to_numpy(dtype=bool)
+            is_danish[remaining[found]] = True
+        return is_danish
+
+    def score(self, jobs: List[JobCreate]) -> pd.DataFrame:
+        """Score a batch of jobs, returning relevance_score, ai_keywords and is_danish columns"""
+        frame = pd.DataFrame(
+            [(job.title, job.company, job.location, job.description, job.requirements) for job in jobs],
+            columns=["title", "company", "location", "description", "requirements"]
+        ).fillna("")
+
+        if frame.empty:
+            return pd.DataFrame(columns=["relevance_score", "ai_keywords", "is_danish"])
+
+        text = (frame["title"] + " " + frame["description"] + " " + frame["requirements"]).str.lower()
+        matrix = self.indicator_matrix(text)
+
+        scores = matrix @ self.weights
+        scores += 0.1 * frame["title"].str.lower().str.contains(self.title_bonus_pattern).to_numpy(dtype=float)
+
+        # Jobs share few distinct keyword combinations: build each keyword list once per combination
+        combinations, inverse = np.unique(np.packbits(matrix, axis=1), axis=0, return_inverse=True)
+        combination_keywords = [
+            [self.keywords[k] for k in np.flatnonzero(row)]
+            for row in np.unpackbits(combinations, axis=1, count=len(self.keywords)).astype(bool)
+        ]
+
+        is_danish = self.danish_mask(frame)
+
+        return pd.DataFrame({
+            "relevance_score": np.minimum(scores, 1.0),
+            "ai_keywords": [list(combination_keywords[i]) for i in inverse.ravel()],
+            "is_danish": is_danish
+        })
+
+
+def make_jobs(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        JobCreate(
+            title=rng.choice(TITLES),
+            company=f"Company {rng.randrange(500)}",
+            location=rng.choice(LOCATIONS),
+            description=FILLER * rng.randint(2, 8) + "".join(rng.sample(TOPICS, 2)),
+            requirements=rng.choice(TOPICS),
+            url=f"https://example.dk/job/{i}",
+            source="benchmark"
+        )
+        for i in range(count)
+    ]
+
+
+def scalar_path(service, jobs):
+    results = []
+    for job in jobs:
+        description = job.description or ""
+        score, keywords = service.calculate_relevance_score(job.title, description, job.requirements or "")
+        results.append((score, keywords, service.is_danish_job(job.location or "", job.company, description)))
+    return results
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    service = JobService()
+    batch_scorer = BatchScorer(
+        service.ai_keywords, service.keyword_weights, service.title_bonus_keywords, service.danish_locations
+    )
+
+    print(f"{'jobs':>8} {'scalar (s)':>12} {'batch (s)':>12} {'speedup':>9}")
+    for size in sizes:
+        jobs = make_jobs(size)
+
+        started = time.perf_counter()
+        scalar = scalar_path(service, jobs)
+        scalar_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batch = batch_scorer.score(jobs)
+        batch_seconds = time.perf_counter() - started
+
+        mismatches = sum(
+            1 for (score, keywords, danish), row in zip(scalar, batch.itertuples())
+            if abs(score - row.relevance_score) > 1e-9 or keywords != list(row.ai_keywords)
+            or danish != row.is_danish
+        )
+        if mismatches:
+            print(f"FAIL: {mismatches} jobs scored differently by the batch path")
+            sys.exit(1)
+
+        print(f"{size:>8} {scalar_seconds:>12.3f} {batch_seconds:>12.3f} {scalar_seconds / batch_seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Read/write concurrency on SQLite with and without the tuned pragma profile.
+
+A writer process ingests batches through JobService.bulk_upsert (the
+scraper's write path) while reader processes run the /api/jobs query through
+JobService.get_jobs. Each profile runs in its own process on a scratch
+database, since the pragmas are read from the environment at import time.
+
+Run from the repository root:  python benchmarks/bench_sqlite_concurrency.py
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "default (rollback journal)": {
+        "SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_MS": "5000",
+        "SQLITE_CACHE_SIZE": "", "SQLITE_MMAP_SIZE": "", "SQLITE_TEMP_STORE": ""
+    },
+    "tuned (WAL profile)": {},
+}
+
+DURATION = 10.0
+READERS = 4
+SEED_JOBS = 5000
+BATCH_SIZE = 200
+
+
+def make_jobs(start, count):
+    from app.models import JobCreate
+    return [
+        JobCreate(
+            title=f"AI Consultant {i}",
+            company=f"Company {i % 300}",
+            location="København",
+            description="Machine learning and generative AI consulting in Denmark. " * 20,
+            url=f"https://example.dk/job/{i}",
+            source="benchmark"
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _reader(stop, results):
+    sys.path.insert(0, ROOT)
+    from app.job_service import JobService
+    service = JobService()
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        asyncio.run(service.get_jobs(limit=50))
+        latencies.append(time.perf_counter() - started)
+    results.put(("read", latencies))
+
+
+def _writer(stop, results):
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.INFO)
+    from app.job_service import JobService
+    service = JobService()
+    latencies = []
+    next_id = SEED_JOBS
+    while not stop.is_set():
+        started = time.perf_counter()
+        asyncio.run(service.bulk_upsert(make_jobs(next_id, BATCH_SIZE)))
+        latencies.append(time.perf_counter() - started)
+        next_id += BATCH_SIZE
+    results.put(("write", latencies))
+
+
+def run_profile():
+    """Runs inside a child process configured through the environment"""
+    sys.path.insert(0, ROOT)
+    import logging
+    import multiprocessing
+    logging.disable(logging.INFO)
+
+    from app.database import create_tables, engine
+    from app.job_service import JobService
+
+    create_tables()
+    asyncio.run(JobService().bulk_upsert(make_jobs(0, SEED_JOBS)))
+    engine.dispose()
+
+    # Separate processes, so SQLite locking rather than the GIL decides who waits
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=_reader, args=(stop, results)) for _ in range(READERS)]
+    processes.append(context.Process(target=_writer, args=(stop, results)))
+    for process in processes:
+        process.start()
+    time.sleep(DURATION)
+    stop.set()
+
+    read_latencies, write_latencies = [], []
+    for _ in processes:
+        kind, latencies = results.get()
+        (read_latencies if kind == "read" else write_latencies).extend(latencies)
+    for process in processes:
+        process.join()
+
+    def p99(samples):
+        return sorted(samples)[int(len(samples) * 0.99)] * 1000
+
+    print(json.dumps({
+        "reads_per_sec": len(read_latencies) / DURATION,
+        "read_p50_ms": statistics.median(read_latencies) * 1000,
+        "read_p99_ms": p99(read_latencies),
+        "write_batches_per_sec": len(write_latencies) / DURATION,
+        "write_p99_ms": p99(write_latencies),
+    }))
+
+
+def main():
+    print(f"{READERS} readers + 1 writer ({BATCH_SIZE} jobs/batch) for {DURATION:.0f}s each\n")
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, **overrides, "DATABASE_URL": f"sqlite:///{tmp}/bench.db"}
+            output = subprocess.run(
+                [sys.executable, __file__, "--run"], env=env, cwd=ROOT,
+                capture_output=True, text=True, check=True
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{name}:")
+        print(f"  reads/s {result['reads_per_sec']:8.1f}   read p50 {result['read_p50_ms']:7.1f} ms"
+              f"   read p99 {result['read_p99_ms']:7.1f} ms")
+        print(f"  write batches/s {result['write_batches_per_sec']:6.1f}   write p99 {result['write_p99_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    if "--run" in sys.argv:
+        run_profile()
+    else:
+        main()
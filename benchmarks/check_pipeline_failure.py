@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Check that IngestionPipeline.run fails, rather than hangs, when a database
+write fails while the producers have filled the queue.
+
+A stand-in scraper yields 7 jobs into a queue of 5 and bulk_upsert raises on
+the first batch, after the producers are done. Exits non-zero if the run hangs
+or does not raise the write error.
+
+Run from the repository root:  python benchmarks/check_pipeline_failure.py
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMEOUT = 10.0
+
+
+class StandinScraper:
+    """Just what IngestionPipeline uses of JobScraper: one source and search term yielding jobs"""
+
+    def __init__(self, count):
+        self.count = count
+
+    @contextlib.asynccontextmanager
+    async def scrape_run(self, sources, force_refresh):
+        yield {}
+
+    def search_pairs(self, sources):
+        return [("jobindex", "ai")]
+
+    async def iter_source_term(self, source, search_term, summaries):
+        for i in range(self.count):
+            yield {
+                "title": f"AI Udvikler {i}", "company": "Virksomhed", "location": "København",
+                "url": f"https://www.jobindex.dk/ji/{i}", "source": source
+            }
+
+
+class FailingJobService:
+    async def bulk_upsert(self, jobs, raise_errors=False):
+        # Let the producers fill the queue before the write fails
+        await asyncio.sleep(0.1)
+        raise RuntimeError("database is locked")
+
+
+async def run_pipeline():
+    from app.pipeline import IngestionPipeline
+
+    pipeline = IngestionPipeline(StandinScraper(7), FailingJobService(), queue_size=5, batch_size=2)
+    return await asyncio.wait_for(pipeline.run(), TIMEOUT)
+
+
+def main():
+    logging.disable(logging.ERROR)
+    sys.path.insert(0, ROOT)
+    try:
+        totals = asyncio.run(run_pipeline())
+    except asyncio.TimeoutError:
+        print(f"FAIL: the pipeline hung for {TIMEOUT:g}s after a failed write")
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"OK: the failed write failed the run ({e})")
+        return
+    print(f"FAIL: the run finished despite a failed write: {totals}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
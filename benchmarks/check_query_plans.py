@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Check that the dashboard's queries are answered from indexes.
+
+Runs JobService.get_jobs, get_job_stats and bulk_upsert (its near-duplicate
+lookups) against a scratch SQLite database, captures every SELECT they issue,
+and runs EXPLAIN QUERY PLAN on each one. Exits non-zero if a query scans the
+jobs or dedup tables (an index-only COVERING INDEX scan is allowed for plain
+counts) or needs a temporary B-tree to sort.
+
+Run from the repository root:  python benchmarks/check_query_plans.py
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tables that grow with the number of jobs and must never be scanned
+SCANNED_TABLES = ("jobs", "job_lsh_bands", "job_aliases")
+
+
+def capture_queries(engine, action):
+    from sqlalchemy import event
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        asyncio.run(action())
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def plan_problems(connection, statement, parameters, allow_sort):
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = [row[-1] for row in rows]
+    problems = []
+    for detail in details:
+        for table in SCANNED_TABLES:
+            if (detail == f"SCAN {table}" or detail.startswith(f"SCAN {table} ")) and "COVERING INDEX" not in detail:
+                problems.append(detail)
+        if "USE TEMP B-TREE FOR ORDER BY" in detail and not allow_sort:
+            problems.append(detail)
+    return details, problems
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/plans.db"
+        sys.path.insert(0, ROOT)
+
+        from app.database import create_tables, engine
+        from app.job_service import JobService
+        from app.models import JobCreate
+
+        create_tables()
+        service = JobService()
+        job = JobCreate(
+            title="Machine Learning Engineer", company="Example ApS", location="København",
+            # Long enough (DEDUP_MIN_DESCRIPTION_TOKENS) to be fingerprinted, so the LSH band queries run
+            description=(
+                "Machine learning and generative AI work in Copenhagen. You will build, evaluate and ship "
+                "language models for our clients together with a small team of data scientists and engineers."
+            ),
+            url="https://example.dk/1",
+            source="jobindex"
+        )
+        cursor = base64.urlsafe_b64encode(json.dumps([0.5, "2024-01-01T00:00:00", 100]).encode()).decode()
+
+        # (name, action, sorting allowed, table the action must query)
+        checks = [
+            ("get_jobs", lambda: service.get_jobs(limit=50, offset=100), False, None),
+            ("get_jobs (cursor)", lambda: service.get_jobs(limit=50, cursor=cursor), False, None),
+            ("get_jobs (no date window)", lambda: service.get_jobs(limit=50, days_ago=None), False, None),
+            # Search results are ranked by score, which has to be sorted
+            ("get_jobs (search)", lambda: service.get_jobs(limit=50, q="machine learning"), True, None),
+            # Stats read the job_stats counters, walking ix_job_stats_dimension_count for the top N
+            ("get_job_stats", service.get_job_stats, False, None),
+            # Known-URL, alias and LSH band lookups, then a near-duplicate of the stored job
+            ("bulk_upsert", lambda: service.bulk_upsert([job]), False, "job_lsh_bands"),
+            (
+                "bulk_upsert (duplicate)",
+                lambda: service.bulk_upsert([job.copy(update={"url": "https://example.dk/2"})]),
+                False,
+                "job_lsh_bands"
+            ),
+        ]
+
+        failures = 0
+        with engine.connect() as connection:
+            for name, action, allow_sort, required_table in checks:
+                captured = capture_queries(engine, action)
+                if required_table and not any(required_table in statement for statement, _ in captured):
+                    failures += 1
+                    print(f"[FAIL] {name}: no query on {required_table} was issued")
+                for statement, parameters in captured:
+                    details, problems = plan_problems(connection, statement, parameters, allow_sort)
+                    status = "FAIL" if problems else "ok"
+                    failures += bool(problems)
+                    print(f"[{status}] {name}: {' '.join(statement.split())[:110]}")
+                    for detail in details:
+                        print(f"         {detail}")
+        engine.dispose()
+
+    if failures:
+        print(f"\n{failures} queries fall back to a table scan or sort, or were never issued")
+        sys.exit(1)
+    print("\nAll queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Local stand-in for the job sites, serving the recorded pages in
+benchmarks/fixtures with configurable latency, injected errors and an
+optional per-source rate limit answered with 429 and Retry-After.
+
+Each source is mounted under its own prefix (http://127.0.0.1:<port>/jobnet,
+/jobindex, /thehub), to be passed to JobScraper as job_sites or to
+DanishJobScraper as sites. Listing links are made unique per search term and
+page, so every page yields new jobs, and a term has `pages` full result pages.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter, deque
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HTML = "text/html; charset=utf-8"
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def thehub_page(count=10):
+    """A TheHub-style job list (the site is not among the recorded fixtures)"""
+    cards = "".join(
+        f'<article class="job-card"><h2><a href="/jobs/ai-engineer-{i}">Machine Learning Engineer {i}</a></h2>'
+        f'<span class="company">Startup {i} ApS</span></article>'
+        for i in range(count)
+    )
+    return f"<!DOCTYPE html><html><body><main>{cards}</main></body></html>"
+
+
+def create_app(latency_ms=50.0, jitter_ms=20.0, error_rate=0.0, pages=5, seed=0, rate_limit=0.0, down=()):
+    """Stand-in app; error_rate is the share of requests answered with a 503, a source
+    getting more than rate_limit requests in the last second answers 429 (0 = unlimited),
+    and the sources in down answer every request with a 503"""
+    app = FastAPI()
+    app.state.requests = Counter()
+    rng = random.Random(seed)
+    recent = {}
+    fixtures = {
+        name: load_fixture(f"{name}.html") for name in ("jobnet_search", "jobnet_detail", "jobindex_search")
+    }
+
+    def listing_page(fixture, link_prefix, term, page):
+        if page >= pages:
+            return fixtures[fixture].split('<div class="results">')[0] + "</html>"
+        slug = f"{zlib.crc32(term.encode()):x}-{page}"
+        return fixtures[fixture].replace(f'href="{link_prefix}', f'href="{link_prefix}{slug}-')
+
+    @app.middleware("http")
+    async def latency_and_errors(request: Request, call_next):
+        source = request.url.path.split("/")[1]
+        app.state.requests[source] += 1
+        if rate_limit:
+            now, window = time.monotonic(), recent.setdefault(source, deque())
+            while window and window[0] <= now - 1.0:
+                window.popleft()
+            if len(window) >= rate_limit:
+                app.state.requests["rate_limited"] += 1
+                return Response("Too Many Requests", status_code=429, headers={"Retry-After": "1"})
+            window.append(now)
+        await asyncio.sleep(max(latency_ms + rng.uniform(-jitter_ms, jitter_ms), 0) / 1000)
+        if source in down or rng.random() < error_rate:
+            app.state.requests["errors"] += 1
+            return Response("Service Unavailable", status_code=503)
+        return await call_next(request)
+
+    @app.get("/jobnet/CV/FindWork/Search")
+    async def jobnet_search(SearchString: str = "", Offset: int = 0, PageSize: int = 20):
+        body = listing_page("jobnet_search", "/CV/FindWork/Details/", SearchString, Offset // PageSize)
+        return Response(body, media_type=HTML)
+
+    @app.get("/jobnet/CV/FindWork/Details/{job_id}")
+    async def jobnet_detail(job_id: str):
+        return Response(fixtures["jobnet_detail"], media_type=HTML)
+
+    @app.get("/jobindex/jobsoegning")
+    async def jobindex_search(q: str = "", page: int = 1):
+        return Response(listing_page("jobindex_search", "/jobannonce/", q, page - 1), media_type=HTML)
+
+    @app.get("/thehub/jobs")
+    async def thehub_jobs():
+        return Response(thehub_page(), media_type=HTML)
+
+    return app
+
+
+class StandinServer:
+    """Runs the stand-in app with uvicorn in a background thread"""
+
+    def __init__(self, app, host="127.0.0.1"):
+        self.app = app
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning", access_log=False))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.base_url = None
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("stand-in server failed to start")
+            threading.Event().wait(0.01)
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        self.base_url = f"http://{host}:{port}"
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+    def job_sites(self):
+        """job_sites for JobScraper, pointing JobNet and JobIndex at this server"""
+        return {'jobnet': f"{self.base_url}/jobnet", 'jobindex': f"{self.base_url}/jobindex"}
+
+    def danish_sites(self):
+        """sites for DanishJobScraper, pointing JobIndex and TheHub at this server"""
+        return {'jobindex': f"{self.base_url}/jobindex", 'thehub': f"{self.base_url}/thehub"}
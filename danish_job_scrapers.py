@@ -1,259 +1,180 @@
-
 """
 Danish AI Job Scrapers for various job boards
+
+Writes into the app's database (DATABASE_URL, default ai_jobs.db) through
+JobService.bulk_upsert, so jobs get the same schema, scoring and near-duplicate
+merging as the app's scheduled scrapes, and both can share one database.
+
+JobIndex search terms and TheHub are fetched concurrently on one pooled HTTP
+client. Each site has an AdaptiveThrottle that backs off on 429/503 and
+Retry-After and speeds up while responses stay healthy. Pages are parsed in
+the same ParsePool worker processes as the app's scraper, off the event loop.
 """
 
-import requests
-from bs4 import BeautifulSoup
-import time
-import sqlite3
-from datetime import datetime
-import json
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.database import create_tables
+from app.job_service import JobService
+from app.models import JobCreate
+from app.parsers import ParsePool, parse_jobindex_cards, parse_thehub_cards
+from app.throttling import AdaptiveThrottle, parse_retry_after
 
 class DanishJobScraper:
-    def __init__(self, db_path="ai_jobs.db"):
-        self.db_path = db_path
+    # Starting politeness per site; the rate then adapts between min_rate and max_rate
+    DEFAULT_SITE_LIMITS = {
+        'jobindex': {'concurrency': 2, 'rate': 1.0, 'burst': 2, 'min_rate': 0.1, 'max_rate': 4.0},
+        'thehub': {'concurrency': 1, 'rate': 0.5, 'burst': 1, 'min_rate': 0.1, 'max_rate': 2.0},
+    }
+
+    DEFAULT_SITES = {
+        'jobindex': 'https://www.jobindex.dk',
+        'thehub': 'https://thehub.dk',
+    }
+
+    # JobIndex search URLs for AI-related jobs
+    SEARCH_TERMS = ['artificial+intelligence', 'machine+learning', 'data+scientist', 'ai+engineer']
+
+    def __init__(
+        self,
+        job_service: Optional[JobService] = None,
+        site_limits: Optional[Dict[str, Dict]] = None,
+        sites: Optional[Dict[str, str]] = None,
+        max_retries: int = 3,
+        parse_workers: Optional[int] = None
+    ):
+        self.job_service = job_service or JobService()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.sites = {**self.DEFAULT_SITES, **(sites or {})}
+        self.site_limits = {**self.DEFAULT_SITE_LIMITS, **(site_limits or {})}
+        self.throttles = {site: AdaptiveThrottle(**limits) for site, limits in self.site_limits.items()}
+        # Attempts after a 429/503 before a page is given up
+        self.max_retries = max_retries
+        self.client: Optional[httpx.AsyncClient] = None
+        # Job cards are parsed in worker processes (SCRAPER_PARSE_WORKERS), like JobScraper's pages
+        self.parse_pool = ParsePool(parse_workers)
         self.setup_database()
 
     def setup_database(self):
-        """Initialize database with proper schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                company TEXT NOT NULL,
-                location TEXT,
-                description TEXT,
-                url TEXT UNIQUE,
-                source TEXT NOT NULL,
-                date_posted TEXT,
-                job_type TEXT,
-                salary TEXT,
-                relevance_score INTEGER DEFAULT 0,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Create or migrate the app's tables (converting a legacy standalone jobs table)"""
+        create_tables()
+        self.job_service.duplicates.backfill()
 
-    def save_job(self, job_data):
-        """Save job to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO jobs
-                (title, company, location, description, url, source, date_posted, job_type, salary, relevance_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job_data['title'],
-                job_data['company'],
-                job_data['location'],
-                job_data['description'],
-                job_data['url'],
-                job_data['source'],
-                job_data['date_posted'],
-                job_data['job_type'],
-                job_data.get('salary', ''),
-                job_data.get('relevance_score', 0)
-            ))
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error saving job: {e}")
-            return False
-        finally:
-            conn.close()
+    async def fetch(self, site: str, url: str) -> httpx.Response:
+        """GET a page within the site's throttle, retrying after 429/503 responses"""
+        throttle = self.throttles[site]
+        for _ in range(self.max_retries + 1):
+            async with throttle.slot():
+                response = await self.client.get(url)
+            throttle.record(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            if response.status_code not in throttle.BACKOFF_STATUSES:
+                return response
+            print(f"   ⏳ {site} answered {response.status_code}, slowing to {throttle.rate:.2f} requests/s")
+        return response
 
-    def calculate_relevance(self, title, description=""):
-        """Calculate relevance score based on job title and description"""
-        ai_keywords = [
-            'artificial intelligence', 'ai', 'machine learning', 'ml',
-            'deep learning', 'data scientist', 'data science', 'neural network',
-            'nlp', 'computer vision', 'ai consultant', 'ai engineer',
-            'ai specialist', 'ai developer', 'python', 'tensorflow', 'pytorch'
-        ]
-        
-        text = f"{title} {description}".lower()
-        score = 0
-        
-        for keyword in ai_keywords:
-            if keyword in text:
-                score += 10
-        
-        return min(score, 100)
+    async def save_jobs(self, jobs: List[JobCreate]) -> dict:
+        """Score and write a run's jobs in one transaction, with batched inserts"""
+        if not jobs:
+            return {"inserted": 0, "updated": 0, "merged": 0, "skipped": 0}
+        return await self.job_service.bulk_upsert(jobs)
 
-    def scrape_jobindex(self):
-        """Scrape JobIndex.dk for AI jobs"""
+    async def scrape_jobindex(self) -> List[JobCreate]:
+        """Scrape JobIndex.dk for AI jobs, all search terms concurrently"""
         print("🔍 Scraping JobIndex.dk...")
-        jobs_found = 0
+        results = await asyncio.gather(*[self.scrape_jobindex_term(term) for term in self.SEARCH_TERMS])
+        return [job for jobs in results for job in jobs]
+
+    async def scrape_jobindex_term(self, term: str) -> List[JobCreate]:
+        """Scrape the first JobIndex result page for one search term"""
+        jobs = []
+        site = self.sites['jobindex']
         
-        # JobIndex search URLs for AI-related jobs
-        search_terms = ['artificial+intelligence', 'machine+learning', 'data+scientist', 'ai+engineer']
+        try:
+            url = f"{site}/jobsoegning?q={term}&superjob=0"
+            print(f"   Searching for: {term.replace('+', ' ')}")
+            
+            response = await self.fetch('jobindex', url)
+            if response.status_code == 200:
+                # Limit to first 5 results per search
+                cards = await self.parse_pool.parse(parse_jobindex_cards, response.text, site, url, 5)
+                jobs = [JobCreate(**card) for card in cards]
+            else:
+                print(f"   ⚠️ Failed to fetch {url} (Status: {response.status_code})")
         
-        for term in search_terms:
-            try:
-                url = f"https://www.jobindex.dk/jobsoegning?q={term}&superjob=0"
-                print(f"   Searching for: {term.replace('+', ' ')}")
-                
-                response = requests.get(url, headers=self.headers)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # JobIndex uses these selectors (may need adjustment)
-                    job_cards = soup.find_all('div', class_='jobsearch-SerpJobCard')
-                    
-                    if not job_cards:
-                        # Try alternative selectors
-                        job_cards = soup.find_all('article') or soup.find_all('div', class_='job')
-                    
-                    for card in job_cards[:5]:  # Limit to first 5 results per search
-                        try:
-                            title_elem = card.find('h2') or card.find('h3') or card.find('a')
-                            company_elem = card.find('span', class_='company') or card.find('div', class_='company')
-                            
-                            if title_elem:
-                                title = title_elem.get_text(strip=True)
-                                company = company_elem.get_text(strip=True) if company_elem else 'Unknown Company'
-                                
-                                # Get job URL
-                                link = title_elem.get('href') if title_elem.name == 'a' else None
-                                if not link:
-                                    link_elem = card.find('a')
-                                    link = link_elem.get('href') if link_elem else url
-                                
-                                # Make sure URL is absolute
-                                if link and not link.startswith('http'):
-                                    link = f"https://www.jobindex.dk{link}"
-                                
-                                job_data = {
-                                    'title': title,
-                                    'company': company,
-                                    'location': 'Denmark',
-                                    'description': '',
-                                    'url': link or url,
-                                    'source': 'JobIndex.dk',
-                                    'date_posted': datetime.now().strftime('%Y-%m-%d'),
-                                    'job_type': 'Full-time',
-                                    'relevance_score': self.calculate_relevance(title)
-                                }
-                                
-                                if self.save_job(job_data):
-                                    jobs_found += 1
-                                    print(f"   ✓ Saved: {title} at {company}")
-                                
-                        except Exception as e:
-                            print(f"   ⚠️ Error processing job card: {e}")
-                            continue
-                    
-                    time.sleep(2)  # Rate limiting
-                else:
-                    print(f"   ⚠️ Failed to fetch {url} (Status: {response.status_code})")
-                    
-            except Exception as e:
-                print(f"   ❌ Error scraping JobIndex for {term}: {e}")
+        except Exception as e:
+            print(f"   ❌ Error scraping JobIndex for {term}: {e}")
         
-        return jobs_found
+        return jobs
 
-    def scrape_thehub(self):
+    async def scrape_thehub(self) -> List[JobCreate]:
         """Scrape TheHub.dk for tech jobs"""
         print("🔍 Scraping TheHub.dk...")
-        jobs_found = 0
+        jobs = []
+        site = self.sites['thehub']
         
         try:
-            url = "https://thehub.dk/jobs"
-            response = requests.get(url, headers=self.headers)
+            url = f"{site}/jobs"
+            response = await self.fetch('thehub', url)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find job listings
-                job_cards = soup.find_all('div', class_='job-card') or soup.find_all('article')
-                
-                for card in job_cards[:10]:  # Limit to first 10
-                    try:
-                        title_elem = card.find('h2') or card.find('h3') or card.find('a')
-                        company_elem = card.find('span', class_='company') or card.find('div', class_='company')
-                        
-                        if title_elem:
-                            title = title_elem.get_text(strip=True)
-                            company = company_elem.get_text(strip=True) if company_elem else 'TheHub Company'
-                            
-                            # Only save if it's AI/ML related
-                            if self.calculate_relevance(title) > 0:
-                                job_data = {
-                                    'title': title,
-                                    'company': company,
-                                    'location': 'Denmark',
-                                    'description': '',
-                                    'url': url,
-                                    'source': 'TheHub.dk',
-                                    'date_posted': datetime.now().strftime('%Y-%m-%d'),
-                                    'job_type': 'Full-time',
-                                    'relevance_score': self.calculate_relevance(title)
-                                }
-                                
-                                if self.save_job(job_data):
-                                    jobs_found += 1
-                                    print(f"   ✓ Saved: {title} at {company}")
-                    
-                    except Exception as e:
-                        print(f"   ⚠️ Error processing job card: {e}")
-                        continue
-                        
+                # Limit to first 10
+                cards = await self.parse_pool.parse(parse_thehub_cards, response.text, site, 10)
+                jobs = [JobCreate(**card) for card in cards]
+            else:
+                print(f"   ⚠️ Failed to fetch {url} (Status: {response.status_code})")
+        
         except Exception as e:
             print(f"   ❌ Error scraping TheHub: {e}")
         
-        return jobs_found
+        return jobs
 
-    def scrape_all_jobs(self):
-        """Scrape jobs from all sources"""
+    async def run(self) -> int:
+        """Scrape all sources concurrently, then write the jobs in one batch"""
         print("🚀 Starting real job scraping from Danish job boards...")
         
-        total_jobs = 0
-        
-        # Scrape JobIndex
-        jobindex_jobs = self.scrape_jobindex()
-        total_jobs += jobindex_jobs
-        print(f"📊 JobIndex jobs found: {jobindex_jobs}")
-        
-        # Scrape TheHub
-        thehub_jobs = self.scrape_thehub()
-        total_jobs += thehub_jobs
-        print(f"📊 TheHub jobs found: {thehub_jobs}")
-        
-        print(f"\n✅ Total jobs scraped: {total_jobs}")
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            follow_redirects=True
+        ) as client:
+            self.client = client
+            try:
+                jobindex_jobs, thehub_jobs = await asyncio.gather(self.scrape_jobindex(), self.scrape_thehub())
+            finally:
+                self.client = None
+                self.parse_pool.close()
+        print(f"📊 JobIndex jobs found: {len(jobindex_jobs)}")
+        print(f"📊 TheHub jobs found: {len(thehub_jobs)}")
+        
+        counts = await self.save_jobs(jobindex_jobs + thehub_jobs)
+        total_jobs = counts['inserted'] + counts['updated']
+        print(
+            f"\n✅ Total jobs saved: {total_jobs} ({counts['inserted']} new, {counts['updated']} updated, "
+            f"{counts['merged']} merged as duplicates, {counts['skipped']} skipped)"
+        )
         
         # Show some stats
-        self.show_stats()
+        await self.show_stats()
         
         return total_jobs
 
-    def show_stats(self):
+    def scrape_all_jobs(self) -> int:
+        """Scrape jobs from all sources"""
+        return asyncio.run(self.run())
+
+    async def show_stats(self):
         """Show database statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM jobs")
-        total_jobs = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT source, COUNT(*) FROM jobs GROUP BY source")
-        source_counts = cursor.fetchall()
+        stats = await self.job_service.get_job_stats()
         
         print(f"\n📈 Database Statistics:")
-        print(f"   Total jobs in database: {total_jobs}")
-        for source, count in source_counts:
-            print(f"   {source}: {count} jobs")
-        
-        conn.close()
+        print(f"   Total jobs in database: {stats.total_jobs}")
+        for source in stats.sources:
+            print(f"   {source['name']}: {source['count']} jobs")
 
 # Usage example
 if __name__ == "__main__":
@@ -33,16 +33,17 @@ def setup_chrome_check():
     """Check if Chrome is available"""
     try:
         from selenium import webdriver
-        from webdriver_manager.chrome import ChromeDriverManager
         from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from app.driver_pool import resolve_driver_path
         
         options = Options()
         options.add_argument('--headless')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         
-        # Test Chrome WebDriver
-        driver = webdriver.Chrome(ChromeDriverManager().install(), options=options)
+        # Test Chrome WebDriver (the resolved binary is reused by the scraper's driver pool)
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
         driver.quit()
         print("✓ Chrome WebDriver is working")
         return True
@@ -70,7 +71,7 @@ def main():
     # Start the application
     print("\n🚀 Starting AI Job Aggregator...")
     print("📊 Dashboard will be available at: http://localhost:8000")
-    print("🔄 Automatic scraping scheduled for 9 AM daily")
+    print("🔄 Scraping runs in scrape workers: start one with python worker.py")
     print("⏹️  Press Ctrl+C to stop the application")
     print("-" * 50)
     
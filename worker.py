@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+AI Job Aggregator - Danish AI Consultancy Jobs
+Scrape worker: runs the scraping tasks queued by the API and the schedule
+
+Start any number of these next to the API (run.py); each claims one queued
+task at a time, so API processes and scrape workers scale independently.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    """Main function to run a scrape worker"""
+    parser = argparse.ArgumentParser(description="Run queued job scraping tasks")
+    parser.add_argument("--worker-id", help="name shown in /api/health (default: host:pid)")
+    parser.add_argument("--no-schedule", action="store_true", help="only run queued tasks, never enqueue scheduled runs")
+    parser.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args()
+    
+    # Configure logging
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    from app.worker import ScrapeWorker
+    
+    worker = ScrapeWorker(worker_id=args.worker_id, schedule=not args.no_schedule)
+    
+    async def run():
+        # Finish the task in progress on Ctrl+C / SIGTERM; a second signal exits at once,
+        # and the task is claimed again by another worker once its lease expires
+        loop = asyncio.get_running_loop()
+        
+        def request_stop():
+            worker.stop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+        
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, request_stop)
+        await worker.run(once=args.once)
+    
+    print("🤖 AI Job Aggregator - scrape worker")
+    print(f"🔄 Worker {worker.worker_id} waiting for scraping tasks; Ctrl+C to stop")
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n👋 Scrape worker stopped")
+
+if __name__ == "__main__":
+    main()